@@ -1,5 +1,7 @@
-from csp import Constraint, CSP
+from csp import Constraint, CSP, CSPStats, INFERENCES, VARIABLE_ORDERS, VALUE_ORDERS
 from typing import Dict, List, Optional
+from timeit import default_timer as timer
+import random
 
 class MapColoringConstraint(Constraint[str, str]):
     def __init__(self, place1: str, place2: str) -> None:
@@ -13,6 +15,21 @@ class MapColoringConstraint(Constraint[str, str]):
         return assignment[self.place1] != assignment[self.place2]
 
 
+# A made up map of rows x columns regions, each bordering the regions to its right, below and below right
+# the variables are listed in a random order, as regions of a real map would be
+def grid_map(rows: int, columns: int, colours: List[str], seed: int = 0) -> CSP[str, str]:
+    regions: List[str] = [f"region {r}-{c}" for r in range(rows) for c in range(columns)]
+    order: List[str] = regions.copy()
+    random.Random(seed).shuffle(order)
+    csp: CSP[str, str] = CSP(order, {region: colours.copy() for region in regions})
+    for r in range(rows):
+        for c in range(columns):
+            for dr, dc in ((0, 1), (1, 0), (1, 1)):
+                if r + dr < rows and c + dc < columns:
+                    csp.add_constraint(MapColoringConstraint(f"region {r}-{c}", f"region {r + dr}-{c + dc}"))
+    return csp
+
+
 if __name__=='__main__':
     variables: List[str] = ['Western Australia', 'Northern Territory', 'South Australia', 'Queensland', 'New South Wales', 'Victoria', 'Tasmania']
     domains: Dict[str, List[str]] = {}
@@ -35,4 +52,16 @@ if __name__=='__main__':
     if solution is None:
         print("no solution found")
     else:
-        print(solution)
\ No newline at end of file
+        print(solution)
+
+    # propagation and ordering heuristics on a bigger map
+    for inference in INFERENCES:
+        for variable_order in VARIABLE_ORDERS:
+            for value_order in VALUE_ORDERS:
+                grid: CSP[str, str] = grid_map(6, 6, ['red', 'green', 'blue', 'yellow'])
+                stats: CSPStats = CSPStats()
+                stime = timer()
+                grid_solution: Optional[Dict[str, str]] = grid.backtracking_search(inference=inference, variable_order=variable_order, value_order=value_order, stats=stats)
+                etime = timer()
+                print(f"6 x 6 map with inference {inference}, variable order {variable_order}, value order {value_order}: "
+                      f"{'solved' if grid_solution is not None else 'no solution'} after {stats.nodes} nodes and {stats.backtracks} backtracks in: {etime - stime}")
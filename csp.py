@@ -1,9 +1,29 @@
-from typing import Generic, TypeVar, Dict, List, Optional
+from typing import Generic, TypeVar, Dict, Iterable, List, Optional, Set, Tuple
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from heapq import heapify, heappop, heappush
 
 V = TypeVar('V')
 D = TypeVar('D')
 
+# the kinds of inference backtracking_search can run after every assignment
+INFERENCES: Tuple[str, ...] = ('none', 'forward_checking', 'mac')
+# the orders backtracking_search can pick the next variable in and try its values in
+VARIABLE_ORDERS: Tuple[str, ...] = ('first', 'mrv')
+VALUE_ORDERS: Tuple[str, ...] = ('domain', 'lcv')
+
+
+# Counters filled in by backtracking_search when a stats object is passed in, with the strategy
+# that produced them; nodes counts the values tried and backtracks the variables whose values all failed
+@dataclass
+class CSPStats:
+    variable_order: str = ''
+    value_order: str = ''
+    inference: str = ''
+    nodes: int = 0
+    backtracks: int = 0
+
+
 # Base class for all constraints
 class Constraint(Generic[V, D], ABC):
     # The variables that the constraint is between
@@ -15,6 +35,113 @@ class Constraint(Generic[V, D], ABC):
     def satisfied(self, assignment: Dict[V, D]) -> bool:
         ...
 
+# One level of the search: the variable assigned there, the values to try for it,
+# how many of them have been tried, and how long the trail was before it
+class _Choice(Generic[V, D]):
+    __slots__ = ('variable', 'values', 'tried', 'mark')
+
+    def __init__(self, variable: V, values: List[D], mark: int) -> None:
+        self.variable: V = variable
+        self.values: List[D] = values
+        self.tried: int = 0
+        self.mark: int = mark
+
+
+# The unassigned variables of a search, handing out the next one to assign ('first' variable order)
+# variables come back through unselect in the reverse order they were selected, as the search backtracks,
+# and changed is told about every variable whose domain was pruned or restored
+# kept last first in a list, so the first one in variable order is popped off the end and put back there
+class _InOrder(Generic[V, D]):
+    def __init__(self, variables: List[V], constraints: Dict[V, List[Constraint[V, D]]], assignment: Dict[V, D], domains: Dict[V, List[D]]) -> None:
+        self._unassigned: List[V] = [variable for variable in reversed(variables) if variable not in assignment]
+
+    def __len__(self) -> int:
+        return len(self._unassigned)
+
+    def select(self) -> V:
+        return self._unassigned.pop()
+
+    def unselect(self, variable: V) -> None:
+        self._unassigned.append(variable)
+
+    def changed(self, variables: Iterable[V]) -> None:
+        pass
+
+
+# The same for the 'mrv' variable order: fewest values left, then most constraints with other
+# unassigned variables (the degree), then first in variable order
+# the degrees are kept up to date as variables are selected and unselected, from a count of the
+# unassigned variables of every constraint, and the variables wait in a heap keyed by the three;
+# entries are never removed when a key changes, a new one is pushed instead and the stale ones
+# are skipped when they reach the top, so picking a variable never scans all of them
+class _FewestValues(Generic[V, D]):
+    def __init__(self, variables: List[V], constraints: Dict[V, List[Constraint[V, D]]], assignment: Dict[V, D], domains: Dict[V, List[D]]) -> None:
+        self._constraints: Dict[V, List[Constraint[V, D]]] = constraints
+        self._domains: Dict[V, List[D]] = domains
+        self._positions: Dict[V, int] = {variable: position for position, variable in enumerate(variables)}
+        self._unassigned: Set[V] = {variable for variable in variables if variable not in assignment}
+        # unassigned variables of every constraint, by id since constraints need not be hashable
+        self._open: Dict[int, int] = {}
+        for variable in variables:
+            for constraint in constraints[variable]:
+                if id(constraint) not in self._open:
+                    self._open[id(constraint)] = sum(1 for other in constraint.variables if other in self._unassigned)
+        # for an unassigned variable, its constraints with at least one other unassigned variable
+        self._degrees: Dict[V, int] = {variable: sum(1 for constraint in constraints[variable] if self._open[id(constraint)] >= 2)
+                                       for variable in self._unassigned}
+        self._heap: List[Tuple[int, int, int, V]] = []
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._unassigned)
+
+    def _entry(self, variable: V) -> Tuple[int, int, int, V]:
+        return len(self._domains[variable]), -self._degrees[variable], self._positions[variable], variable
+
+    def _rebuild(self) -> None:
+        self._heap = [self._entry(variable) for variable in self._unassigned]
+        heapify(self._heap)
+
+    def _push(self, variable: V) -> None:
+        heappush(self._heap, self._entry(variable))
+        # drop the stale entries once they outnumber the live ones
+        if len(self._heap) > 4 * len(self._unassigned) + 64:
+            self._rebuild()
+
+    # the constraints of variable gain (step 1) or lose (step -1) an unassigned variable;
+    # where that leaves or makes exactly one other unassigned variable, its degree changes by step
+    def _update_degrees(self, variable: V, step: int) -> None:
+        threshold: int = 1 if step < 0 else 2
+        for constraint in self._constraints[variable]:
+            key: int = id(constraint)
+            self._open[key] += step
+            if self._open[key] != threshold:
+                continue
+            for other in constraint.variables:
+                if other != variable and other in self._unassigned:
+                    self._degrees[other] += step
+                    self._push(other)
+
+    def select(self) -> V:
+        while True:
+            size, degree, _, variable = heappop(self._heap)
+            if variable in self._unassigned and size == len(self._domains[variable]) and -degree == self._degrees[variable]:
+                break
+        self._unassigned.remove(variable)
+        self._update_degrees(variable, -1)
+        return variable
+
+    def unselect(self, variable: V) -> None:
+        self._unassigned.add(variable)
+        self._update_degrees(variable, 1)
+        self._push(variable)
+
+    def changed(self, variables: Iterable[V]) -> None:
+        for variable in variables:
+            if variable in self._unassigned:
+                self._push(variable)
+
+
 class CSP(Generic[V, D]):
     def __init__(self, variables: List[V], domains: Dict[V, D]) -> None:
         self.variables: List[V]= variables
@@ -38,19 +165,172 @@ class CSP(Generic[V, D]):
                 return False
         return True
 
-    def backtracking_search(self, assignment: Dict[V, D]= {}) -> Optional[Dict[V, D]]:
-        # return if we found an assignment for every variable in the CSP
-        if len(self.variables) == len(assignment):
-            return assignment
-        
-        unassigned: List[V] = [v for v in self.variables if v not in assignment]
-        first: V = unassigned[0]
-        for value in self.domains[first]:
-            local_assignment = assignment.copy()
-            local_assignment[first] = value
-            if self.is_consistent(first, local_assignment):
-                result: Optional[Dict[V, D]] = self.backtracking_search(local_assignment)
-                if result is not None:
-                    return result
-        return None
-            
\ No newline at end of file
+    # the binary constraints of every variable, as (other variable, constraint) pairs
+    # these are the arcs that arc consistency works on
+    def _binary_arcs(self) -> Dict[V, List[Tuple[V, Constraint[V, D]]]]:
+        arcs: Dict[V, List[Tuple[V, Constraint[V, D]]]] = {variable: [] for variable in self.variables}
+        for variable in self.variables:
+            for constraint in self.constraints[variable]:
+                if len(constraint.variables) == 2:
+                    other: V = constraint.variables[1] if constraint.variables[0] == variable else constraint.variables[0]
+                    arcs[variable].append((other, constraint))
+        return arcs
+
+    # Search for an assignment of every variable, extending the given partial assignment
+    # inference picks how much work is done after each assignment to rule out values early:
+    #   'none'             only check the constraints of the variable just assigned
+    #   'forward_checking' also remove, from every variable left unassigned in a constraint,
+    #                      the values that constraint now rules out
+    #   'mac'              forward checking, then keep every binary constraint arc consistent (AC-3)
+    # pruned values are put back when the search backtracks past the assignment that removed them
+    #
+    # the search works on a single assignment and a trail of pruned domains, both changed in place
+    # and undone on backtracking, with an explicit stack instead of recursion, so no node copies
+    # anything and problems with thousands of variables do not reach the recursion limit
+    # variable_order picks the next variable:
+    #   'first'            the first unassigned one in the order of self.variables
+    #   'mrv'              the one with the fewest values left, ties going to the one in the most
+    #                      constraints with other unassigned variables (domains only shrink with inference,
+    #                      so without it this is the degree heuristic alone); both are kept up to date
+    #                      as the search goes, see _FewestValues
+    # value_order picks the order its values are tried in:
+    #   'domain'           the order of its domain
+    #   'lcv'              the values that rule out the fewest values of unassigned neighbours first
+    def backtracking_search(self, assignment: Optional[Dict[V, D]] = None, inference: str = 'none', variable_order: str = 'first', value_order: str = 'domain', stats: Optional[CSPStats] = None) -> Optional[Dict[V, D]]:
+        if inference not in INFERENCES:
+            raise ValueError(f"Unknown inference {inference}, expected one of {INFERENCES}")
+        if variable_order not in VARIABLE_ORDERS:
+            raise ValueError(f"Unknown variable order {variable_order}, expected one of {VARIABLE_ORDERS}")
+        if value_order not in VALUE_ORDERS:
+            raise ValueError(f"Unknown value order {value_order}, expected one of {VALUE_ORDERS}")
+        if stats is None:
+            stats = CSPStats()
+        stats.variable_order = variable_order
+        stats.value_order = value_order
+        stats.inference = inference
+        # the caller's assignment is copied once and never changed
+        assignment = {} if assignment is None else dict(assignment)
+        domains: Dict[V, List[D]] = {variable: [assignment[variable]] if variable in assignment else list(self.domains[variable])
+                                     for variable in self.variables}
+        arcs: Dict[V, List[Tuple[V, Constraint[V, D]]]] = self._binary_arcs()
+        if inference == 'mac':
+            queue: List[Tuple[V, V, Constraint[V, D]]] = [(variable, other, constraint) for variable in self.variables for other, constraint in arcs[variable]]
+            if not self._ac3(queue, assignment, domains, arcs, []):
+                return None
+        # the unassigned variables, kept up to date as the search goes instead of being worked out at every step
+        ordering = _InOrder if variable_order == 'first' else _FewestValues
+        unassigned: _InOrder[V, D] = ordering(self.variables, self.constraints, assignment, domains)
+        return self._search(assignment, unassigned, domains, arcs, inference, value_order, stats)
+
+    def _search(self, assignment: Dict[V, D], unassigned: _InOrder[V, D], domains: Dict[V, List[D]], arcs: Dict[V, List[Tuple[V, Constraint[V, D]]]], inference: str, value_order: str, stats: CSPStats) -> Optional[Dict[V, D]]:
+        # the domains pruned so far, as they were before, newest last
+        trail: List[Tuple[V, List[D]]] = []
+        stack: List[_Choice[V, D]] = []
+        while True:
+            # return if we found an assignment for every variable in the CSP
+            if not len(unassigned):
+                return assignment
+            variable: V = unassigned.select()
+            stack.append(_Choice(variable, self._order_values(variable, assignment, domains, arcs, value_order), len(trail)))
+            # try values until one is consistent and survives inference, backtracking whenever a level runs out
+            while True:
+                if not stack:
+                    return None
+                choice: _Choice[V, D] = stack[-1]
+                variable = choice.variable
+                # undo the value tried last at this level, if any
+                assignment.pop(variable, None)
+                if len(trail) > choice.mark:
+                    restored: List[V] = [pruned for pruned, _ in trail[choice.mark:]]
+                    self._restore(domains, trail, choice.mark)
+                    unassigned.changed(restored)
+                if choice.tried == len(choice.values):
+                    stack.pop()
+                    stats.backtracks += 1
+                    unassigned.unselect(variable)
+                    continue
+                value: D = choice.values[choice.tried]
+                choice.tried += 1
+                stats.nodes += 1
+                assignment[variable] = value
+                if self.is_consistent(variable, assignment) and self._infer(variable, value, assignment, domains, arcs, inference, trail):
+                    unassigned.changed(pruned for pruned, _ in trail[choice.mark:])
+                    break
+
+    # the values of variable in the order to try them
+    # the list is a copy, so inference may replace domains[variable] while it is being tried
+    def _order_values(self, variable: V, assignment: Dict[V, D], domains: Dict[V, List[D]], arcs: Dict[V, List[Tuple[V, Constraint[V, D]]]], value_order: str) -> List[D]:
+        values: List[D] = list(domains[variable])
+        if value_order == 'domain' or len(values) < 2:
+            return values
+        neighbours: List[Tuple[V, Constraint[V, D]]] = [(other, constraint) for other, constraint in arcs[variable] if other not in assignment]
+
+        # how many values of the unassigned neighbours (through binary constraints) value would rule out
+        def ruled_out(value: D) -> int:
+            return sum(1 for other, constraint in neighbours for candidate in domains[other]
+                       if not constraint.satisfied({variable: value, other: candidate}))
+
+        # sorting is stable, so equally constraining values stay in domain order
+        return sorted(values, key=ruled_out)
+
+    def _infer(self, variable: V, value: D, assignment: Dict[V, D], domains: Dict[V, List[D]], arcs: Dict[V, List[Tuple[V, Constraint[V, D]]]], inference: str, trail: List[Tuple[V, List[D]]]) -> bool:
+        if inference == 'none':
+            return True
+        if inference == 'mac':
+            # the assigned variable keeps only its value, so arcs pointing at it see nothing else
+            trail.append((variable, domains[variable]))
+            domains[variable] = [value]
+        if not self._forward_check(variable, assignment, domains, trail):
+            return False
+        if inference == 'mac':
+            queue: List[Tuple[V, V, Constraint[V, D]]] = [(other, variable, constraint) for other, constraint in arcs[variable] if other not in assignment]
+            return self._ac3(queue, assignment, domains, arcs, trail)
+        return True
+
+    # remove the values of unassigned variables that a constraint of variable can no longer allow
+    # only constraints with a single unassigned variable left can be checked this way
+    # returns False if some variable has no values left
+    def _forward_check(self, variable: V, assignment: Dict[V, D], domains: Dict[V, List[D]], trail: List[Tuple[V, List[D]]]) -> bool:
+        for constraint in self.constraints[variable]:
+            open_variables: List[V] = [v for v in constraint.variables if v not in assignment]
+            if len(open_variables) != 1:
+                continue
+            other: V = open_variables[0]
+            kept: List[D] = []
+            for candidate in domains[other]:
+                assignment[other] = candidate
+                if constraint.satisfied(assignment):
+                    kept.append(candidate)
+            del assignment[other]
+            if len(kept) == len(domains[other]):
+                continue
+            trail.append((other, domains[other]))
+            domains[other] = kept
+            if not kept:
+                return False
+        return True
+
+    # AC-3: make every arc (x, y) in the queue consistent, i.e. leave x only values that some value
+    # of y supports, and recheck the arcs into x whenever x loses a value
+    # returns False if some variable has no values left
+    def _ac3(self, queue: List[Tuple[V, V, Constraint[V, D]]], assignment: Dict[V, D], domains: Dict[V, List[D]], arcs: Dict[V, List[Tuple[V, Constraint[V, D]]]], trail: List[Tuple[V, List[D]]]) -> bool:
+        while queue:
+            x, y, constraint = queue.pop()
+            if x in assignment:
+                continue
+            kept: List[D] = [a for a in domains[x] if any(constraint.satisfied({x: a, y: b}) for b in domains[y])]
+            if len(kept) == len(domains[x]):
+                continue
+            trail.append((x, domains[x]))
+            domains[x] = kept
+            if not kept:
+                return False
+            queue.extend((z, x, other_constraint) for z, other_constraint in arcs[x] if z != y and z not in assignment)
+        return True
+
+    # pruning never changes a domain list in place but replaces it,
+    # so putting the trailed lists back newest first, down to mark, undoes it exactly
+    def _restore(self, domains: Dict[V, List[D]], trail: List[Tuple[V, List[D]]], mark: int) -> None:
+        while len(trail) > mark:
+            variable, values = trail.pop()
+            domains[variable] = values
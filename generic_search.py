@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import TypeVar, Iterable, Sequence, Generic, List, Callable, Set, Deque, Dict, Any, Optional
+from typing import TypeVar, Iterable, Sequence, Generic, List, Callable, Set, Deque, Dict, Any, Optional, Tuple, Iterator
 from typing_extensions import Protocol
 from heapq import heappush, heappop 
 from timeit import default_timer as timer
+from array import array
+from dataclasses import dataclass
 
 T = TypeVar('T')
 
@@ -44,6 +46,9 @@ class Stack(Generic[T]):
 
     def push(self, item: T) -> None:
         self._container.append(item)
+
+    def __len__(self) -> int:
+        return len(self._container)
     
     def __repr__(self) -> str:
         # prints the stack from top to bottom
@@ -73,6 +78,9 @@ class Queue(Generic[T]):
     def pop(self) -> T:
         return self._container.popleft()
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def __repr__(self) -> str:
         return repr(self._container)
 
@@ -108,10 +116,125 @@ class PriorityQueue(Generic[T]):
     def pop(self) -> T:
         return heappop(self._container)
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def __repr__(self) -> None:
         return repr(self._container)
 
 
+# A binary heap that also remembers where every item sits inside it
+# so the priority of an item already in the queue can be changed in place (decrease-key)
+# instead of pushing a duplicate entry and leaving the stale one behind
+# items must be hashable, since the positions are kept in a dictionary
+class IndexedPriorityQueue(Generic[T]):
+    def __init__(self) -> None:
+        self._container: List[T] = []
+        self._priorities: Dict[T, Any] = {}
+        self._positions: Dict[T, int] = {}
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._container
+
+    def __len__(self) -> int:
+        return len(self._container)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._positions
+
+    def priority(self, item: T) -> Any:
+        return self._priorities[item]
+
+    def peek_priority(self) -> Any:
+        return self._priorities[self._container[0]]
+
+    # push a new item, or move an existing one to its new priority
+    def push(self, item: T, priority: Any) -> None:
+        if item in self._positions:
+            self.update(item, priority)
+            return
+        self._container.append(item)
+        self._priorities[item] = priority
+        self._positions[item] = len(self._container) - 1
+        self._sift_up(len(self._container) - 1)
+
+    def pop(self) -> T:
+        item: T = self._container[0]
+        self._remove_at(0)
+        return item
+
+    def decrease_key(self, item: T, priority: Any) -> None:
+        self._priorities[item] = priority
+        self._sift_up(self._positions[item])
+
+    # change the priority of an item in either direction
+    def update(self, item: T, priority: Any) -> None:
+        old_priority: Any = self._priorities[item]
+        self._priorities[item] = priority
+        if priority < old_priority:
+            self._sift_up(self._positions[item])
+        else:
+            self._sift_down(self._positions[item])
+
+    def remove(self, item: T) -> None:
+        self._remove_at(self._positions[item])
+
+    def _remove_at(self, position: int) -> None:
+        container: List[T] = self._container
+        item: T = container[position]
+        last: T = container.pop()
+        del self._positions[item]
+        del self._priorities[item]
+        if position < len(container):
+            container[position] = last
+            self._positions[last] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last])
+
+    def _sift_up(self, position: int) -> None:
+        container: List[T] = self._container
+        priorities: Dict[T, Any] = self._priorities
+        positions: Dict[T, int] = self._positions
+        item: T = container[position]
+        priority: Any = priorities[item]
+        while position > 0:
+            parent: int = (position - 1) >> 1
+            parent_item: T = container[parent]
+            if not priority < priorities[parent_item]:
+                break
+            container[position] = parent_item
+            positions[parent_item] = position
+            position = parent
+        container[position] = item
+        positions[item] = position
+
+    def _sift_down(self, position: int) -> None:
+        container: List[T] = self._container
+        priorities: Dict[T, Any] = self._priorities
+        positions: Dict[T, int] = self._positions
+        size: int = len(container)
+        item: T = container[position]
+        priority: Any = priorities[item]
+        while True:
+            child: int = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and priorities[container[child + 1]] < priorities[container[child]]:
+                child += 1
+            child_item: T = container[child]
+            if not priorities[child_item] < priority:
+                break
+            container[position] = child_item
+            positions[child_item] = position
+            position = child
+        container[position] = item
+        positions[item] = position
+
+    def __repr__(self) -> str:
+        return repr([(item, self._priorities[item]) for item in self._container])
+
+
 # Binary search depends on the sequence being sorted
 # It will not work on unsorted lists, for example
 def binary_contains(sequence: Sequence[C], key: C) -> bool:
@@ -140,75 +263,531 @@ def linear_contains(iterable: Iterable[T], key: T) -> bool:
 
 
 
-def dfs(initial: T, goal_test: Callable[[T], bool], successors:+ Callable[[T], List[T]]) -> Optional[Node[T]]:
-    # We store discovred but unexplored nodes to the unexplored stack
-    frontier: Stack[Node[T]] = Stack()
-    # The initial node will always be the starting point of the dfs
-    # We therefore push the initial node into the stack
-    frontier.push(Node(initial, None))
-    # We alse need to store explored nodes so we do not move around in loops
-    explored: Set[T] = {initial}
-    # Keep going while there are still nodes inside unexplored:
-    while not frontier.empty:
-        current_node = frontier.pop()
-        current_state = current_node.state
+# Counters filled in by dfs, bfs and astar when a stats object is passed in
+# the counters add up, so one object can be shared by several searches
+# times are in seconds, split between the successors function, the heuristic
+# and pushing/popping the frontier
+@dataclass
+class SearchStats:
+    nodes_expanded: int = 0
+    nodes_generated: int = 0
+    duplicate_pushes: int = 0
+    peak_frontier: int = 0
+    peak_explored: int = 0
+    successors_time: float = 0.0
+    heuristic_time: float = 0.0
+    frontier_time: float = 0.0
+
+
+# The search loop shared by dfs, bfs and astar
+# with a heuristic it behaves like astar, without one like dfs or bfs depending on the frontier
+# stats and on_expand are only looked at when they were asked for; the measured work on
+# the children of a node is kept apart in _push_children_measured, so plain searches skip
+# every timer call and counter
+def _search(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Optional[Callable[[T], float]], frontier: Any, stats: Optional[SearchStats], on_expand: Optional[Callable[[Node[T]], None]]) -> Optional[Node[T]]:
+    start: float = timer()
+    initial_heuristic: float = heuristic(initial) if heuristic is not None else 0.0
+    if stats is not None:
+        stats.heuristic_time += timer() - start
+        stats.peak_frontier = max(stats.peak_frontier, 1)
+        stats.peak_explored = max(stats.peak_explored, 1)
+    push: Callable[[Node[T]], None] = frontier.push
+    pop: Callable[[], Node[T]] = frontier.pop
+    push(Node(initial, None, 0.0, initial_heuristic))
+    # the cheapest cost found so far for every state discovered; dfs and bfs never improve on the first one
+    explored: Dict[T, float] = {initial: 0.0}
+
+    while len(frontier) > 0:
+        if stats is not None:
+            start = timer()
+            current_node: Node[T] = pop()
+            stats.frontier_time += timer() - start
+        else:
+            current_node = pop()
+        current_state: T = current_node.state
+        # a cheaper path to this state was pushed after this entry
+        # and has already been expanded, so there is nothing new to find here
+        if heuristic is not None and current_node.cost > explored[current_state]:
+            continue
+        if on_expand is not None:
+            on_expand(current_node)
         if goal_test(current_state):
+            if stats is not None:
+                stats.nodes_expanded += 1
             return current_node
-        # check for paths from current node
-        for child in successors(current_state):
-            # if the child is in explored, ignore and continue
-            if child in explored:
+        new_cost: float = current_node.cost + 1
+        if stats is not None:
+            _push_children_measured(current_node, successors, heuristic, push, explored, frontier, stats)
+        elif heuristic is None:
+            for child in successors(current_state):
+                if child not in explored:
+                    explored[child] = new_cost
+                    push(Node(child, current_node, new_cost))
+        else:
+            for child in successors(current_state):
+                if child not in explored or explored[child] > new_cost:
+                    explored[child] = new_cost
+                    push(Node(child, current_node, new_cost, heuristic(child)))
+    return None
+
+
+# the children of a node pushed the same way as in _search, timing and counting everything
+def _push_children_measured(current_node: Node[T], successors: Callable[[T], List[T]], heuristic: Optional[Callable[[T], float]], push: Callable[[Node[T]], None], explored: Dict[T, float], frontier: Any, stats: SearchStats) -> None:
+    stats.nodes_expanded += 1
+    start: float = timer()
+    children: List[T] = successors(current_node.state)
+    stats.successors_time += timer() - start
+    stats.nodes_generated += len(children)
+    new_cost: float = current_node.cost + 1
+    for child in children:
+        if child in explored:
+            if heuristic is None or explored[child] <= new_cost:
                 continue
-            else:
-                explored.add(child)
-                frontier.push(Node(child, current_node))
+            stats.duplicate_pushes += 1
+        explored[child] = new_cost
+        child_heuristic: float = 0.0
+        if heuristic is not None:
+            start = timer()
+            child_heuristic = heuristic(child)
+            stats.heuristic_time += timer() - start
+        start = timer()
+        push(Node(child, current_node, new_cost, child_heuristic))
+        stats.frontier_time += timer() - start
+    if len(frontier) > stats.peak_frontier:
+        stats.peak_frontier = len(frontier)
+    if len(explored) > stats.peak_explored:
+        stats.peak_explored = len(explored)
+
+
+# depth-first search: discovered but unexplored nodes wait on a stack
+def dfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], stats: Optional[SearchStats] = None, on_expand: Optional[Callable[[Node[T]], None]] = None) -> Optional[Node[T]]:
+    return _search(initial, goal_test, successors, None, Stack(), stats, on_expand)
+
+
+# breadth-first search: the frontier is a queue, so the first path found has the fewest steps
+def bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], stats: Optional[SearchStats] = None, on_expand: Optional[Callable[[Node[T]], None]] = None) -> Optional[Node[T]]:
+    return _search(initial, goal_test, successors, None, Queue(), stats, on_expand)
 
+# one of the better search algorithms out there
+# the a star algorithm augments the typical breadth-first search
 
-def bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]]) -> Optional[Node[T]]:
-    # make a frontier queue
+def astar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float], stats: Optional[SearchStats] = None, on_expand: Optional[Callable[[Node[T]], None]] = None) -> Optional[Node[T]]:
+    return _search(initial, goal_test, successors, heuristic, PriorityQueue(), stats, on_expand)
+    
+
+
+# Anytime versions of bfs and astar
+# instead of running to completion they are generators that report a SearchProgress
+# every report_every expansions, and stop early once a budget runs out:
+# max_expansions caps the number of expanded nodes, deadline is an absolute default_timer() value
+# and cancel is polled on every expansion (handy when another thread wants the search stopped)
+# the search can also simply be abandoned by closing the generator
+# the very last progress report always has done set, and carries either the solution
+# or the best partial result found so far
+@dataclass
+class SearchProgress(Generic[T]):
+    expansions: int
+    frontier_size: int
+    best: Optional[Node[T]]
+    solution: Optional[Node[T]] = None
+    done: bool = False
+    # one of 'running', 'found', 'exhausted', 'max_expansions', 'deadline' or 'cancelled'
+    reason: str = 'running'
+
+
+# why a search has to stop before expanding another node, if it has to
+def _budget_exhausted(expansions: int, max_expansions: Optional[int], deadline: Optional[float], cancel: Optional[Callable[[], bool]]) -> Optional[str]:
+    if max_expansions is not None and expansions >= max_expansions:
+        return 'max_expansions'
+    if deadline is not None and timer() >= deadline:
+        return 'deadline'
+    if cancel is not None and cancel():
+        return 'cancelled'
+    return None
+
+
+def _check_report_every(report_every: int) -> None:
+    if report_every < 1:
+        raise ValueError("report_every must be at least 1")
+
+
+# without a heuristic the best partial result is simply the last node expanded, i.e. the deepest one;
+# with one it is the expanded node estimated to be closest to the goal
+# the arguments are checked when it is called, not when the first report is asked for
+def bfs_iter(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Optional[Callable[[T], float]] = None, max_expansions: Optional[int] = None, deadline: Optional[float] = None, cancel: Optional[Callable[[], bool]] = None, report_every: int = 1000) -> Iterator[SearchProgress[T]]:
+    _check_report_every(report_every)
+    return _bfs_iter(initial, goal_test, successors, heuristic, max_expansions, deadline, cancel, report_every)
+
+
+def _bfs_iter(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Optional[Callable[[T], float]], max_expansions: Optional[int], deadline: Optional[float], cancel: Optional[Callable[[], bool]], report_every: int) -> Iterator[SearchProgress[T]]:
     frontier: Queue[Node[T]] = Queue()
-    # and push the initial node into it
     frontier.push(Node(initial, None))
-    # create a set of explored T
     explored: Set[T] = {initial}
-    # continue searching until there are nodes in the frontier
-    # or the goal is found 
+    best: Optional[Node[T]] = None
+    best_heuristic: float = float('inf')
+    expansions: int = 0
+
     while not frontier.is_empty:
+        reason: Optional[str] = _budget_exhausted(expansions, max_expansions, deadline, cancel)
+        if reason is not None:
+            yield SearchProgress(expansions, len(frontier), best, None, True, reason)
+            return
         current_node: Node[T] = frontier.pop()
-        current_state = current_node.state
+        current_state: T = current_node.state
+        expansions += 1
+        if heuristic is None:
+            best = current_node
+        else:
+            estimate: float = heuristic(current_state)
+            if estimate < best_heuristic:
+                best, best_heuristic = current_node, estimate
         if goal_test(current_state):
-            return current_node
+            yield SearchProgress(expansions, len(frontier), current_node, current_node, True, 'found')
+            return
         for child in successors(current_state):
             if child in explored:
                 continue
-            else:
-                explored.add(child)
-                frontier.push(Node(child, current_node))
+            explored.add(child)
+            frontier.push(Node(child, current_node))
+        if expansions % report_every == 0:
+            yield SearchProgress(expansions, len(frontier), best)
+    yield SearchProgress(expansions, 0, best, None, True, 'exhausted')
 
-# one of the better search algorithms out there
-# the a star algorithm augments the typical breadth-first search
 
-def astar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float]) -> Optional[Node[T]]:
+# the best partial result of astar is the expanded node with the lowest heuristic
+def astar_iter(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float], max_expansions: Optional[int] = None, deadline: Optional[float] = None, cancel: Optional[Callable[[], bool]] = None, report_every: int = 1000) -> Iterator[SearchProgress[T]]:
+    _check_report_every(report_every)
+    return _astar_iter(initial, goal_test, successors, heuristic, max_expansions, deadline, cancel, report_every)
+
+
+def _astar_iter(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float], max_expansions: Optional[int], deadline: Optional[float], cancel: Optional[Callable[[], bool]], report_every: int) -> Iterator[SearchProgress[T]]:
     frontier: PriorityQueue[Node[T]] = PriorityQueue()
     frontier.push(Node(initial, None, 0.0, heuristic(initial)))
-    explored: Dict[T, float] = {initial : 0.0}
+    explored: Dict[T, float] = {initial: 0.0}
+    best: Optional[Node[T]] = None
+    expansions: int = 0
 
     while not frontier.is_empty:
-        current_node = frontier.pop()
-        current_state = current_node.state
+        reason: Optional[str] = _budget_exhausted(expansions, max_expansions, deadline, cancel)
+        if reason is not None:
+            yield SearchProgress(expansions, len(frontier), best, None, True, reason)
+            return
+        current_node: Node[T] = frontier.pop()
+        current_state: T = current_node.state
+        if current_node.cost > explored[current_state]:
+            continue
+        expansions += 1
+        if best is None or current_node.heuristic < best.heuristic:
+            best = current_node
         if goal_test(current_state):
-            return current_node
+            yield SearchProgress(expansions, len(frontier), current_node, current_node, True, 'found')
+            return
         for child in successors(current_state):
             new_cost: float = current_node.cost + 1
             if child not in explored or explored[child] > new_cost:
                 explored[child] = new_cost
-                frontier.push(Node(child, current_node, new_cost, heuristic(child) ))
-    
+                frontier.push(Node(child, current_node, new_cost, heuristic(child)))
+        if expansions % report_every == 0:
+            yield SearchProgress(expansions, len(frontier), best)
+    yield SearchProgress(expansions, 0, best, None, True, 'exhausted')
+
+
+# drive an anytime search to the end and hand back its final report
+def run_to_completion(search: Iterator[SearchProgress[T]]) -> SearchProgress[T]:
+    progress: Optional[SearchProgress[T]] = None
+    for progress in search:
+        pass
+    return progress
+
+
+# Weighted version of the a star algorithm
+# successors yields (state, edge_cost) pairs instead of bare states
+# each state lives in the frontier at most once and has its priority lowered in place,
+# and expanded states go into a closed set and are never expanded again
+# this is only optimal for consistent heuristics (which includes the zero heuristic of dijkstra)
+def weighted_astar(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], Iterable[Tuple[T, float]]], heuristic: Callable[[T], float]) -> Optional[Node[T]]:
+    start: Node[T] = Node(initial, None, 0.0, heuristic(initial))
+    nodes: Dict[T, Node[T]] = {initial: start}
+    closed: Set[T] = set()
+    frontier: IndexedPriorityQueue[T] = IndexedPriorityQueue()
+    frontier.push(initial, start.cost + start.heuristic)
+
+    while not frontier.is_empty:
+        current_state: T = frontier.pop()
+        current_node: Node[T] = nodes[current_state]
+        if goal_test(current_state):
+            return current_node
+        closed.add(current_state)
+        for child, edge_cost in successors(current_state):
+            if child in closed:
+                continue
+            if edge_cost < 0:
+                raise ValueError("Edge costs must not be negative")
+            new_cost: float = current_node.cost + edge_cost
+            child_node: Optional[Node[T]] = nodes.get(child)
+            if child_node is None:
+                child_node = Node(child, current_node, new_cost, heuristic(child))
+                nodes[child] = child_node
+                frontier.push(child, new_cost + child_node.heuristic)
+            elif new_cost < child_node.cost:
+                # the child has not been expanded yet, so nothing hangs off its node
+                # and it can be re-parented in place
+                child_node.cost = new_cost
+                child_node.parent = current_node
+                frontier.decrease_key(child, new_cost + child_node.heuristic)
+    return None
+
+
+# dijkstra's algorithm is the weighted a star with no heuristic at all
+def dijkstra(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], Iterable[Tuple[T, float]]]) -> Optional[Node[T]]:
+    return weighted_astar(initial, goal_test, successors, lambda _: 0.0)
+
+
+# wraps an unweighted successors function so it can be used with the weighted searches
+def unit_costs(successors: Callable[[T], Iterable[T]]) -> Callable[[T], List[Tuple[T, float]]]:
+    def weighted(state: T) -> List[Tuple[T, float]]:
+        return [(child, 1.0) for child in successors(state)]
+    return weighted
+
+
+# When the goal is a single known state we can search from both ends at once
+# each side only has to cover about half the distance, so on open grids
+# the two small discs expanded are much cheaper than one big one
+# predecessors(state) must return every state that has state as a successor
+# (for undirected problems like Maze it is simply the successors function again)
+
+# glue the two halves of a bidirectional search together into one Node chain
+# so node_to_path works exactly as it does for the one-directional searches
+def _join_at(meeting: T, forward_parents: Dict[T, Optional[T]], backward_parents: Dict[T, Optional[T]]) -> Node[T]:
+    states: List[T] = []
+    state: Optional[T] = meeting
+    while state is not None:
+        states.append(state)
+        state = forward_parents[state]
+    states.reverse()
+    state = backward_parents[meeting]
+    while state is not None:
+        states.append(state)
+        state = backward_parents[state]
+    node: Optional[Node[T]] = None
+    for steps, state in enumerate(states):
+        node = Node(state, node, float(steps))
+    return node
+
+
+# expand one whole layer of a bfs frontier
+# returns the next layer and the first state that the other side has already reached
+def _expand_layer(layer: List[T], parents: Dict[T, Optional[T]], other_parents: Dict[T, Optional[T]], expand: Callable[[T], List[T]]) -> Tuple[List[T], Optional[T]]:
+    next_layer: List[T] = []
+    for state in layer:
+        for child in expand(state):
+            if child in parents:
+                continue
+            parents[child] = state
+            if child in other_parents:
+                return next_layer, child
+            next_layer.append(child)
+    return next_layer, None
+
+
+def bidirectional_bfs(initial: T, goal: T, successors: Callable[[T], List[T]], predecessors: Callable[[T], List[T]]) -> Optional[Node[T]]:
+    if initial == goal:
+        return Node(initial, None)
+    forward_parents: Dict[T, Optional[T]] = {initial: None}
+    backward_parents: Dict[T, Optional[T]] = {goal: None}
+    forward_layer: List[T] = [initial]
+    backward_layer: List[T] = [goal]
+    # always grow the smaller of the two frontiers by a full layer
+    # the first state reached from both sides lies on a shortest path
+    while forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            forward_layer, meeting = _expand_layer(forward_layer, forward_parents, backward_parents, successors)
+        else:
+            backward_layer, meeting = _expand_layer(backward_layer, backward_parents, forward_parents, predecessors)
+        if meeting is not None:
+            return _join_at(meeting, forward_parents, backward_parents)
+    return None
+
+
+# heuristic estimates the distance to goal, reverse_heuristic the distance back to initial
+# both must be admissible for the returned path to be a shortest one
+def bidirectional_astar(initial: T, goal: T, successors: Callable[[T], List[T]], predecessors: Callable[[T], List[T]], heuristic: Callable[[T], float], reverse_heuristic: Callable[[T], float]) -> Optional[Node[T]]:
+    forward: PriorityQueue[Node[T]] = PriorityQueue()
+    backward: PriorityQueue[Node[T]] = PriorityQueue()
+    forward.push(Node(initial, None, 0.0, heuristic(initial)))
+    backward.push(Node(goal, None, 0.0, reverse_heuristic(goal)))
+    forward_costs: Dict[T, float] = {initial: 0.0}
+    backward_costs: Dict[T, float] = {goal: 0.0}
+    forward_parents: Dict[T, Optional[T]] = {initial: None}
+    backward_parents: Dict[T, Optional[T]] = {goal: None}
+    # cost of the best complete path seen so far, and where its two halves meet
+    best: float = 0.0 if initial == goal else float('inf')
+    meeting: Optional[T] = initial if initial == goal else None
+
+    while not forward.is_empty and not backward.is_empty:
+        forward_top: Node[T] = forward._container[0]
+        backward_top: Node[T] = backward._container[0]
+        # no path through either frontier can beat the best one found any more
+        if max(forward_top.cost + forward_top.heuristic, backward_top.cost + backward_top.heuristic) >= best:
+            break
+        if forward_top < backward_top:
+            frontier, costs, parents, other_costs = forward, forward_costs, forward_parents, backward_costs
+            expand, estimate = successors, heuristic
+        else:
+            frontier, costs, parents, other_costs = backward, backward_costs, backward_parents, forward_costs
+            expand, estimate = predecessors, reverse_heuristic
+        current_node: Node[T] = frontier.pop()
+        # skip entries that were superseded by a cheaper path to the same state
+        if current_node.cost > costs[current_node.state]:
+            continue
+        new_cost: float = current_node.cost + 1
+        for child in expand(current_node.state):
+            if child not in costs or costs[child] > new_cost:
+                costs[child] = new_cost
+                parents[child] = current_node.state
+                frontier.push(Node(child, current_node, new_cost, estimate(child)))
+                if child in other_costs and new_cost + other_costs[child] < best:
+                    best = new_cost + other_costs[child]
+                    meeting = child
+
+    if meeting is None:
+        return None
+    return _join_at(meeting, forward_parents, backward_parents)
+
+
+# For state spaces in the millions, allocating one Node per discovered state
+# (plus keeping full states in the explored set/dict) costs far more memory than the search needs
+# the compact engine asks the caller for an encoder that maps every state onto
+# an integer in range(num_states) and a decoder for the way back
+# parent pointers, costs and visited flags then live in flat arrays instead of Node chains
+
+# parent indices need 4 bytes per state unless the state space is huge
+# (the graph modules size their vertex and edge index arrays with it too)
+def index_typecode(num_states: int) -> str:
+    return 'i' if num_states < 2 ** 31 else 'q'
+
+
+# A compact node is only a view into the parent array of a finished search
+# it exposes state, parent and cost like a Node does, so callers can treat it the same way
+class CompactNode(Generic[T]):
+    __slots__ = ('index', '_parents', '_costs', '_decode')
+
+    def __init__(self, index: int, parents: array, decode: Callable[[int], T], costs: Optional[array] = None) -> None:
+        self.index: int = index
+        self._parents: array = parents
+        self._costs: Optional[array] = costs
+        self._decode: Callable[[int], T] = decode
+
+    @property
+    def state(self) -> T:
+        return self._decode(self.index)
+
+    @property
+    def parent(self) -> Optional[CompactNode[T]]:
+        parent_index: int = self._parents[self.index]
+        if parent_index < 0:
+            return None
+        return CompactNode(parent_index, self._parents, self._decode, self._costs)
+
+    @property
+    def cost(self) -> float:
+        # bfs and dfs do not track costs, so count the steps back to the root instead
+        if self._costs is not None:
+            return self._costs[self.index]
+        return float(len(self.indices()) - 1)
+
+    # walk the parent array back to the root, without building any views on the way
+    def indices(self) -> List[int]:
+        parents: array = self._parents
+        index: int = self.index
+        path: List[int] = [index]
+        while parents[index] >= 0:
+            index = parents[index]
+            path.append(index)
+        path.reverse()
+        return path
+
+
+def dfs_compact(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], encode: Callable[[T], int], decode: Callable[[int], T], num_states: int) -> Optional[CompactNode[T]]:
+    parents: array = array(index_typecode(num_states), [-1]) * num_states
+    visited: bytearray = bytearray(num_states)
+    # the stack only ever holds encoded states
+    frontier: array = array(parents.typecode, [encode(initial)])
+    visited[frontier[0]] = 1
+    while frontier:
+        current: int = frontier.pop()
+        current_state: T = decode(current)
+        if goal_test(current_state):
+            return CompactNode(current, parents, decode)
+        for child in successors(current_state):
+            index: int = encode(child)
+            if visited[index]:
+                continue
+            visited[index] = 1
+            parents[index] = current
+            frontier.append(index)
+    return None
+
+
+def bfs_compact(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], encode: Callable[[T], int], decode: Callable[[int], T], num_states: int) -> Optional[CompactNode[T]]:
+    parents: array = array(index_typecode(num_states), [-1]) * num_states
+    visited: bytearray = bytearray(num_states)
+    # the queue is a flat array of encoded states read through a moving head
+    # every state is appended at most once, so it never outgrows num_states
+    frontier: array = array(parents.typecode, [encode(initial)])
+    visited[frontier[0]] = 1
+    head: int = 0
+    while head < len(frontier):
+        current: int = frontier[head]
+        head += 1
+        current_state: T = decode(current)
+        if goal_test(current_state):
+            return CompactNode(current, parents, decode)
+        for child in successors(current_state):
+            index: int = encode(child)
+            if visited[index]:
+                continue
+            visited[index] = 1
+            parents[index] = current
+            frontier.append(index)
+    return None
+
+
+def astar_compact(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], List[T]], heuristic: Callable[[T], float], encode: Callable[[T], int], decode: Callable[[int], T], num_states: int) -> Optional[CompactNode[T]]:
+    parents: array = array(index_typecode(num_states), [-1]) * num_states
+    costs: array = array('d', [float('inf')]) * num_states
+    closed: bytearray = bytearray(num_states)
+    start: int = encode(initial)
+    costs[start] = 0.0
+    # the heap holds (f, index) pairs; an index whose cost improved is pushed again
+    # and the older entry is skipped once the index has been closed
+    frontier: List = [(heuristic(initial), start)]
+
+    while frontier:
+        current: int = heappop(frontier)[1]
+        if closed[current]:
+            continue
+        closed[current] = 1
+        current_state: T = decode(current)
+        if goal_test(current_state):
+            return CompactNode(current, parents, decode, costs)
+        new_cost: float = costs[current] + 1
+        for child in successors(current_state):
+            index: int = encode(child)
+            if new_cost < costs[index]:
+                costs[index] = new_cost
+                parents[index] = current
+                closed[index] = 0
+                heappush(frontier, (new_cost + heuristic(child), index))
+    return None
 
 
 # We want to know the path that needs to be taken
 # from the starting node to reach the goal node
 def node_to_path(node: Node[T]) -> List:
+    # a compact search already holds the whole path in its parent array
+    if isinstance(node, CompactNode):
+        return [node._decode(index) for index in node.indices()]
     # create a list of nodes
     # the node passed into the function muset be on the path
     # hence the list has the node as one of its elements
@@ -0,0 +1,145 @@
+from typing import List, NamedTuple, Optional, Sequence, Iterator, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed, Future
+from multiprocessing import shared_memory
+from generic_search import bfs_compact, astar_compact, CompactNode
+from graphs.maze import Maze, MazeLocation
+from timeit import default_timer as timer
+import random
+
+
+# One query of a batch: which maze (an index into the list of mazes) and where to go
+class MazeQuery(NamedTuple):
+    maze: int
+    start: MazeLocation
+    goal: MazeLocation
+
+
+# The answer to one query, tagged with the position of the query in the batch
+# the path is a flat array of row, column pairs (r0, c0, r1, c1, ...), or None if there is none
+class BatchResult(NamedTuple):
+    query: int
+    path: Optional[array]
+
+
+# The picklable description of one maze inside the shared grid buffer
+class _GridSpec(NamedTuple):
+    offset: int
+    rows: int
+    columns: int
+
+
+# state of a worker process: the shared buffer and where each maze sits in it
+_shared: Optional[shared_memory.SharedMemory] = None
+_grids: List[Tuple[memoryview, int]] = []
+
+
+def _attach(name: str, specs: List[_GridSpec]) -> None:
+    global _shared, _grids
+    _shared = shared_memory.SharedMemory(name=name)
+    buffer: memoryview = _shared.buf
+    _grids = [(buffer[spec.offset:spec.offset + spec.rows * spec.columns], spec.columns) for spec in specs]
+
+
+# Search one maze given only its blocked mask, with cells addressed by their row-major index
+def _solve(blocked: memoryview, columns: int, start: int, goal: int, algorithm: str) -> Optional[array]:
+    size: int = len(blocked)
+    goal_row, goal_column = divmod(goal, columns)
+
+    def successors(p: int) -> List[int]:
+        cells: List[int] = []
+        column: int = p % columns
+        if p + columns < size and not blocked[p + columns]:
+            cells.append(p + columns)
+        if p >= columns and not blocked[p - columns]:
+            cells.append(p - columns)
+        if column + 1 < columns and not blocked[p + 1]:
+            cells.append(p + 1)
+        if column > 0 and not blocked[p - 1]:
+            cells.append(p - 1)
+        return cells
+
+    def goal_test(p: int) -> bool:
+        return p == goal
+
+    def identity(p: int) -> int:
+        return p
+
+    if algorithm == 'bfs':
+        solution: Optional[CompactNode[int]] = bfs_compact(start, goal_test, successors, identity, identity, size)
+    elif algorithm == 'astar':
+        def manhattan(p: int) -> float:
+            row, column = divmod(p, columns)
+            return abs(row - goal_row) + abs(column - goal_column)
+        solution = astar_compact(start, goal_test, successors, manhattan, identity, identity, size)
+    else:
+        raise ValueError(f"Unknown algorithm {algorithm}")
+    if solution is None:
+        return None
+    path: array = array('i')
+    for p in solution.indices():
+        path.extend(divmod(p, columns))
+    return path
+
+
+def _solve_chunk(algorithm: str, chunk: List[Tuple[int, int, int, int]]) -> List[Tuple[int, Optional[array]]]:
+    results: List[Tuple[int, Optional[array]]] = []
+    for query, maze, start, goal in chunk:
+        blocked, columns = _grids[maze]
+        results.append((query, _solve(blocked, columns, start, goal, algorithm)))
+    return results
+
+
+# Solve a batch of independent queries on a process pool
+# every maze's blocked mask is copied once into one shared memory block,
+# which the workers map read-only when they start, so no grid travels with any task
+# queries are sent in chunks of chunk_size to keep the scheduling overhead low,
+# and results are yielded as soon as their chunk is done, so they do not arrive in query order
+# algorithm is 'bfs' or 'astar' (with the manhattan distance)
+def solve_batch(mazes: Sequence[Maze], queries: Sequence[MazeQuery], algorithm: str = 'astar', workers: Optional[int] = None, chunk_size: int = 64) -> Iterator[BatchResult]:
+    masks: List[bytearray] = [maze.blocked_mask() for maze in mazes]
+    specs: List[_GridSpec] = []
+    offset: int = 0
+    for maze, mask in zip(mazes, masks):
+        specs.append(_GridSpec(offset, maze._rows, maze._columns))
+        offset += len(mask)
+    shared: shared_memory.SharedMemory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    try:
+        for spec, mask in zip(specs, masks):
+            shared.buf[spec.offset:spec.offset + len(mask)] = mask
+        del masks
+        tasks: List[Tuple[int, int, int, int]] = []
+        for position, query in enumerate(queries):
+            columns: int = specs[query.maze].columns
+            tasks.append((position, query.maze, query.start.row * columns + query.start.column, query.goal.row * columns + query.goal.column))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shared.name, specs)) as pool:
+            futures: List[Future] = [pool.submit(_solve_chunk, algorithm, tasks[i:i + chunk_size]) for i in range(0, len(tasks), chunk_size)]
+            try:
+                for future in as_completed(futures):
+                    for position, path in future.result():
+                        yield BatchResult(position, path)
+            finally:
+                # the caller may stop listening early, in which case the rest is not worth computing
+                for future in futures:
+                    future.cancel()
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+# turn the flat coordinate array of a result back into maze locations, e.g. for Maze.mark
+def path_locations(path: array) -> List[MazeLocation]:
+    return [MazeLocation(path[i], path[i + 1]) for i in range(0, len(path), 2)]
+
+
+if __name__ == '__main__':
+    mazes: List[Maze] = [Maze(200, 200, 0.2, MazeLocation(0, 0), MazeLocation(199, 199)) for _ in range(4)]
+    queries: List[MazeQuery] = [MazeQuery(random.randrange(len(mazes)), MazeLocation(random.randrange(200), random.randrange(200)), MazeLocation(random.randrange(200), random.randrange(200))) for _ in range(400)]
+
+    stime = timer()
+    solved: int = 0
+    for result in solve_batch(mazes, queries):
+        if result.path is not None:
+            solved += 1
+    etime = timer()
+    print(f'{solved} of {len(queries)} queries solved, time taken: {etime - stime}')
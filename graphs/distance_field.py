@@ -0,0 +1,135 @@
+from typing import List, Optional, Sequence, Any
+from array import array
+from graphs.maze import Maze, MazeLocation
+from generic_search import bfs, node_to_path
+from timeit import default_timer as timer
+
+# codes stored in the next-hop field: which way to step to get one cell closer to a goal
+NO_HOP: int = 0
+UP: int = 1
+DOWN: int = 2
+LEFT: int = 3
+RIGHT: int = 4
+
+
+# When many queries share one maze and one goal, running bfs for every query repeats the same work
+# a distance field runs a single breadth-first wavefront outwards from the goal(s) instead
+# and records, for every cell, how far away the nearest goal is and which neighbour leads there
+# every query after that is a walk along the next-hop field, with no search at all
+#
+# several goals may be given at once; each cell then points to whichever goal is nearest
+# distances are -1 for blocked and unreachable cells
+class DistanceField:
+    def __init__(self, maze: Maze, goals: Optional[Sequence[MazeLocation]] = None) -> None:
+        if goals is None:
+            goals = [maze._goal]
+        self._rows: int = maze._rows
+        self._columns: int = maze._columns
+        rows: int = self._rows
+        columns: int = self._columns
+        # the wavefront runs on a copy of the grid padded with a blocked border
+        # so that neighbours never need bounds checks
+        width: int = columns + 2
+        mask: bytearray = maze.blocked_mask()
+        seen: bytearray = bytearray(b"\x01") * (width * (rows + 2))
+        for r in range(rows):
+            start: int = (r + 1) * width + 1
+            seen[start:start + columns] = mask[r * columns:(r + 1) * columns]
+        distances: array = array('i', [-1]) * len(seen)
+        hops: bytearray = bytearray(len(seen))
+        # stepping from p to p + offset means the way back is the direction stored with it
+        moves = ((-width, DOWN), (width, UP), (-1, RIGHT), (1, LEFT))
+
+        frontier: List[int] = []
+        for goal in goals:
+            p: int = (goal.row + 1) * width + goal.column + 1
+            if not seen[p]:
+                seen[p] = 1
+                distances[p] = 0
+                frontier.append(p)
+        level: int = 0
+        # expand one whole wavefront (all cells at the same distance) at a time
+        while frontier:
+            level += 1
+            next_frontier: List[int] = []
+            append = next_frontier.append
+            for p in frontier:
+                for offset, back in moves:
+                    q: int = p + offset
+                    if not seen[q]:
+                        seen[q] = 1
+                        distances[q] = level
+                        hops[q] = back
+                        append(q)
+            frontier = next_frontier
+
+        # keep the fields in the maze's own row-major layout, without the border
+        self.distances: array = array('i')
+        self.next_hops: bytearray = bytearray()
+        for r in range(rows):
+            start = (r + 1) * width + 1
+            self.distances.extend(distances[start:start + columns])
+            self.next_hops.extend(hops[start:start + columns])
+        self._steps = (0, -columns, columns, -1, 1)
+
+    # rebuild a field from stored arrays (anything indexable, e.g. views of a memory-mapped file)
+    @classmethod
+    def from_arrays(cls, rows: int, columns: int, distances: Any, next_hops: Any) -> 'DistanceField':
+        field: DistanceField = cls.__new__(cls)
+        field._rows = rows
+        field._columns = columns
+        field.distances = distances
+        field.next_hops = next_hops
+        field._steps = (0, -columns, columns, -1, 1)
+        return field
+
+    def distance(self, ml: MazeLocation) -> Optional[int]:
+        d: int = self.distances[ml.row * self._columns + ml.column]
+        return d if d >= 0 else None
+
+    def next_hop(self, ml: MazeLocation) -> Optional[MazeLocation]:
+        index: int = ml.row * self._columns + ml.column
+        hop: int = self.next_hops[index]
+        if hop == NO_HOP:
+            return None
+        return MazeLocation(*divmod(index + self._steps[hop], self._columns))
+
+    # the shortest path from ml to the nearest goal, ready to be passed to Maze.mark
+    # O(path length): one lookup in the next-hop field per step
+    def path(self, ml: MazeLocation) -> Optional[List[MazeLocation]]:
+        index: int = ml.row * self._columns + ml.column
+        if self.distances[index] < 0:
+            return None
+        next_hops: bytearray = self.next_hops
+        steps = self._steps
+        columns: int = self._columns
+        path: List[MazeLocation] = [ml]
+        hop: int = next_hops[index]
+        while hop != NO_HOP:
+            index += steps[hop]
+            path.append(MazeLocation(*divmod(index, columns)))
+            hop = next_hops[index]
+        return path
+
+
+if __name__ == '__main__':
+    m = Maze(200, 200, 0.2, MazeLocation(0, 0), MazeLocation(199, 199))
+
+    stime1 = timer()
+    field: DistanceField = DistanceField(m)
+    etime1 = timer()
+    print(f'distance field built in: {etime1 - stime1}')
+
+    # answer the same queries with the field and with a fresh bfs each time
+    blocked: bytearray = m.blocked_mask()
+    queries: List[MazeLocation] = [MazeLocation(r, r) for r in range(0, 200, 10) if not blocked[m.encode(MazeLocation(r, r))]]
+    stime2 = timer()
+    field_paths = [field.path(q) for q in queries]
+    etime2 = timer()
+    stime3 = timer()
+    bfs_paths = [bfs(q, m.goal_test, m.successors) for q in queries]
+    etime3 = timer()
+    print(f'{len(queries)} queries using the distance field: {etime2 - stime2}')
+    print(f'{len(queries)} queries using breadth-first search: {etime3 - stime3}')
+    same: bool = all(len(p) == len(node_to_path(s)) if s is not None else p is None for p, s in zip(field_paths, bfs_paths))
+    print(f'same path lengths: {same}')
@@ -0,0 +1,175 @@
+from typing import List, Optional, Sequence, Tuple
+from array import array
+import random
+from generic_search import IndexedPriorityQueue, astar, node_to_path, SearchStats
+from graphs.maze import Maze, MazeLocation, Cell, BLOCKED, manhattan_distance
+from timeit import default_timer as timer
+
+INFINITY: float = float('inf')
+
+
+# Incremental replanning on a Maze whose walls change while it is being used (D* Lite)
+# rerunning astar after every change throws away all the work of the previous search
+# D* Lite instead keeps, for every cell it has looked at, its distance to the goal (g) and a
+# one-step lookahead of that distance (rhs); a change to a few cells only makes those cells
+# and their neighbours inconsistent, and only the part of the search that depends on them is redone
+#
+# the search runs backwards from the goal, so the start may move along the path (move_to)
+# without invalidating anything; km keeps the keys already in the queue comparable after a move
+#
+# usage: plan once with current_path(), then after a batch of changes
+#   planner.update_cells([(location, Cell.BLOCKED), (other, Cell.EMPTY)])
+#   planner.current_path()
+# the maze itself is updated by update_cells, so it always matches what the planner knows
+class DStarLite:
+    def __init__(self, maze: Maze, start: Optional[MazeLocation] = None, goal: Optional[MazeLocation] = None) -> None:
+        self._maze: Maze = maze
+        self._columns: int = maze._columns
+        self._start: int = maze.encode(start if start is not None else maze._start)
+        self._goal: int = maze.encode(goal if goal is not None else maze._goal)
+        self._last: int = self._start
+        self._km: float = 0.0
+        self._g: array = array('d', [INFINITY]) * maze.num_cells
+        self._rhs: array = array('d', [INFINITY]) * maze.num_cells
+        self._queue: IndexedPriorityQueue[int] = IndexedPriorityQueue()
+        # cells taken off the queue by the last call to current_path, to compare with astar
+        self.expansions: int = 0
+        if maze._grid[self._goal] != BLOCKED:
+            self._rhs[self._goal] = 0.0
+            self._queue.push(self._goal, self._key(self._goal))
+
+    # manhattan distance between two cell indices, admissible for unit moves in four directions
+    def _h(self, a: int, b: int) -> float:
+        row_a, column_a = divmod(a, self._columns)
+        row_b, column_b = divmod(b, self._columns)
+        return abs(row_a - row_b) + abs(column_a - column_b)
+
+    def _key(self, index: int) -> Tuple[float, float]:
+        best: float = min(self._g[index], self._rhs[index])
+        return best + self._h(self._start, index) + self._km, best
+
+    def _open_neighbours(self, index: int) -> List[int]:
+        grid = self._maze._grid
+        return [neighbour for neighbour in self._maze._around(index) if grid[neighbour] != BLOCKED]
+
+    # recompute the lookahead of one cell and put it on the queue if (and only if) it is inconsistent
+    def _update_vertex(self, index: int) -> None:
+        if self._maze._grid[index] == BLOCKED:
+            self._rhs[index] = INFINITY
+        elif index != self._goal:
+            g = self._g
+            self._rhs[index] = min((g[neighbour] for neighbour in self._open_neighbours(index)), default=INFINITY) + 1
+        queue: IndexedPriorityQueue[int] = self._queue
+        if self._g[index] != self._rhs[index]:
+            queue.push(index, self._key(index))
+        elif index in queue:
+            queue.remove(index)
+
+    def _compute_shortest_path(self) -> None:
+        queue: IndexedPriorityQueue[int] = self._queue
+        g: array = self._g
+        rhs: array = self._rhs
+        start: int = self._start
+        self.expansions = 0
+        while not queue.is_empty and (queue.peek_priority() < self._key(start) or rhs[start] != g[start]):
+            old_key: Tuple[float, float] = queue.peek_priority()
+            index: int = queue.pop()
+            new_key: Tuple[float, float] = self._key(index)
+            if old_key < new_key:
+                # the start moved since this key was computed
+                queue.push(index, new_key)
+                continue
+            self.expansions += 1
+            if g[index] > rhs[index]:
+                # overconsistent: the cell got closer to the goal, pass that on to its neighbours
+                g[index] = rhs[index]
+                for neighbour in self._open_neighbours(index):
+                    self._update_vertex(neighbour)
+            else:
+                # underconsistent: the cell got further away, so everything that relied on it is redone
+                g[index] = INFINITY
+                self._update_vertex(index)
+                for neighbour in self._open_neighbours(index):
+                    self._update_vertex(neighbour)
+
+    # change cells of the maze (e.g. to Cell.BLOCKED or Cell.EMPTY) and repair the search around them
+    # the repair itself is lazy: it happens on the next call to current_path
+    def update_cells(self, changes: Sequence[Tuple[MazeLocation, Cell]]) -> None:
+        maze: Maze = self._maze
+        changed: List[int] = []
+        for location, cell in changes:
+            index: int = maze.encode(location)
+            if (maze._grid[index] == BLOCKED) != (cell == Cell.BLOCKED):
+                changed.append(index)
+            maze.set_cell(location, cell)
+        if not changed:
+            return
+        # the start may have moved since the queue was last looked at
+        self._km += self._h(self._last, self._start)
+        self._last = self._start
+        if self._goal in changed and maze._grid[self._goal] != BLOCKED:
+            self._rhs[self._goal] = 0.0
+        for index in changed:
+            self._update_vertex(index)
+            for neighbour in maze._around(index):
+                self._update_vertex(neighbour)
+
+    # let the agent move: plan from a new start without starting over
+    def move_to(self, start: MazeLocation) -> None:
+        self._start = self._maze.encode(start)
+
+    # the current shortest path from start to goal, or None if the goal cannot be reached
+    def current_path(self) -> Optional[List[MazeLocation]]:
+        self._compute_shortest_path()
+        g: array = self._g
+        index: int = self._start
+        if g[index] == INFINITY or self._maze._grid[index] == BLOCKED:
+            return None
+        maze: Maze = self._maze
+        path: List[MazeLocation] = [maze.decode(index)]
+        # walk downhill: every step goes to the open neighbour closest to the goal
+        while index != self._goal:
+            index = min(self._open_neighbours(index), key=g.__getitem__)
+            path.append(maze.decode(index))
+        return path
+
+
+if __name__ == '__main__':
+    m = Maze(200, 200, 0.2, MazeLocation(0, 0), MazeLocation(199, 199))
+    m.precompute_neighbours()
+    planner: DStarLite = DStarLite(m)
+
+    stime1 = timer()
+    path: Optional[List[MazeLocation]] = planner.current_path()
+    etime1 = timer()
+    print(f'initial plan: path length {len(path) if path else None}, nodes expanded {planner.expansions}, time taken: {etime1 - stime1}')
+
+    # every batch blocks one cell of the current path and opens one wall somewhere else,
+    # then the planner repairs its search while astar starts over
+    replan_time: float = 0.0
+    astar_time: float = 0.0
+    replan_expansions: int = 0
+    astar_expansions: int = 0
+    batches: int = 20
+    for _ in range(batches):
+        if path is None:
+            break
+        changes = [(random.choice(path[1:-1]), Cell.BLOCKED)]
+        wall: MazeLocation = MazeLocation(random.randrange(200), random.randrange(200))
+        if m.cell(wall) == Cell.BLOCKED:
+            changes.append((wall, Cell.EMPTY))
+        stime = timer()
+        planner.update_cells(changes)
+        path = planner.current_path()
+        replan_time += timer() - stime
+        replan_expansions += planner.expansions
+
+        stats: SearchStats = SearchStats()
+        stime = timer()
+        solution = astar(m._start, m.goal_test, m.successors, manhattan_distance(m._goal), stats=stats)
+        astar_time += timer() - stime
+        astar_expansions += stats.nodes_expanded
+        assert (solution is None) == (path is None)
+        assert solution is None or len(node_to_path(solution)) == len(path)
+    print(f'{batches} replans: nodes expanded {replan_expansions}, time taken: {replan_time}')
+    print(f'{batches} fresh astar searches: nodes expanded {astar_expansions}, time taken: {astar_time}')
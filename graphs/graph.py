@@ -1,9 +1,157 @@
-from typing import TypeVar, Generic, List, Optional
+from __future__ import annotations
+from typing import TypeVar, Generic, List, Optional, Sequence, Iterable, Iterator, Tuple, Dict, Union
+from array import array
+from itertools import accumulate
+from generic_search import bfs, node_to_path, index_typecode
 from graphs.edge import Edge
 
 V = TypeVar('V')
 
+
+# the item type of an array or memoryview (e.g. of a memory-mapped snapshot), which name it differently
+def array_typecode(block: Union[array, memoryview]) -> str:
+    return block.typecode if isinstance(block, array) else block.format
+
+
+# A graph stored in compressed sparse row (CSR) form
+# instead of one Edge object per edge, all edges live in flat arrays:
+#   neighbours[offsets[i]:offsets[i + 1]] are the indices of the vertices next to vertex i
+#   weights[offsets[i]:offsets[i + 1]] are the weights of those edges (if the graph has weights)
+# which takes a few bytes per edge, so graphs with tens of millions of edges fit in memory
+#
+# vertices may be any hashable values, or a range when the vertices are just 0..n - 1,
+# in which case index lookups need no dictionary at all
+# undirected graphs store every edge once in each direction
 class Graph(Generic[V]):
-    def __init__(self, vertices: List[V] = []) -> None:
-        self._vertices: List[V] = vertices
-        self.edges: List[List[Edge]] = [[] for _ in vertices]
\ No newline at end of file
+    def __init__(self, vertices: Optional[Sequence[V]] = None, offsets: Optional[array] = None, neighbours: Optional[array] = None, weights: Optional[array] = None, directed: bool = False) -> None:
+        self._vertices: Sequence[V] = vertices if vertices is not None else []
+        n: int = len(self._vertices)
+        self.directed: bool = directed
+        self.offsets: array = offsets if offsets is not None else array('q', [0]) * (n + 1)
+        self.neighbours: array = neighbours if neighbours is not None else array(index_typecode(n))
+        self.weights: Optional[array] = weights
+        self._indices: Optional[Dict[V, int]] = None
+        if not isinstance(self._vertices, range):
+            self._indices = {vertex: index for index, vertex in enumerate(self._vertices)}
+
+    # build a graph from parallel arrays of edge endpoints (vertex indices) in two counting sort passes:
+    # one to count the degree of every vertex, one to drop every edge into its slot
+    @classmethod
+    def from_edges(cls, vertices: Union[int, Sequence[V]], sources: Sequence[int], targets: Sequence[int], weights: Optional[Sequence[float]] = None, directed: bool = False) -> Graph[V]:
+        if isinstance(vertices, int):
+            vertices = range(vertices)
+        n: int = len(vertices)
+        if len(sources) != len(targets) or (weights is not None and len(weights) != len(sources)):
+            raise ValueError("sources, targets and weights must have the same length")
+        if len(sources) and (min(min(sources), min(targets)) < 0 or max(max(sources), max(targets)) >= n):
+            raise ValueError("edge endpoint out of range")
+        # an undirected edge is placed once from each end, without copying the edge arrays
+        passes: List[Tuple[Sequence[int], Sequence[int]]] = [(sources, targets)] if directed else [(sources, targets), (targets, sources)]
+        m: int = len(sources) * len(passes)
+        counts: array = array('q', [0]) * (n + 1)
+        for ends, _ in passes:
+            for u in ends:
+                counts[u + 1] += 1
+        offsets: array = array(index_typecode(m), accumulate(counts))
+        positions: array = offsets[:-1]
+        neighbours: array = array(index_typecode(n), [0]) * m
+        edge_weights: Optional[array] = array('d', [0.0]) * m if weights is not None else None
+        for ends, other_ends in passes:
+            if edge_weights is None:
+                for u, v in zip(ends, other_ends):
+                    p: int = positions[u]
+                    neighbours[p] = v
+                    positions[u] = p + 1
+            else:
+                for u, v, weight in zip(ends, other_ends, weights):
+                    p = positions[u]
+                    neighbours[p] = v
+                    edge_weights[p] = weight
+                    positions[u] = p + 1
+        return cls(vertices, offsets, neighbours, edge_weights, directed)
+
+    # the old way of describing a graph: a list of Edge objects between vertex indices
+    @classmethod
+    def from_edge_list(cls, vertices: Union[int, Sequence[V]], edges: Iterable[Edge], directed: bool = False) -> Graph[V]:
+        sources: array = array('q')
+        targets: array = array('q')
+        for edge in edges:
+            sources.append(edge.u)
+            targets.append(edge.v)
+        return cls.from_edges(vertices, sources, targets, directed=directed)
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self._vertices)
+
+    # number of edges, each undirected edge counted once
+    @property
+    def edge_count(self) -> int:
+        return len(self.neighbours) if self.directed else len(self.neighbours) // 2
+
+    def vertex_at(self, index: int) -> V:
+        return self._vertices[index]
+
+    def index_of(self, vertex: V) -> int:
+        if self._indices is None:
+            return self._vertices.index(vertex)
+        return self._indices[vertex]
+
+    def degree(self, index: int) -> int:
+        return self.offsets[index + 1] - self.offsets[index]
+
+    # the indices of the neighbours of a vertex, as a slice of the neighbour array
+    def neighbour_indices(self, index: int) -> array:
+        return self.neighbours[self.offsets[index]:self.offsets[index + 1]]
+
+    def neighbours_for_index(self, index: int) -> List[V]:
+        vertices: Sequence[V] = self._vertices
+        return [vertices[neighbour] for neighbour in self.neighbours[self.offsets[index]:self.offsets[index + 1]]]
+
+    def neighbours_for_vertex(self, vertex: V) -> List[V]:
+        return self.neighbours_for_index(self.index_of(vertex))
+
+    # (neighbour index, weight) pairs; edges of unweighted graphs weigh 1
+    def weighted_neighbour_indices(self, index: int) -> Iterator[Tuple[int, float]]:
+        start: int = self.offsets[index]
+        end: int = self.offsets[index + 1]
+        if self.weights is None:
+            return ((neighbour, 1.0) for neighbour in self.neighbours[start:end])
+        return zip(self.neighbours[start:end], self.weights[start:end])
+
+    def edges_for_index(self, index: int) -> List[Edge]:
+        return [Edge(index, neighbour) for neighbour in self.neighbour_indices(index)]
+
+    # successors functions for generic_search: by vertex for dfs/bfs/astar, with weights for
+    # weighted_astar/dijkstra, and by index (with an identity encoder) for the compact searches
+    def successors(self, vertex: V) -> List[V]:
+        return self.neighbours_for_vertex(vertex)
+
+    def weighted_successors(self, vertex: V) -> List[Tuple[V, float]]:
+        vertices: Sequence[V] = self._vertices
+        return [(vertices[neighbour], weight) for neighbour, weight in self.weighted_neighbour_indices(self.index_of(vertex))]
+
+    def index_successors(self, index: int) -> List[int]:
+        return self.neighbours[self.offsets[index]:self.offsets[index + 1]].tolist()
+
+    def __len__(self) -> int:
+        return len(self._vertices)
+
+    def __str__(self) -> str:
+        lines: List[str] = []
+        for index in range(self.vertex_count):
+            lines.append(f"{self.vertex_at(index)} -> {self.neighbours_for_index(index)}")
+        return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    city_graph: Graph[str] = Graph.from_edges(
+        ["Seattle", "San Francisco", "Los Angeles", "Riverside", "Phoenix", "Chicago", "Boston", "New York", "Atlanta", "Miami", "Dallas", "Houston", "Detroit", "Philadelphia", "Washington"],
+        [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 10, 10, 10, 11, 11, 8, 8, 8, 9, 5, 12, 12, 12, 6, 7, 13],
+        [5, 1, 3, 2, 3, 4, 4, 5, 10, 11, 5, 8, 11, 8, 9, 5, 14, 9, 14, 12, 6, 14, 7, 7, 13, 14])
+    print(city_graph)
+    solution = bfs("Boston", lambda city: city == "Miami", city_graph.successors)
+    if solution is None:
+        print("No solution found using breadth-first search!")
+    else:
+        print(node_to_path(solution))
@@ -0,0 +1,222 @@
+from typing import List, Optional, Tuple, Sequence, Any, BinaryIO
+from array import array
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+from graphs.graph import Graph, array_typecode
+from timeit import default_timer as timer
+
+# Loading big edge lists into a Graph without one Python object per edge
+#
+# text edge lists have one "u v" or "u v w" line per edge (lines starting with # or % are comments)
+# and are parsed a chunk of lines at a time straight into arrays
+# binary edge lists are bare little-endian records of int32 u, int32 v and optionally float32 w;
+# they are memory-mapped and read in place
+# either way Graph.from_edges then lays the edges out with its counting sort passes
+#
+# a built graph can be saved as a snapshot of its CSR arrays; loading a snapshot maps the
+# file and uses the arrays where they are, so it costs next to nothing whatever the graph size
+# (unless it was written on a machine of the other byte order, when the arrays are copied and swapped)
+# vertices other than 0..n - 1 follow the arrays as JSON, so they must be strings or numbers
+CHUNK_SIZE: int = 1 << 22
+
+# magic, flags, typecodes of offsets, neighbours and weights, number of vertices, number of edges
+_SNAPSHOT_HEADER: struct.Struct = struct.Struct('<4sBcccqq')
+_SNAPSHOT_MAGIC: bytes = b'CSR2'
+_DIRECTED: int = 1
+_WEIGHTED: int = 2
+_RANGE_VERTICES: int = 4
+_BIG_ENDIAN: int = 8
+
+Edges = Tuple[Sequence[int], Sequence[int], Optional[Sequence[float]]]
+
+
+# arrays are written little-endian, whatever the byte order of the machine writing or reading them
+def write_array(f: BinaryIO, data: array) -> None:
+    if sys.byteorder == 'big':
+        data = array(data.typecode, data)
+        data.byteswap()
+    data.tofile(f)
+
+
+def read_array(f: BinaryIO, typecode: str, count: int) -> array:
+    data: array = array(typecode)
+    data.fromfile(f, count)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+
+def _strip_comments(data: bytes) -> bytes:
+    return b'\n'.join(line for line in data.split(b'\n') if not line.lstrip().startswith((b'#', b'%')))
+
+
+# parse a text edge list into source, target and (if weighted) weight arrays
+def read_text_edges(path: str, weighted: bool = False, chunk_size: int = CHUNK_SIZE) -> Edges:
+    sources: array = array('q')
+    targets: array = array('q')
+    weights: Optional[array] = array('d') if weighted else None
+    fields: int = 3 if weighted else 2
+    with open(path, 'rb') as f:
+        rest: bytes = b''
+        while True:
+            data: bytes = f.read(chunk_size)
+            if not data:
+                data, rest = rest, b''
+            else:
+                # only whole lines are parsed; the unfinished last line waits for the next chunk
+                data = rest + data
+                end: int = data.rfind(b'\n') + 1
+                data, rest = data[:end], data[end:]
+                if not data:
+                    continue
+            if not data:
+                break
+            if b'#' in data or b'%' in data:
+                data = _strip_comments(data)
+            tokens: List[bytes] = data.split()
+            if len(tokens) % fields:
+                raise ValueError(f"{path}: every line must hold {fields} fields")
+            sources.extend(map(int, tokens[0::fields]))
+            targets.extend(map(int, tokens[1::fields]))
+            if weights is not None:
+                weights.extend(map(float, tokens[2::fields]))
+    return sources, targets, weights
+
+
+# map a binary edge list; the returned sequences are views of the file, not copies
+# (except on big-endian machines, where the records are copied and swapped)
+def read_binary_edges(path: str, weighted: bool = False) -> Edges:
+    fields: int = 3 if weighted else 2
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return array('i'), array('i'), array('f') if weighted else None
+        mapped: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) % (4 * fields):
+        raise ValueError(f"{path} is not a whole number of {4 * fields} byte edge records")
+    view: memoryview = memoryview(mapped)
+    if sys.byteorder == 'big':
+        # every field is four bytes wide, so one swap of the whole file as int32 covers the weights too
+        swapped: array = array('i')
+        swapped.frombytes(view)
+        swapped.byteswap()
+        view = memoryview(swapped).cast('B')
+    ints: memoryview = view.cast('i')
+    weights: Optional[memoryview] = view.cast('f')[2::3] if weighted else None
+    return ints[0::fields], ints[1::fields], weights
+
+
+def write_binary_edges(path: str, sources: Sequence[int], targets: Sequence[int], weights: Optional[Sequence[float]] = None) -> None:
+    fields: int = 3 if weights is not None else 2
+    with open(path, 'wb') as f:
+        for start in range(0, len(sources), CHUNK_SIZE):
+            end: int = min(start + CHUNK_SIZE, len(sources))
+            # the fields are interleaved into records through strided views of one buffer
+            records: bytearray = bytearray(4 * fields * (end - start))
+            ints: memoryview = memoryview(records).cast('i')
+            ints[0::fields] = array('i', sources[start:end])
+            ints[1::fields] = array('i', targets[start:end])
+            if weights is not None:
+                memoryview(records).cast('f')[2::3] = array('f', weights[start:end])
+            if sys.byteorder == 'big':
+                chunk: array = array('i')
+                chunk.frombytes(records)
+                write_array(f, chunk)
+            else:
+                f.write(records)
+
+
+def save_snapshot(graph: Graph, path: str) -> None:
+    flags: int = (_DIRECTED if graph.directed else 0) | (_WEIGHTED if graph.weights is not None else 0)
+    if sys.byteorder == 'big':
+        flags |= _BIG_ENDIAN
+    vertices: Optional[bytes] = None
+    if isinstance(graph._vertices, range) and graph._vertices.start == 0 and graph._vertices.step == 1:
+        flags |= _RANGE_VERTICES
+    else:
+        vertex_list: List[Any] = list(graph._vertices)
+        vertices = json.dumps(vertex_list).encode()
+        if json.loads(vertices) != vertex_list:
+            raise ValueError("snapshot vertices must be 0..n - 1, strings or numbers")
+    weights_code: str = array_typecode(graph.weights) if graph.weights is not None else 'd'
+    with open(path, 'wb') as f:
+        f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, flags, array_typecode(graph.offsets).encode(), array_typecode(graph.neighbours).encode(),
+                                      weights_code.encode(), len(graph._vertices), len(graph.neighbours)))
+        for block in (graph.offsets, graph.neighbours, graph.weights):
+            if block is None:
+                continue
+            data: bytes = block.tobytes()
+            # keep every block 8 byte aligned so it can be cast in place when loaded
+            f.write(data + b'\0' * (-len(data) % 8))
+        if vertices is not None:
+            f.write(vertices)
+
+
+def load_snapshot(path: str) -> Graph:
+    with open(path, 'rb') as f:
+        mapped: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, flags, offsets_code, neighbours_code, weights_code, n, m = _SNAPSHOT_HEADER.unpack(mapped[:_SNAPSHOT_HEADER.size])
+    if magic != _SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a graph snapshot")
+    swapped: bool = bool(flags & _BIG_ENDIAN) != (sys.byteorder == 'big')
+    view: memoryview = memoryview(mapped)
+    position: int = _SNAPSHOT_HEADER.size
+    blocks: List[Any] = []
+    for code, length in ((offsets_code.decode(), n + 1), (neighbours_code.decode(), m), (weights_code.decode(), m if flags & _WEIGHTED else 0)):
+        size: int = array(code).itemsize * length
+        block: Any = view[position:position + size].cast(code)
+        if swapped:
+            block = array(code, block)
+            block.byteswap()
+        blocks.append(block)
+        position += size + (-size % 8)
+    vertices: Sequence[Any] = range(n) if flags & _RANGE_VERTICES else json.loads(mapped[position:])
+    return Graph(vertices, blocks[0], blocks[1], blocks[2] if flags & _WEIGHTED else None, bool(flags & _DIRECTED))
+
+
+# Load an edge list file (text, or binary when binary is True) into a Graph with vertices 0..n - 1
+# where n is one more than the largest endpoint (or vertex_count, if given)
+# with cache set, the built graph is saved next to the file as <path>.csr and reused
+# by later loads for as long as it is newer than the edge list
+def load_edge_list(path: str, weighted: bool = False, directed: bool = False, binary: bool = False, vertex_count: Optional[int] = None, cache: bool = True) -> Graph[int]:
+    snapshot: str = path + '.csr'
+    if cache and os.path.exists(snapshot) and os.path.getmtime(snapshot) >= os.path.getmtime(path):
+        cached: Optional[Graph[int]] = None
+        try:
+            cached = load_snapshot(snapshot)
+        except ValueError:
+            # a snapshot in an older format is rebuilt below
+            pass
+        if cached is not None and cached.directed == directed and (cached.weights is not None) == weighted and (vertex_count is None or vertex_count == cached.vertex_count):
+            return cached
+    sources, targets, weights = read_binary_edges(path, weighted) if binary else read_text_edges(path, weighted)
+    if vertex_count is None:
+        vertex_count = max(max(sources), max(targets)) + 1 if len(sources) else 0
+    graph: Graph[int] = Graph.from_edges(vertex_count, sources, targets, weights, directed)
+    if cache:
+        save_snapshot(graph, snapshot)
+    return graph
+
+
+if __name__ == '__main__':
+    n: int = 100000
+    m: int = 500000
+    sources: array = array('i', (random.randrange(n) for _ in range(m)))
+    targets: array = array('i', (random.randrange(n) for _ in range(m)))
+    with open('edges_example.txt', 'w') as text_file:
+        text_file.write('# random graph\n')
+        text_file.writelines(f'{u} {v}\n' for u, v in zip(sources, targets))
+    write_binary_edges('edges_example.bin', sources, targets)
+
+    for file_name, binary in (('edges_example.txt', False), ('edges_example.bin', True)):
+        for attempt in ('first load', 'cached load'):
+            stime = timer()
+            g: Graph[int] = load_edge_list(file_name, binary=binary, vertex_count=n)
+            etime = timer()
+            print(f'{file_name} {attempt}: {g.vertex_count} vertices, {g.edge_count} edges in: {etime - stime}')
+        del g
+        os.remove(file_name + '.csr')
+        os.remove(file_name)
@@ -0,0 +1,238 @@
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import random
+from generic_search import bfs, index_typecode
+from graphs.graph import Graph, array_typecode
+from timeit import default_timer as timer
+
+# direction optimising switches (Beamer et al.): go bottom-up once the frontier's edges are more than
+# 1 / ALPHA of the edges still unexplored, and back to top-down once the frontier holds fewer than 1 / BETA of the vertices
+ALPHA: int = 14
+BETA: int = 24
+# frontiers smaller than this are never worth sending to a process pool
+PARALLEL_THRESHOLD: int = 50000
+
+
+# Result of a whole-graph breadth-first traversal
+# distances[v] is the number of edges from the nearest source to v (-1 if v cannot be reached)
+# and parents[v] the vertex v was discovered from (-1 for sources and unreached vertices)
+class Traversal(NamedTuple):
+    distances: array
+    parents: array
+    levels: int
+
+    def reachable(self, vertex: int) -> bool:
+        return self.distances[vertex] >= 0
+
+
+# the same edges pointing the other way, which bottom-up steps need on directed graphs
+def _reverse(graph: Graph) -> Graph:
+    if not graph.directed:
+        return graph
+    owners: array = array(array_typecode(graph.neighbours), [0]) * len(graph.neighbours)
+    offsets = graph.offsets
+    for u in range(graph.vertex_count):
+        owners[offsets[u]:offsets[u + 1]] = array(owners.typecode, [u]) * (offsets[u + 1] - offsets[u])
+    return Graph.from_edges(range(graph.vertex_count), graph.neighbours, owners, directed=True)
+
+
+# Level-synchronous breadth-first search over a whole Graph from one or more sources
+# every step expands a complete frontier; while the frontier is small the step works top-down
+# (each frontier vertex scans its neighbours), and when it grows large the step works bottom-up
+# (each unvisited vertex looks for any neighbour in the frontier and stops at the first one),
+# which skips most of the edge checks in the middle levels of low diameter graphs
+def level_bfs(graph: Graph, sources: Sequence[int], direction_optimising: bool = True) -> Traversal:
+    n: int = graph.vertex_count
+    distances: array = array('i', [-1]) * n
+    parents: array = array(index_typecode(n), [-1]) * n
+    offsets = graph.offsets
+    neighbours = graph.neighbours
+    frontier: List[int] = []
+    for source in sources:
+        if distances[source] < 0:
+            distances[source] = 0
+            frontier.append(source)
+    reverse: Optional[Graph] = None
+    unexplored_edges: int = len(neighbours)
+    unvisited: Optional[List[int]] = None
+    bottom_up: bool = False
+    level: int = 0
+    while frontier:
+        level += 1
+        frontier_edges: int = sum(offsets[u + 1] - offsets[u] for u in frontier)
+        unexplored_edges -= frontier_edges
+        if direction_optimising:
+            if not bottom_up and frontier_edges * ALPHA > unexplored_edges:
+                bottom_up = True
+            elif bottom_up and len(frontier) * BETA < n:
+                bottom_up = False
+        next_frontier: List[int] = []
+        if bottom_up:
+            if reverse is None:
+                reverse = _reverse(graph)
+            in_frontier: bytearray = bytearray(n)
+            for u in frontier:
+                in_frontier[u] = 1
+            if unvisited is None:
+                unvisited = [v for v in range(n) if distances[v] < 0]
+            reverse_offsets = reverse.offsets
+            reverse_neighbours = reverse.neighbours
+            still_unvisited: List[int] = []
+            for v in unvisited:
+                if distances[v] >= 0:
+                    continue
+                for u in reverse_neighbours[reverse_offsets[v]:reverse_offsets[v + 1]]:
+                    if in_frontier[u]:
+                        distances[v] = level
+                        parents[v] = u
+                        next_frontier.append(v)
+                        break
+                else:
+                    still_unvisited.append(v)
+            unvisited = still_unvisited
+        else:
+            for u in frontier:
+                for v in neighbours[offsets[u]:offsets[u + 1]]:
+                    if distances[v] < 0:
+                        distances[v] = level
+                        parents[v] = u
+                        next_frontier.append(v)
+        frontier = next_frontier
+    return Traversal(distances, parents, level - 1 if level else 0)
+
+
+# hop distances from a single vertex
+def hop_distances(graph: Graph, source: int) -> array:
+    return level_bfs(graph, [source]).distances
+
+
+# label every vertex with the smallest vertex of its connected component (undirected graphs)
+def component_labels(graph: Graph) -> array:
+    if graph.directed:
+        raise ValueError("components are only defined here for undirected graphs")
+    n: int = graph.vertex_count
+    labels: array = array(index_typecode(n), [-1]) * n
+    offsets = graph.offsets
+    neighbours = graph.neighbours
+    for vertex in range(n):
+        if labels[vertex] >= 0:
+            continue
+        labels[vertex] = vertex
+        frontier: List[int] = [vertex]
+        while frontier:
+            next_frontier: List[int] = []
+            for u in frontier:
+                for v in neighbours[offsets[u]:offsets[u + 1]]:
+                    if labels[v] < 0:
+                        labels[v] = vertex
+                        next_frontier.append(v)
+            frontier = next_frontier
+    return labels
+
+
+# one top-down step over part of a frontier: (vertex, parent) pairs of every unvisited neighbour
+def _expand(frontier: array, offsets: Sequence[int], neighbours: Sequence[int], distances: Sequence[int]) -> array:
+    found: array = array('q')
+    for u in frontier:
+        for v in neighbours[offsets[u]:offsets[u + 1]]:
+            if distances[v] < 0:
+                found.append(v)
+                found.append(u)
+    return found
+
+
+# state of a worker process: views of the graph and the distance array in shared memory
+_shared: List[shared_memory.SharedMemory] = []
+_offsets: Optional[memoryview] = None
+_neighbours: Optional[memoryview] = None
+_distances: Optional[memoryview] = None
+
+
+def _attach(names: Tuple[str, str, str], codes: Tuple[str, str], sizes: Tuple[int, int, int]) -> None:
+    global _shared, _offsets, _neighbours, _distances
+    _shared = [shared_memory.SharedMemory(name=name) for name in names]
+    _offsets = _shared[0].buf[:sizes[0]].cast(codes[0])
+    _neighbours = _shared[1].buf[:sizes[1]].cast(codes[1])
+    _distances = _shared[2].buf[:sizes[2]].cast('i')
+
+
+# expand one part of a top-down frontier in a worker process
+def _expand_part(frontier: array) -> array:
+    return _expand(frontier, _offsets, _neighbours, _distances)
+
+
+def _share(data: array) -> shared_memory.SharedMemory:
+    raw: bytes = data.tobytes()
+    block: shared_memory.SharedMemory = shared_memory.SharedMemory(create=True, size=max(len(raw), 1))
+    block.buf[:len(raw)] = raw
+    return block
+
+
+# level_bfs (top-down only) with large frontiers split across a process pool
+# the graph and the distance array live in shared memory; workers read them and report candidate
+# (vertex, parent) pairs, and this process settles duplicates and writes the new level,
+# so the distance array only ever has one writer
+def parallel_bfs(graph: Graph, sources: Sequence[int], workers: Optional[int] = None, parts: int = 8) -> Traversal:
+    n: int = graph.vertex_count
+    offsets: array = array(array_typecode(graph.offsets), graph.offsets)
+    neighbours: array = array(array_typecode(graph.neighbours), graph.neighbours)
+    blocks: List[shared_memory.SharedMemory] = [_share(offsets), _share(neighbours), _share(array('i', [-1]) * n)]
+    distances: memoryview = blocks[2].buf[:4 * n].cast('i')
+    try:
+        parents: array = array(index_typecode(n), [-1]) * n
+        frontier: array = array('q')
+        for source in sources:
+            if distances[source] < 0:
+                distances[source] = 0
+                frontier.append(source)
+        sizes: Tuple[int, int, int] = (len(offsets) * offsets.itemsize, len(neighbours) * neighbours.itemsize, 4 * n)
+        level: int = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(tuple(block.name for block in blocks), (offsets.typecode, neighbours.typecode), sizes)) as pool:
+            while frontier:
+                level += 1
+                if len(frontier) < PARALLEL_THRESHOLD:
+                    found_parts: List[array] = [_expand(frontier, offsets, neighbours, distances)]
+                else:
+                    step: int = -(-len(frontier) // parts)
+                    found_parts = list(pool.map(_expand_part, [frontier[i:i + step] for i in range(0, len(frontier), step)]))
+                next_frontier: array = array('q')
+                for found in found_parts:
+                    for i in range(0, len(found), 2):
+                        v: int = found[i]
+                        if distances[v] < 0:
+                            distances[v] = level
+                            parents[v] = found[i + 1]
+                            next_frontier.append(v)
+                frontier = next_frontier
+        return Traversal(array('i', distances), parents, level - 1 if level else 0)
+    finally:
+        # the view has to go before its block can close, whether or not the traversal finished
+        distances.release()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+if __name__ == '__main__':
+    n: int = 200000
+    m: int = 1000000
+    g: Graph[int] = Graph.from_edges(n, [random.randrange(n) for _ in range(m)], [random.randrange(n) for _ in range(m)])
+
+    stime1 = timer()
+    top_down: Traversal = level_bfs(g, [0], direction_optimising=False)
+    etime1 = timer()
+    print(f'top-down level bfs: {top_down.levels} levels in: {etime1 - stime1}')
+    stime2 = timer()
+    optimised: Traversal = level_bfs(g, [0])
+    etime2 = timer()
+    print(f'direction optimising level bfs: {optimised.levels} levels in: {etime2 - stime2}, same distances: {top_down.distances == optimised.distances}')
+    stime3 = timer()
+    parallel: Traversal = parallel_bfs(g, [0])
+    etime3 = timer()
+    print(f'parallel level bfs: {parallel.levels} levels in: {etime3 - stime3}, same distances: {top_down.distances == parallel.distances}')
+    stime4 = timer()
+    bfs(0, lambda v: False, g.successors)
+    etime4 = timer()
+    print(f'generic bfs over the whole graph: {etime4 - stime4}')
@@ -0,0 +1,278 @@
+from typing import List, Dict, Optional, Sequence, Set, Tuple, Any
+from statistics import mean
+import random
+from generic_search import weighted_astar, astar, node_to_path
+from graphs.maze import Maze, MazeLocation, Cell, BLOCKED, manhattan_distance
+from timeit import default_timer as timer
+
+# borders with an opening at least this wide get a transition at each end instead of one in the middle
+MAX_ENTRANCE_WIDTH: int = 6
+
+
+# Hierarchical path finding (HPA*) on top of a Maze
+# the grid is cut into square clusters of cluster_size cells; wherever two neighbouring clusters
+# are connected, a pair of cells across their border becomes a transition (one per opening, or two for
+# wide openings), and the cells of those pairs are the nodes of a much smaller abstract graph
+# nodes of the same cluster are joined by edges weighing their distance inside that cluster,
+# and the two cells of a transition by an edge of cost 1
+#
+# a query links start and goal to the nodes of their own clusters, searches the abstract graph,
+# and then refines every abstract edge into cells with a search confined to a single cluster
+# paths are not always the shortest possible (they have to pass through transitions),
+# see compare_with_astar for how much is lost on a given map
+#
+# changing cells through update_cells only rebuilds the clusters that contain them,
+# plus any neighbour whose shared border gained or lost transitions
+class HierarchicalMaze:
+    def __init__(self, maze: Maze, cluster_size: int = 16) -> None:
+        self._maze: Maze = maze
+        self._size: int = cluster_size
+        self._rows: int = maze._rows
+        self._columns: int = maze._columns
+        self._cluster_rows: int = -(-self._rows // cluster_size)
+        self._cluster_columns: int = -(-self._columns // cluster_size)
+        # transitions of every border, keyed by the two clusters (lower id first), as (cell in first, cell in second)
+        self._borders: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # node -> nodes across a border (cost 1)
+        self._inter: Dict[int, List[int]] = {}
+        # cluster -> node -> (node of the same cluster, distance) pairs
+        self._intra: Dict[int, Dict[int, List[Tuple[int, int]]]] = {}
+        num_clusters: int = self._cluster_rows * self._cluster_columns
+        for cluster in range(num_clusters):
+            for other in self._adjacent_clusters(cluster):
+                if cluster < other:
+                    self._build_border(cluster, other)
+        for cluster in range(num_clusters):
+            self._build_cluster(cluster)
+
+    @property
+    def num_nodes(self) -> int:
+        return sum(len(edges) for edges in self._intra.values())
+
+    def _cluster_of(self, index: int) -> int:
+        row, column = divmod(index, self._columns)
+        return (row // self._size) * self._cluster_columns + column // self._size
+
+    # first row, first column, and one past the last row and column of a cluster
+    def _bounds(self, cluster: int) -> Tuple[int, int, int, int]:
+        cluster_row, cluster_column = divmod(cluster, self._cluster_columns)
+        row: int = cluster_row * self._size
+        column: int = cluster_column * self._size
+        return row, column, min(row + self._size, self._rows), min(column + self._size, self._columns)
+
+    def _adjacent_clusters(self, cluster: int) -> List[int]:
+        cluster_row, cluster_column = divmod(cluster, self._cluster_columns)
+        clusters: List[int] = []
+        if cluster_row + 1 < self._cluster_rows:
+            clusters.append(cluster + self._cluster_columns)
+        if cluster_row > 0:
+            clusters.append(cluster - self._cluster_columns)
+        if cluster_column + 1 < self._cluster_columns:
+            clusters.append(cluster + 1)
+        if cluster_column > 0:
+            clusters.append(cluster - 1)
+        return clusters
+
+    # find the openings along the border between cluster and the cluster right of or below it
+    # returns whether the transitions changed
+    def _build_border(self, cluster: int, other: int) -> bool:
+        grid = self._maze._grid
+        columns: int = self._columns
+        row, column, end_row, end_column = self._bounds(cluster)
+        # with a single column of clusters the cluster below is also cluster + 1, so compare cluster rows instead
+        if other // self._cluster_columns == cluster // self._cluster_columns:
+            # vertical border: cell (r, end_column - 1) faces cell (r, end_column)
+            pairs: List[Tuple[int, int]] = [(r * columns + end_column - 1, r * columns + end_column) for r in range(row, end_row)]
+        else:
+            # horizontal border: cell (end_row - 1, c) faces cell (end_row, c)
+            pairs = [((end_row - 1) * columns + c, end_row * columns + c) for c in range(column, end_column)]
+        transitions: List[Tuple[int, int]] = []
+        run: List[Tuple[int, int]] = []
+        for pair in pairs + [(-1, -1)]:
+            if pair[0] >= 0 and grid[pair[0]] != BLOCKED and grid[pair[1]] != BLOCKED:
+                run.append(pair)
+                continue
+            if len(run) >= MAX_ENTRANCE_WIDTH:
+                transitions.extend((run[0], run[-1]))
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        key: Tuple[int, int] = (cluster, other)
+        old: Optional[List[Tuple[int, int]]] = self._borders.get(key)
+        if old == transitions:
+            return False
+        old = old or []
+        for a, b in old:
+            self._inter[a].remove(b)
+            self._inter[b].remove(a)
+        for a, b in transitions:
+            self._inter.setdefault(a, []).append(b)
+            self._inter.setdefault(b, []).append(a)
+        self._borders[key] = transitions
+        return True
+
+    def _nodes(self, cluster: int) -> Set[int]:
+        nodes: Set[int] = set()
+        for other in self._adjacent_clusters(cluster):
+            if cluster < other:
+                nodes.update(a for a, _ in self._borders[(cluster, other)])
+            else:
+                nodes.update(b for _, b in self._borders[(other, cluster)])
+        return nodes
+
+    # breadth-first search from source that never leaves its cluster
+    # returns the distance and parent of every cell reached, stopping early once target is reached
+    def _local_search(self, source: int, target: Optional[int] = None) -> Tuple[Dict[int, int], Dict[int, int]]:
+        grid = self._maze._grid
+        columns: int = self._columns
+        row, column, end_row, end_column = self._bounds(self._cluster_of(source))
+        distances: Dict[int, int] = {source: 0}
+        parents: Dict[int, int] = {}
+        frontier: List[int] = [source]
+        level: int = 0
+        while frontier and target not in distances:
+            level += 1
+            next_frontier: List[int] = []
+            for p in frontier:
+                r, c = divmod(p, columns)
+                for q, inside in ((p + columns, r + 1 < end_row), (p - columns, r > row), (p + 1, c + 1 < end_column), (p - 1, c > column)):
+                    if inside and q not in distances and grid[q] != BLOCKED:
+                        distances[q] = level
+                        parents[q] = p
+                        next_frontier.append(q)
+            frontier = next_frontier
+        return distances, parents
+
+    def _build_cluster(self, cluster: int) -> None:
+        nodes: Set[int] = self._nodes(cluster)
+        edges: Dict[int, List[Tuple[int, int]]] = {}
+        for node in nodes:
+            distances, _ = self._local_search(node)
+            edges[node] = [(other, distances[other]) for other in nodes if other != node and other in distances]
+        self._intra[cluster] = edges
+
+    # change cells of the maze and bring the abstract graph up to date
+    def update_cells(self, changes: Sequence[Tuple[MazeLocation, Cell]]) -> None:
+        maze: Maze = self._maze
+        dirty: Set[int] = set()
+        for location, cell in changes:
+            index: int = maze.encode(location)
+            if (maze._grid[index] == BLOCKED) != (cell == Cell.BLOCKED):
+                dirty.add(self._cluster_of(index))
+            maze.set_cell(location, cell)
+        rebuild: Set[int] = set(dirty)
+        for cluster in dirty:
+            for other in self._adjacent_clusters(cluster):
+                if self._build_border(min(cluster, other), max(cluster, other)):
+                    rebuild.add(other)
+        for cluster in rebuild:
+            self._build_cluster(cluster)
+
+    # cells of the shortest path from a to b inside their (shared) cluster, without a itself
+    def _refine(self, a: int, b: int) -> List[int]:
+        _, parents = self._local_search(a, b)
+        cells: List[int] = []
+        while b != a:
+            cells.append(b)
+            b = parents[b]
+        cells.reverse()
+        return cells
+
+    def find_path(self, start: MazeLocation, goal: MazeLocation) -> Optional[List[MazeLocation]]:
+        maze: Maze = self._maze
+        s: int = maze.encode(start)
+        g: int = maze.encode(goal)
+        if maze._grid[s] == BLOCKED or maze._grid[g] == BLOCKED:
+            return None
+        # link start and goal into the abstract graph
+        start_distances, _ = self._local_search(s)
+        start_edges: List[Tuple[int, int]] = [(node, start_distances[node]) for node in self._nodes(self._cluster_of(s)) if node in start_distances]
+        if g in start_distances:
+            start_edges.append((g, start_distances[g]))
+        goal_distances, _ = self._local_search(g)
+        goal_edges: Dict[int, int] = {node: goal_distances[node] for node in self._nodes(self._cluster_of(g)) if node in goal_distances}
+
+        def successors(node: int) -> List[Tuple[int, float]]:
+            edges: List[Tuple[int, float]] = [(other, 1) for other in self._inter.get(node, ())]
+            edges.extend(self._intra[self._cluster_of(node)].get(node, ()))
+            if node == s:
+                edges.extend(start_edges)
+            if node in goal_edges:
+                edges.append((g, goal_edges[node]))
+            return edges
+
+        goal_row, goal_column = divmod(g, self._columns)
+
+        def heuristic(node: int) -> float:
+            row, column = divmod(node, self._columns)
+            return abs(row - goal_row) + abs(column - goal_column)
+
+        solution = weighted_astar(s, lambda node: node == g, successors, heuristic)
+        if solution is None:
+            return None
+        abstract: List[int] = node_to_path(solution)
+        cells: List[int] = [s]
+        for a, b in zip(abstract, abstract[1:]):
+            if self._cluster_of(a) != self._cluster_of(b):
+                cells.append(b)
+            else:
+                cells.extend(self._refine(a, b))
+        return [maze.decode(index) for index in cells]
+
+
+# time the same queries with the hierarchy and with plain astar (manhattan distance)
+# speedup is the ratio of the total query times, and path_quality_loss the mean fraction
+# by which hierarchical paths are longer than the shortest ones
+def compare_with_astar(hierarchy: HierarchicalMaze, queries: Sequence[Tuple[MazeLocation, MazeLocation]]) -> Dict[str, Any]:
+    maze: Maze = hierarchy._maze
+    hierarchical_time: float = 0.0
+    astar_time: float = 0.0
+    losses: List[float] = []
+    mismatches: int = 0
+    for start, goal in queries:
+        stime: float = timer()
+        path: Optional[List[MazeLocation]] = hierarchy.find_path(start, goal)
+        hierarchical_time += timer() - stime
+        stime = timer()
+        solution = astar(start, lambda ml: ml == goal, maze.successors, manhattan_distance(goal))
+        astar_time += timer() - stime
+        if (path is None) != (solution is None):
+            mismatches += 1
+        elif path is not None:
+            shortest: int = len(node_to_path(solution)) - 1
+            losses.append((len(path) - 1) / shortest - 1 if shortest else 0.0)
+    return {
+        'queries': len(queries),
+        'hierarchical_time': hierarchical_time,
+        'astar_time': astar_time,
+        'speedup': astar_time / hierarchical_time if hierarchical_time > 0 else None,
+        'path_quality_loss': mean(losses) if losses else 0.0,
+        'mismatches': mismatches,
+    }
+
+
+if __name__ == '__main__':
+    size: int = 400
+    m = Maze(size, size, 0.2, MazeLocation(0, 0), MazeLocation(size - 1, size - 1))
+    m.precompute_neighbours()
+
+    stime1 = timer()
+    hierarchy: HierarchicalMaze = HierarchicalMaze(m, 16)
+    etime1 = timer()
+    print(f'abstraction with {hierarchy.num_nodes} nodes built in: {etime1 - stime1}')
+
+    def random_open() -> MazeLocation:
+        while True:
+            ml = MazeLocation(random.randrange(size), random.randrange(size))
+            if m.cell(ml) != Cell.BLOCKED:
+                return ml
+
+    queries: List[Tuple[MazeLocation, MazeLocation]] = [(random_open(), random_open()) for _ in range(20)]
+    report: Dict[str, Any] = compare_with_astar(hierarchy, queries)
+    print(f'speedup over astar: x{report["speedup"]:.1f}, paths {report["path_quality_loss"]:.1%} longer on average, {report["mismatches"]} mismatches')
+
+    changes = [(random_open(), Cell.BLOCKED) for _ in range(10)]
+    stime2 = timer()
+    hierarchy.update_cells(changes)
+    etime2 = timer()
+    print(f'{len(changes)} cells changed, abstraction updated in: {etime2 - stime2}')
@@ -0,0 +1,328 @@
+from typing import List, Dict, Optional, Tuple
+from math import sqrt
+from generic_search import IndexedPriorityQueue
+from graphs.maze import Maze, MazeLocation
+from timeit import default_timer as timer
+
+SQRT2: float = sqrt(2)
+
+_TO_DIGITS: bytes = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS: bytes = bytes.maketrans(b"01", b"\x00\x01")
+
+
+# The stop rules below are evaluated for the whole grid at once on big integers used as bitsets
+# bit p stands for cell p, and _look(x, k) moves the bit of cell p + k onto bit p
+def _to_bits(mask: bytearray) -> int:
+    return int(mask.translate(_TO_DIGITS)[::-1], 2)
+
+
+def _from_bits(bits: int, size: int) -> bytearray:
+    return bytearray(format(bits, 'b').zfill(size)[::-1].encode().translate(_FROM_DIGITS))
+
+
+def _look(bits: int, k: int) -> int:
+    return bits >> k if k > 0 else bits << -k
+
+
+# Every cell where a straight jump moving by d has to stop: a wall, or a cell with a forced neighbour
+# a forced neighbour is an open cell beside us whose counterpart beside the previous cell is blocked,
+# i.e. a cell that is reached optimally only by turning here
+def _stop_mask(blocked: bytearray, side: int, d: int) -> bytearray:
+    size: int = len(blocked)
+    walls: int = _to_bits(blocked)
+    free: int = ~walls & ((1 << size) - 1)
+    forced: int = (_look(free, -side) & _look(walls, -d - side)) | (_look(free, side) & _look(walls, side - d))
+    return _from_bits(walls | (forced & free), size)
+
+
+# Every cell from which a horizontal jump ends on a forced neighbour rather than a wall
+# stops are visited one by one, and each run of cells in front of a stop is filled with one slice assignment
+def _turn_mask(stops: bytearray, blocked: bytearray, d: int) -> bytearray:
+    turns: bytearray = bytearray(len(stops))
+    previous: int = 0
+    stop: int = stops.find(1)
+    while stop != -1:
+        if d == 1 and not blocked[stop]:
+            # cells previous..stop - 1 all see this stop first when looking right
+            turns[previous:stop] = b"\x01" * (stop - previous)
+        elif d == -1 and not blocked[previous]:
+            # cells previous + 1..stop all see the previous stop first when looking left
+            turns[previous + 1:stop + 1] = b"\x01" * (stop - previous)
+        previous = stop
+        stop = stops.find(1, stop + 1)
+    return turns
+
+
+# Jump point search (Harabor & Grastien) for uniform-cost Maze grids
+# on open floor plain a star pushes every one of the many equally short paths onto the frontier
+# jump point search instead slides along straight (and diagonal) lines
+# and only stops at cells where an optimal path might have to turn,
+# so the a star underneath only ever sees a handful of 'jump points'
+#
+# the grid is copied into a flat mask with a one-cell blocked border around it
+# so walking off the edge looks exactly like walking into a wall and needs no bounds checks
+# every straight jump is then a single find() over a precomputed stop mask;
+# vertical jumps use transposed (column-major) masks so that columns are contiguous too
+# in the 8-connected variant a diagonal step is only allowed when both cells it passes are open
+class JumpPointSearch:
+    def __init__(self, maze: Maze, diagonal: bool = False) -> None:
+        self._rows: int = maze._rows
+        self._columns: int = maze._columns
+        self._width: int = self._columns + 2
+        self._height: int = self._rows + 2
+        self.diagonal: bool = diagonal
+        width: int = self._width
+        mask: bytearray = maze.blocked_mask()
+        padded: bytearray = bytearray(b"\x01") * (width * self._height)
+        for r in range(self._rows):
+            start: int = (r + 1) * width + 1
+            padded[start:start + self._columns] = mask[r * self._columns:(r + 1) * self._columns]
+        self._blocked: bytearray = padded
+        self._goal: int = -1
+        self._stop_right: bytearray = _stop_mask(padded, width, 1)
+        self._stop_left: bytearray = _stop_mask(padded, width, -1)
+        stop_down: bytearray = _stop_mask(padded, 1, width)
+        stop_up: bytearray = _stop_mask(padded, 1, -width)
+        if not diagonal:
+            # a 4-connected vertical jump also has to stop wherever a sideways jump would find something,
+            # since that is the only place the path can turn towards it
+            turns: int = _to_bits(_turn_mask(self._stop_right, padded, 1)) | _to_bits(_turn_mask(self._stop_left, padded, -1))
+            stop_down = _from_bits(_to_bits(stop_down) | turns, len(padded))
+            stop_up = _from_bits(_to_bits(stop_up) | turns, len(padded))
+        self._stop_down: bytearray = self._transpose(stop_down)
+        self._stop_up: bytearray = self._transpose(stop_up)
+
+    # column-major copy of a padded mask: cell (r, c) moves to c * height + r
+    def _transpose(self, mask: bytearray) -> bytearray:
+        height: int = self._height
+        width: int = self._width
+        transposed: bytearray = bytearray(len(mask))
+        for c in range(width):
+            transposed[c * height:(c + 1) * height] = mask[c::width]
+        return transposed
+
+    def _index(self, ml: MazeLocation) -> int:
+        return (ml.row + 1) * self._width + ml.column + 1
+
+    def _location(self, index: int) -> MazeLocation:
+        row, column = divmod(index, self._width)
+        return MazeLocation(row - 1, column - 1)
+
+    # slide sideways from p until hitting a wall (-1), the goal, or a forced neighbour
+    # the blocked border guarantees there is always a stop before the row runs out
+    def _jump_horizontal(self, p: int, d: int) -> int:
+        goal: int = self._goal
+        if d == 1:
+            stop: int = self._stop_right.find(1, p + 1)
+            if p < goal <= stop:
+                return goal
+        else:
+            stop = self._stop_left.rfind(1, 0, p)
+            if stop <= goal < p:
+                return goal
+        return -1 if self._blocked[stop] else stop
+
+    # slide up or down from p, d being -1 or 1 rows
+    def _jump_vertical(self, p: int, d: int) -> int:
+        width: int = self._width
+        height: int = self._height
+        goal: int = self._goal
+        row, column = divmod(p, width)
+        if d == 1:
+            stop_row: int = self._stop_down.find(1, column * height + row + 1) - column * height
+        else:
+            stop_row = self._stop_up.rfind(1, column * height, column * height + row) - column * height
+        goal_row, goal_column = divmod(goal, width)
+        low, high = (row, stop_row) if d == 1 else (stop_row, row)
+        if goal_column == column and low <= goal_row <= high and goal_row != row:
+            return goal
+        # in a 4-connected grid we also stop on the goal's row if a sideways jump from there reaches it
+        if not self.diagonal and low < goal_row < high:
+            turn: int = goal_row * width + column
+            if self._jump_horizontal(turn, 1 if goal_column > column else -1) == goal:
+                return turn
+        stop: int = stop_row * width + column
+        return -1 if self._blocked[stop] else stop
+
+    # a diagonal jump stops wherever one of its two straight components finds a jump point
+    def _jump_diagonal(self, p: int, dr: int, dc: int) -> int:
+        blocked: bytearray = self._blocked
+        goal: int = self._goal
+        dv: int = dr * self._width
+        while True:
+            p += dv + dc
+            if blocked[p]:
+                return -1
+            if p == goal:
+                return p
+            if self._jump_horizontal(p, dc) >= 0 or self._jump_vertical(p, dr) >= 0:
+                return p
+            # no corner cutting: we may only keep going if both cells we pass are open
+            if blocked[p + dc] or blocked[p + dv]:
+                return -1
+
+    def _jump(self, p: int, dr: int, dc: int) -> int:
+        if dr and dc:
+            return self._jump_diagonal(p, dr, dc)
+        if dc:
+            return self._jump_horizontal(p, dc)
+        return self._jump_vertical(p, dr)
+
+    # the directions worth exploring from p, given the direction (dr, dc) we arrived in
+    # (0, 0) means p is the start and every open direction has to be tried
+    def _directions(self, p: int, dr: int, dc: int) -> List[Tuple[int, int]]:
+        blocked: bytearray = self._blocked
+        width: int = self._width
+        open_up: bool = not blocked[p - width]
+        open_down: bool = not blocked[p + width]
+        open_left: bool = not blocked[p - 1]
+        open_right: bool = not blocked[p + 1]
+        directions: List[Tuple[int, int]] = []
+        if dr == 0 and dc == 0:
+            for (r, c), is_open in (((-1, 0), open_up), ((1, 0), open_down), ((0, -1), open_left), ((0, 1), open_right)):
+                if is_open:
+                    directions.append((r, c))
+            if self.diagonal:
+                for r, c in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+                    if not blocked[p + r * width] and not blocked[p + c]:
+                        directions.append((r, c))
+            return directions
+        if not self.diagonal:
+            if dc:
+                if open_up:
+                    directions.append((-1, 0))
+                if open_down:
+                    directions.append((1, 0))
+                if not blocked[p + dc]:
+                    directions.append((0, dc))
+            else:
+                if open_left:
+                    directions.append((0, -1))
+                if open_right:
+                    directions.append((0, 1))
+                if not blocked[p + dr * width]:
+                    directions.append((dr, 0))
+            return directions
+        if dr and dc:
+            vertical_open: bool = not blocked[p + dr * width]
+            horizontal_open: bool = not blocked[p + dc]
+            if vertical_open:
+                directions.append((dr, 0))
+            if horizontal_open:
+                directions.append((0, dc))
+            if vertical_open and horizontal_open:
+                directions.append((dr, dc))
+        elif dc:
+            if not blocked[p + dc]:
+                directions.append((0, dc))
+                if open_up:
+                    directions.append((-1, dc))
+                if open_down:
+                    directions.append((1, dc))
+            if open_up:
+                directions.append((-1, 0))
+            if open_down:
+                directions.append((1, 0))
+        else:
+            if not blocked[p + dr * width]:
+                directions.append((dr, 0))
+                if open_left:
+                    directions.append((dr, -1))
+                if open_right:
+                    directions.append((dr, 1))
+            if open_left:
+                directions.append((0, -1))
+            if open_right:
+                directions.append((0, 1))
+        return directions
+
+    # exact cost between two cells on a common straight or diagonal line
+    # and an admissible estimate for any other pair
+    def _distance(self, a: int, b: int) -> float:
+        ar, ac = divmod(a, self._width)
+        br, bc = divmod(b, self._width)
+        dr: int = abs(ar - br)
+        dc: int = abs(ac - bc)
+        if self.diagonal:
+            return (dr + dc) + (SQRT2 - 2) * min(dr, dc)
+        return float(dr + dc)
+
+    def search(self, start: MazeLocation, goal: MazeLocation) -> Optional[List[MazeLocation]]:
+        source: int = self._index(start)
+        target: int = self._index(goal)
+        if self._blocked[source] or self._blocked[target]:
+            return None
+        self._goal = target
+        width: int = self._width
+        costs: Dict[int, float] = {source: 0.0}
+        parents: Dict[int, int] = {source: -1}
+        closed: set = set()
+        frontier: IndexedPriorityQueue[int] = IndexedPriorityQueue()
+        # ties on f are broken towards the goal (smaller h), which matters a lot on open floor
+        # where huge numbers of jump points share the same f
+        frontier.push(source, (self._distance(source, target), self._distance(source, target)))
+
+        while not frontier.is_empty:
+            current: int = frontier.pop()
+            if current == target:
+                return self._expand_path(current, parents)
+            closed.add(current)
+            # the direction we arrived in, as the sign of the row and column change
+            dr: int = 0
+            dc: int = 0
+            parent: int = parents[current]
+            if parent >= 0:
+                pr, pc = divmod(parent, width)
+                cr, cc = divmod(current, width)
+                dr = (cr > pr) - (cr < pr)
+                dc = (cc > pc) - (cc < pc)
+            for r, c in self._directions(current, dr, dc):
+                jump_point: int = self._jump(current, r, c)
+                if jump_point < 0 or jump_point in closed:
+                    continue
+                new_cost: float = costs[current] + self._distance(current, jump_point)
+                if jump_point not in costs or new_cost < costs[jump_point]:
+                    costs[jump_point] = new_cost
+                    parents[jump_point] = current
+                    estimate: float = self._distance(jump_point, target)
+                    frontier.push(jump_point, (new_cost + estimate, estimate))
+        return None
+
+    # fill in every cell between consecutive jump points so the path can be passed to Maze.mark
+    def _expand_path(self, end: int, parents: Dict[int, int]) -> List[MazeLocation]:
+        width: int = self._width
+        jump_points: List[int] = [end]
+        while parents[jump_points[-1]] >= 0:
+            jump_points.append(parents[jump_points[-1]])
+        jump_points.reverse()
+        cells: List[int] = [jump_points[0]]
+        for a, b in zip(jump_points, jump_points[1:]):
+            ar, ac = divmod(a, width)
+            br, bc = divmod(b, width)
+            step: int = ((br > ar) - (br < ar)) * width + ((bc > ac) - (bc < ac))
+            p: int = a
+            while p != b:
+                p += step
+                cells.append(p)
+        return [self._location(p) for p in cells]
+
+
+# convenience wrapper that solves the maze from its own start to its own goal
+def jps(maze: Maze, diagonal: bool = False) -> Optional[List[MazeLocation]]:
+    return JumpPointSearch(maze, diagonal).search(maze._start, maze._goal)
+
+
+if __name__ == '__main__':
+    m = Maze(40, 40, 0.1, MazeLocation(0, 0), MazeLocation(39, 39))
+
+    for diagonal in (False, True):
+        stime = timer()
+        path: Optional[List[MazeLocation]] = jps(m, diagonal)
+        etime = timer()
+        if path is None:
+            print("No solution found using jump point search!")
+        else:
+            m.mark(path)
+            print(m)
+            m.clear(path)
+        print(f'diagonal: {diagonal}, time taken: {etime - stime}')
@@ -0,0 +1,195 @@
+from __future__ import annotations
+from typing import Generic, TypeVar, List, Callable, Optional
+from array import array
+import struct
+from graphs.maze import Maze, MazeLocation, manhattan_distance
+from graphs.distance_field import DistanceField
+from graphs.graph import Graph
+from graphs.graph_io import write_array, read_array
+from graphs.graph_traversal import level_bfs
+from generic_search import astar, node_to_path, SearchStats
+from timeit import default_timer as timer
+
+T = TypeVar('T')
+
+# header of a saved landmark file: magic, number of states, number of landmarks, whether there are reverse tables
+_HEADER: struct.Struct = struct.Struct('<4sqi?xxx')
+_MAGIC: bytes = b'ALT2'
+
+
+# the moves between the states reachable from start, as a directed Graph over the state indices
+def _reachable_graph(start: int, num_states: int, encode: Callable[[T], int], decode: Callable[[int], T], successors: Callable[[T], List[T]]) -> Graph[int]:
+    sources: array = array('q')
+    targets: array = array('q')
+    seen: bytearray = bytearray(num_states)
+    seen[start] = 1
+    frontier: List[int] = [start]
+    while frontier:
+        next_frontier: List[int] = []
+        for index in frontier:
+            for child in successors(decode(index)):
+                child_index: int = encode(child)
+                sources.append(index)
+                targets.append(child_index)
+                if not seen[child_index]:
+                    seen[child_index] = 1
+                    next_frontier.append(child_index)
+        frontier = next_frontier
+    return Graph.from_edges(num_states, sources, targets, directed=True)
+
+
+# whether every move of graph can be made the other way, i.e. it has the same edges as reverse
+def _symmetric(graph: Graph[int], reverse: Graph[int]) -> bool:
+    return all(sorted(graph.neighbour_indices(index)) == sorted(reverse.neighbour_indices(index)) for index in range(graph.vertex_count))
+
+
+# pick the reachable state furthest from every landmark chosen so far
+def _furthest(tables: List[array]) -> int:
+    closest: array = array('i', tables[0])
+    for table in tables[1:]:
+        for index, d in enumerate(table):
+            if d < closest[index]:
+                closest[index] = d
+    return max(range(len(closest)), key=closest.__getitem__)
+
+
+# Landmark (ALT) heuristic for repeated a star queries on one fixed map
+# manhattan and euclidian distance ignore walls completely, so on mazes with many walls
+# astar ends up expanding almost as much as bfs
+# instead we choose k landmarks, spread as far apart as possible, and store exact distances
+# from every landmark to every state once
+# by the triangle inequality |d(L, n) - d(L, goal)| <= d(n, goal) for every landmark L,
+# so the largest of those differences is an admissible (and consistent) heuristic
+# that only holds when moves are reversible, as they are in a Maze; otherwise distances to every
+# landmark are stored as well and the bounds are d(n, goal) >= d(L, goal) - d(L, n) and d(n, L) - d(goal, L)
+#
+# states are addressed through the same encode/decode pair the compact search engines use,
+# and the tables are flat int arrays that can be saved once per map and loaded again later
+class LandmarkHeuristic(Generic[T]):
+    # tables hold the distances from every landmark, and reverse_tables the distances to them
+    # (None when moves are reversible and the two are the same)
+    def __init__(self, landmarks: List[int], tables: List[array], encode: Callable[[T], int], reverse_tables: Optional[List[array]] = None) -> None:
+        self.landmarks: List[int] = landmarks
+        self._tables: List[array] = tables
+        self._reverse_tables: Optional[List[array]] = reverse_tables
+        self._encode: Callable[[T], int] = encode
+
+    # the first landmark is the state furthest from start, every later one is the state
+    # furthest from all landmarks so far; only states reachable from start are ever picked
+    @classmethod
+    def _spread(cls, start: int, table: Callable[[int], array], encode: Callable[[T], int], k: int, reverse_table: Optional[Callable[[int], array]] = None) -> LandmarkHeuristic[T]:
+        tables: List[array] = [table(start)]
+        landmarks: List[int] = []
+        for _ in range(k):
+            landmark: int = _furthest(tables)
+            if landmark in landmarks:
+                break
+            if not landmarks:
+                tables = []
+            landmarks.append(landmark)
+            tables.append(table(landmark))
+        reverse_tables: Optional[List[array]] = [reverse_table(landmark) for landmark in landmarks] if reverse_table is not None else None
+        return cls(landmarks, tables, encode, reverse_tables)
+
+    # successors may be directed: the moves reachable from initial are collected once,
+    # and distances to the landmarks come from searching them backwards unless every move is reversible
+    @classmethod
+    def for_graph(cls, initial: T, successors: Callable[[T], List[T]], encode: Callable[[T], int], decode: Callable[[int], T], num_states: int, k: int = 8) -> LandmarkHeuristic[T]:
+        start: int = encode(initial)
+        graph: Graph[int] = _reachable_graph(start, num_states, encode, decode, successors)
+        reverse: Graph[int] = Graph.from_edges(num_states, graph.neighbours, [index for index in range(num_states) for _ in graph.neighbour_indices(index)], directed=True)
+
+        def table(index: int) -> array:
+            return level_bfs(graph, [index], direction_optimising=False).distances
+
+        def reverse_table(index: int) -> array:
+            return level_bfs(reverse, [index], direction_optimising=False).distances
+
+        return cls._spread(start, table, encode, k, None if _symmetric(graph, reverse) else reverse_table)
+
+    # a Maze can use the distance field wavefront instead of the generic bfs
+    @classmethod
+    def for_maze(cls, maze: Maze, k: int = 8) -> LandmarkHeuristic[MazeLocation]:
+        def table(index: int) -> array:
+            return DistanceField(maze, [maze.decode(index)]).distances
+        return cls._spread(maze.encode(maze._start), table, maze.encode, k)
+
+    # used just like manhattan_distance(goal): returns the heuristic towards goal
+    # another admissible heuristic can be passed as base, and the larger estimate is used
+    # (on fairly open maps manhattan distance is often the tighter bound near the goal)
+    def heuristic(self, goal: T, base: Optional[Callable[[T], float]] = None) -> Callable[[T], float]:
+        goal_index: int = self._encode(goal)
+        # landmarks that cannot reach the goal say nothing useful about it
+        pairs = [(table, table[goal_index]) for table in self._tables if table[goal_index] >= 0]
+        encode: Callable[[T], int] = self._encode
+
+        if self._reverse_tables is None:
+            def distance(state: T) -> float:
+                index: int = encode(state)
+                best: float = base(state) if base is not None else 0
+                for table, to_goal in pairs:
+                    d: int = table[index]
+                    if d >= 0:
+                        difference: int = d - to_goal if d > to_goal else to_goal - d
+                        if difference > best:
+                            best = difference
+                return float(best)
+            return distance
+
+        # the goal is at least as far from n as from the landmark minus the landmark's distance to n,
+        # and as n is from the landmark minus the goal's distance to it
+        reverse_pairs = [(table, table[goal_index]) for table in self._reverse_tables if table[goal_index] >= 0]
+
+        def directed_distance(state: T) -> float:
+            index: int = encode(state)
+            best: float = base(state) if base is not None else 0
+            for table, from_landmark in pairs:
+                d: int = table[index]
+                if 0 <= d < from_landmark - best:
+                    best = from_landmark - d
+            for table, to_landmark in reverse_pairs:
+                d = table[index]
+                if d - to_landmark > best:
+                    best = d - to_landmark
+            return float(best)
+        return directed_distance
+
+    def save(self, path: str) -> None:
+        num_states: int = len(self._tables[0]) if self._tables else 0
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, num_states, len(self.landmarks), self._reverse_tables is not None))
+            write_array(f, array('q', self.landmarks))
+            for table in self._tables + (self._reverse_tables or []):
+                write_array(f, array('i', table))
+
+    @classmethod
+    def load(cls, path: str, encode: Callable[[T], int]) -> LandmarkHeuristic[T]:
+        with open(path, 'rb') as f:
+            magic, num_states, k, directed = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a landmark file")
+            landmarks: array = read_array(f, 'q', k)
+            tables: List[array] = [read_array(f, 'i', num_states) for _ in range(k)]
+            reverse_tables: Optional[List[array]] = [read_array(f, 'i', num_states) for _ in range(k)] if directed else None
+        return cls(list(landmarks), tables, encode, reverse_tables)
+
+
+if __name__ == '__main__':
+    m = Maze(150, 150, 0.25, MazeLocation(0, 0), MazeLocation(149, 149))
+
+    stime1 = timer()
+    landmarks: LandmarkHeuristic[MazeLocation] = LandmarkHeuristic.for_maze(m, 8)
+    etime1 = timer()
+    print(f'landmarks chosen: {[m.decode(i) for i in landmarks.landmarks]}')
+    print(f'precomputation time: {etime1 - stime1}')
+
+    heuristics = (('manhattan', manhattan_distance(m._goal)),
+                  ('landmarks', landmarks.heuristic(m._goal)),
+                  ('landmarks + manhattan', landmarks.heuristic(m._goal, manhattan_distance(m._goal))))
+    for name, heuristic in heuristics:
+        stats: SearchStats = SearchStats()
+        stime = timer()
+        solution = astar(m._start, m.goal_test, m.successors, heuristic, stats=stats)
+        etime = timer()
+        length: Optional[int] = len(node_to_path(solution)) if solution is not None else None
+        print(f'{name}: path length {length}, nodes expanded {stats.nodes_expanded}, time taken: {etime - stime}')
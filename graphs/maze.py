@@ -1,8 +1,10 @@
 from enum import Enum
-from typing import List, NamedTuple, Callable, Optional
+from typing import List, NamedTuple, Callable, Optional, Dict, Tuple, Any
 import random
+from array import array
 from math import sqrt
-from generic_search import dfs, bfs, astar, node_to_path, Node
+from generic_search import dfs, bfs, astar, bfs_compact, bidirectional_bfs, node_to_path, Node, SearchStats
+from graphs.union_find import UnionFind
 from timeit import default_timer as timer
 
 class Cell(str, Enum):
@@ -17,8 +19,45 @@ class MazeLocation(NamedTuple):
     column: int
 
 
+# The grid stores one byte per cell instead of one Cell object per cell
+# CELLS[code] is the Cell a byte stands for, and CODES[cell] the byte stored for it
+CELLS: List[Cell] = [Cell.EMPTY, Cell.BLOCKED, Cell.START, Cell.GOAL, Cell.PATH]
+CODES: Dict[Cell, int] = {cell: code for code, cell in enumerate(CELLS)}
+EMPTY: int = CODES[Cell.EMPTY]
+BLOCKED: int = CODES[Cell.BLOCKED]
+START: int = CODES[Cell.START]
+GOAL: int = CODES[Cell.GOAL]
+PATH: int = CODES[Cell.PATH]
+
+# byte translation tables: cell codes to 1 for blocked / 0 for open, and to printable characters
+# (the block character is not a single byte, so it is swapped in after decoding)
+_BLOCKED_TABLE: bytes = bytes(1 if code == BLOCKED else 0 for code in range(256))
+_PRINT_TABLE: bytes = bytes(ord(CELLS[code].value) if code < len(CELLS) and code != BLOCKED else ord('#') for code in range(256))
+
+# bits of the precomputed neighbour mask, one per direction, in the order successors checks them
+DOWN_BIT: int = 1
+UP_BIT: int = 2
+RIGHT_BIT: int = 4
+LEFT_BIT: int = 8
+
+
+# The ways a Maze can be generated
+# 'random' blocks every cell independently with probability sparseness; this is fast,
+# but even 20% sparseness often produces mazes with no way from start to goal
+# the others carve a maze out of solid rock on a lattice of cells at even (row, column) positions:
+# 'backtracker' (an iterative depth-first search), 'kruskal' (random walls joined with a union-find)
+# and 'wilson' (loop-erased random walks, giving a uniformly random maze) visit the rooms one at a time
+# in Python, a few seconds per million cells; 'binary_tree' builds whole rows at once and carves
+# 10k x 10k grids in seconds, at the cost of a visible diagonal bias
+# carved mazes are 'perfect' (exactly one path between any two cells) and always solvable;
+# with the loops argument every remaining lattice wall comes down with that probability, making them imperfect
+GENERATORS: Tuple[str, ...] = ('random', 'backtracker', 'kruskal', 'wilson', 'binary_tree')
+
+
 class Maze:
-    def __init__(self, rows: int = 10, columns: int = 10, sparseness: float = 0.2, start: MazeLocation = MazeLocation(0, 0), goal: MazeLocation = MazeLocation(9, 9)) -> None:
+    def __init__(self, rows: int = 10, columns: int = 10, sparseness: float = 0.2, start: MazeLocation = MazeLocation(0, 0), goal: MazeLocation = MazeLocation(9, 9), generator: str = 'random', seed: Optional[int] = None, loops: float = 0.0) -> None:
+        if generator not in GENERATORS:
+            raise ValueError(f"Unknown maze generator {generator}")
         # basic initialization
         self._rows: int = rows
         self._columns: int = columns
@@ -26,65 +65,384 @@ class Maze:
         self._start: MazeLocation = start
         self._goal: MazeLocation = goal
         # fill the maze with empty cells
-        # using list composition to get this all in one line
-        self._grid: List[List[Cell]] = [[Cell.EMPTY for c in range(self._columns)] for r in range(self._rows)]
-        # then we randomly fill the grid, according to the sparseness factor
-        self._randomly_fill(rows, columns, sparseness)
-        self._grid[self._start.row][self._start.column] = Cell.START
-        self._grid[self._goal.row][self._goal.column] = Cell.GOAL
-    
-    def _randomly_fill(self, rows: int, columns: int, sparseness: float):
-        # loop through every cell in the maze
-        # we are looking at a 10 x 10 maze by default
-        for r in range(rows):
-            for c in range(columns):
-                # if the threshold set by sparseness is exceeded
-                # block the cell
-                if random.uniform(0, 1.0) < sparseness:
-                    self._grid[r][c] = Cell.BLOCKED
+        # the grid is a flat bytearray of cell codes in row-major order,
+        # so cell (r, c) lives at index r * columns + c
+        self._grid: bytearray = bytearray(rows * columns)
+        # one direction bit per open neighbour, built on demand by precompute_neighbours
+        self._neighbours: Optional[bytearray] = None
+        self._moves: List[Tuple[int, ...]] = []
+        # without a seed the generator draws from the global random state,
+        # so random.seed() keeps working for reproducible mazes
+        rng: random.Random = random.Random(seed if seed is not None else random.getrandbits(64))
+        if generator == 'random':
+            # then we randomly fill the grid, according to the sparseness factor
+            self._randomly_fill(rows, columns, sparseness, rng)
+        else:
+            self._grid[:] = bytes([BLOCKED]) * len(self._grid)
+            if generator == 'backtracker':
+                self._carve_backtracker(rng)
+            elif generator == 'kruskal':
+                self._carve_kruskal(rng)
+            elif generator == 'wilson':
+                self._carve_wilson(rng)
+            else:
+                self._carve_binary_tree(rng)
+            if loops > 0:
+                self._add_loops(rng, loops)
+            self._connect_to_lattice(self._start)
+            self._connect_to_lattice(self._goal)
+        self._grid[self.encode(self._start)] = START
+        self._grid[self.encode(self._goal)] = GOAL
     
+    # wrap an existing grid of cell codes in a Maze without generating anything,
+    # e.g. for mazes loaded from disk; the grid only has to index and slice like a bytearray
+    @classmethod
+    def from_grid(cls, grid: Any, rows: int, columns: int, start: MazeLocation, goal: MazeLocation) -> 'Maze':
+        maze: Maze = cls.__new__(cls)
+        maze._rows = rows
+        maze._columns = columns
+        maze._sparseness = 0.0
+        maze._start = start
+        maze._goal = goal
+        maze._grid = grid
+        maze._neighbours = None
+        maze._moves = []
+        maze._grid[maze.encode(start)] = START
+        maze._grid[maze.encode(goal)] = GOAL
+        return maze
+
+    def _randomly_fill(self, rows: int, columns: int, sparseness: float, rng: random.Random):
+        # draw one random byte per cell and turn every byte below the threshold into a wall
+        # both steps run over the whole grid at once, so no Python loop touches each cell
+        # (the sparseness is rounded to the nearest 1/256)
+        threshold: int = round(sparseness * 256)
+        table: bytes = bytes(BLOCKED if value < threshold else EMPTY for value in range(256))
+        self._grid[:] = rng.randbytes(rows * columns).translate(table)
+
+    # the lattice of rooms used by the carving generators: rooms sit at even rows and columns,
+    # and the cell between two neighbouring rooms is the wall that gets knocked down
+    @property
+    def _lattice(self) -> Tuple[int, int]:
+        return (self._rows + 1) // 2, (self._columns + 1) // 2
+
+    def _room(self, room: int) -> int:
+        lattice_columns: int = self._lattice[1]
+        i, j = divmod(room, lattice_columns)
+        return 2 * i * self._columns + 2 * j
+
+    # the rooms next to a room, and the grid index of the wall between them
+    def _adjacent_rooms(self, room: int) -> List[Tuple[int, int]]:
+        lattice_rows, lattice_columns = self._lattice
+        i, j = divmod(room, lattice_columns)
+        cell: int = self._room(room)
+        rooms: List[Tuple[int, int]] = []
+        if i + 1 < lattice_rows:
+            rooms.append((room + lattice_columns, cell + self._columns))
+        if i > 0:
+            rooms.append((room - lattice_columns, cell - self._columns))
+        if j + 1 < lattice_columns:
+            rooms.append((room + 1, cell + 1))
+        if j > 0:
+            rooms.append((room - 1, cell - 1))
+        return rooms
+
+    def _carve_backtracker(self, rng: random.Random) -> None:
+        lattice_rows, lattice_columns = self._lattice
+        grid: bytearray = self._grid
+        visited: bytearray = bytearray(lattice_rows * lattice_columns)
+        stack: List[int] = [0]
+        visited[0] = 1
+        grid[0] = EMPTY
+        # an explicit stack instead of recursion, so huge mazes do not hit the recursion limit
+        while stack:
+            room: int = stack[-1]
+            options: List[Tuple[int, int]] = [(other, wall) for other, wall in self._adjacent_rooms(room) if not visited[other]]
+            if not options:
+                stack.pop()
+                continue
+            other, wall = options[rng.randrange(len(options))]
+            visited[other] = 1
+            grid[wall] = EMPTY
+            grid[self._room(other)] = EMPTY
+            stack.append(other)
+
+    def _carve_kruskal(self, rng: random.Random) -> None:
+        lattice_rows, lattice_columns = self._lattice
+        grid: bytearray = self._grid
+        rooms: int = lattice_rows * lattice_columns
+        for room in range(rooms):
+            grid[self._room(room)] = EMPTY
+        # every wall between two rooms, as (room, room below or to the right, wall cell)
+        walls: List[Tuple[int, int, int]] = []
+        for room in range(rooms):
+            for other, wall in self._adjacent_rooms(room):
+                if other > room:
+                    walls.append((room, other, wall))
+        rng.shuffle(walls)
+        # union-find over the rooms: a wall only comes down if it joins two separate regions
+        parents: array = array('i', range(rooms))
+
+        def find(room: int) -> int:
+            root: int = room
+            while parents[root] != root:
+                root = parents[root]
+            while parents[room] != root:
+                parents[room], room = root, parents[room]
+            return root
+
+        for room, other, wall in walls:
+            a: int = find(room)
+            b: int = find(other)
+            if a != b:
+                parents[a] = b
+                grid[wall] = EMPTY
+
+    def _carve_wilson(self, rng: random.Random) -> None:
+        lattice_rows, lattice_columns = self._lattice
+        grid: bytearray = self._grid
+        rooms: int = lattice_rows * lattice_columns
+        in_maze: bytearray = bytearray(rooms)
+        in_maze[0] = 1
+        grid[self._room(0)] = EMPTY
+        # where the random walk last left each room; revisiting a room overwrites its exit,
+        # which erases any loop the walk made
+        exits: array = array('i', [0]) * rooms
+        walls: array = array('i', [0]) * rooms
+        for first in range(rooms):
+            if in_maze[first]:
+                continue
+            room: int = first
+            while not in_maze[room]:
+                options: List[Tuple[int, int]] = self._adjacent_rooms(room)
+                other, wall = options[rng.randrange(len(options))]
+                exits[room] = other
+                walls[room] = wall
+                room = other
+            # carve the loop-erased walk into the maze
+            room = first
+            while not in_maze[room]:
+                in_maze[room] = 1
+                grid[self._room(room)] = EMPTY
+                grid[walls[room]] = EMPTY
+                room = exits[room]
+
+    # every room but the top right one opens either the wall above it or the wall to its right
+    # (the top row can only go right and the last column only up), which links all rooms into one tree
+    # the choices come from one random byte per room, and every lattice row is written with a few
+    # slice assignments, so no Python loop runs per cell
+    def _carve_binary_tree(self, rng: random.Random) -> None:
+        lattice_rows, lattice_columns = self._lattice
+        grid: bytearray = self._grid
+        columns: int = self._columns
+        # a byte below 128 opens the wall to the right, any other the wall above
+        right_table: bytes = bytes(EMPTY if value < 128 else BLOCKED for value in range(256))
+        up_table: bytes = bytes(BLOCKED if value < 128 else EMPTY for value in range(256))
+        rooms: bytes = bytes([EMPTY]) * lattice_columns
+        for i in range(lattice_rows):
+            row: int = 2 * i * columns
+            grid[row:row + 2 * lattice_columns - 1:2] = rooms
+            choices: bytes = rng.randbytes(lattice_columns)
+            if i == 0:
+                grid[row + 1:row + 2 * lattice_columns - 2:2] = rooms[1:]
+                continue
+            grid[row + 1:row + 2 * lattice_columns - 2:2] = choices[:-1].translate(right_table)
+            up: bytearray = bytearray(choices.translate(up_table))
+            up[-1] = EMPTY
+            grid[row - columns:row - columns + 2 * lattice_columns - 1:2] = up
+
+    # knock down every remaining lattice wall with probability loops (rounded to the nearest 1/256)
+    # a row of walls at a time: the walls that stay are those both blocked now and not drawn,
+    # and since every byte is 0 or 1 that is a single AND of the rows read as big integers
+    def _add_loops(self, rng: random.Random, loops: float) -> None:
+        lattice_rows, lattice_columns = self._lattice
+        grid: bytearray = self._grid
+        columns: int = self._columns
+        threshold: int = round(loops * 256)
+        keep_table: bytes = bytes(0 if value < threshold else 1 for value in range(256))
+        blocked_table: bytes = bytes(1 if code == BLOCKED else 0 for code in range(256))
+        cell_table: bytes = bytes(BLOCKED if value else EMPTY for value in range(256))
+        for i in range(lattice_rows):
+            row: int = 2 * i * columns
+            # the walls to the right of the rooms of this row, then the walls above them
+            walls: List[slice] = [slice(row + 1, row + 2 * lattice_columns - 2, 2)]
+            if i > 0:
+                walls.append(slice(row - columns, row - columns + 2 * lattice_columns - 1, 2))
+            for part in walls:
+                cells: bytes = bytes(grid[part])
+                if not cells:
+                    continue
+                kept: int = int.from_bytes(cells.translate(blocked_table), 'little') & int.from_bytes(rng.randbytes(len(cells)).translate(keep_table), 'little')
+                grid[part] = kept.to_bytes(len(cells), 'little').translate(cell_table)
+
+    # start and goal may sit between rooms, so open a short corridor from them to the nearest room
+    def _connect_to_lattice(self, ml: MazeLocation) -> None:
+        grid: bytearray = self._grid
+        columns: int = self._columns
+        room_row: int = ml.row - ml.row % 2
+        room_column: int = ml.column - ml.column % 2
+        for r in range(room_row, ml.row + 1):
+            grid[r * columns + ml.column] = EMPTY
+        for c in range(room_column, ml.column + 1):
+            grid[room_row * columns + c] = EMPTY
 
     def goal_test(self, ml: MazeLocation) -> bool:
         return ml == self._goal
 
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    # the compact search engines need every location mapped onto a single integer
+    # row-major order gives each cell a unique index in range(num_cells)
+    @property
+    def num_cells(self) -> int:
+        return self._rows * self._columns
+
+    def encode(self, ml: MazeLocation) -> int:
+        return ml.row * self._columns + ml.column
+
+    def decode(self, index: int) -> MazeLocation:
+        return MazeLocation(*divmod(index, self._columns))
+
+    def cell(self, ml: MazeLocation) -> Cell:
+        return CELLS[self._grid[ml.row * self._columns + ml.column]]
+
+    # a copy of the cell codes of one row, from column up to (not including) end_column
+    def row_codes(self, row: int, column: int = 0, end_column: Optional[int] = None) -> bytearray:
+        start: int = row * self._columns
+        return self._grid[start + column:start + (self._columns if end_column is None else end_column)]
+
+    # change a single cell, keeping the neighbour masks (if any) in step with walls appearing or disappearing
+    def set_cell(self, ml: MazeLocation, cell: Cell) -> None:
+        index: int = ml.row * self._columns + ml.column
+        was_blocked: bool = self._grid[index] == BLOCKED
+        self._grid[index] = CODES[cell]
+        if self._neighbours is not None and was_blocked != (cell == Cell.BLOCKED):
+            for neighbour in self._around(index):
+                self._neighbours[neighbour] = self._neighbour_bits(neighbour)
+            self._neighbours[index] = self._neighbour_bits(index)
+
+    # one byte per cell in row-major order, 1 where the cell is blocked
+    # this is the flat view of the grid that the specialised solvers work on
+    def blocked_mask(self) -> bytearray:
+        return bytearray(self._grid.translate(_BLOCKED_TABLE))
+
+    # every in-bounds neighbour of a cell index, open or not
+    def _around(self, index: int) -> List[int]:
+        row, column = divmod(index, self._columns)
+        cells: List[int] = []
+        if row + 1 < self._rows:
+            cells.append(index + self._columns)
+        if row > 0:
+            cells.append(index - self._columns)
+        if column + 1 < self._columns:
+            cells.append(index + 1)
+        if column > 0:
+            cells.append(index - 1)
+        return cells
+
+    def _neighbour_bits(self, index: int) -> int:
+        grid: bytearray = self._grid
+        columns: int = self._columns
+        row, column = divmod(index, columns)
+        bits: int = 0
+        if row + 1 < self._rows and grid[index + columns] != BLOCKED:
+            bits |= DOWN_BIT
+        if row > 0 and grid[index - columns] != BLOCKED:
+            bits |= UP_BIT
+        if column + 1 < columns and grid[index + 1] != BLOCKED:
+            bits |= RIGHT_BIT
+        if column > 0 and grid[index - 1] != BLOCKED:
+            bits |= LEFT_BIT
+        return bits
+
+    # store, for every cell, which of its four neighbours are open
+    # successors and index_successors then need a single lookup per cell instead of four checks
+    def precompute_neighbours(self) -> None:
+        self._neighbours = bytearray(self._neighbour_bits(index) for index in range(self.num_cells))
+        columns: int = self._columns
+        # for every possible mask, the index offsets of the open neighbours it stands for
+        self._moves = []
+        for bits in range(16):
+            offsets: List[int] = []
+            if bits & DOWN_BIT:
+                offsets.append(columns)
+            if bits & UP_BIT:
+                offsets.append(-columns)
+            if bits & RIGHT_BIT:
+                offsets.append(1)
+            if bits & LEFT_BIT:
+                offsets.append(-1)
+            self._moves.append(tuple(offsets))
+
     # functions for maze navigation
     # successor returns a list of neighbouring maze locations
     # that can be reached from the current maze location
     def successors(self, ml: MazeLocation) -> List[MazeLocation]:
+        columns: int = self._columns
+        index: int = ml.row * columns + ml.column
+        if self._neighbours is not None:
+            return [MazeLocation(*divmod(index + offset, columns)) for offset in self._moves[self._neighbours[index]]]
+        grid: bytearray = self._grid
         locations: List[MazeLocation] = []
         # check the grid location immediately above
-        if ml.row + 1 < self._rows and self._grid[ml.row + 1][ml.column] != Cell.BLOCKED:
+        if ml.row + 1 < self._rows and grid[index + columns] != BLOCKED:
             locations.append(MazeLocation(ml.row + 1, ml.column))
         # check the grid location immediately below
-        if ml.row - 1 >= 0 and self._grid[ml.row - 1][ml.column] != Cell.BLOCKED:
+        if ml.row - 1 >= 0 and grid[index - columns] != BLOCKED:
             locations.append(MazeLocation(ml.row - 1, ml.column))
         # check the grid location immediately to the right
-        if ml.column + 1 < self._columns and self._grid[ml.row][ml.column + 1] != Cell.BLOCKED:
+        if ml.column + 1 < columns and grid[index + 1] != BLOCKED:
             locations.append(MazeLocation(ml.row, ml.column + 1))
         # check the grid location immediately to the left
-        if ml.column - 1 >= 0 and self._grid[ml.row][ml.column - 1] != Cell.BLOCKED:
+        if ml.column - 1 >= 0 and grid[index - 1] != BLOCKED:
             locations.append(MazeLocation(ml.row, ml.column - 1))
         return locations
 
+    # the same neighbours as successors, but as cell indices, for the compact search engines
+    # (use encode/decode to convert, and an identity function as their encoder)
+    # like successors, it uses the neighbour table only once precompute_neighbours has been called
+    def index_successors(self, index: int) -> List[int]:
+        if self._neighbours is not None:
+            return [index + offset for offset in self._moves[self._neighbours[index]]]
+        grid: bytearray = self._grid
+        return [cell for cell in self._around(index) if grid[cell] != BLOCKED]
+
     # function to mark the path from start
     # to the finish of the maze
     def mark(self, path: List[MazeLocation]) -> None:
+        grid: bytearray = self._grid
+        columns: int = self._columns
         for location in path:
-            self._grid[location.row][location.column] = Cell.PATH
-        self._grid[self._start.row][self._start.column] = Cell.START
-        self._grid[self._goal.row][self._goal.column] = Cell.GOAL
+            grid[location.row * columns + location.column] = PATH
+        grid[self.encode(self._start)] = START
+        grid[self.encode(self._goal)] = GOAL
     
     def clear(self, path: List[MazeLocation]) -> None:
+        grid: bytearray = self._grid
+        columns: int = self._columns
         for location in path:
-            self._grid[location.row][location.column] = Cell.EMPTY
-        self._grid[self._start.row][self._start.column] = Cell.START
-        self._grid[self._goal.row][self._goal.column] = Cell.GOAL
+            grid[location.row * columns + location.column] = EMPTY
+        grid[self.encode(self._start)] = START
+        grid[self.encode(self._goal)] = GOAL
     
     def __repr__(self): 
-        output: str = ""
-        for row in self._grid:
-            output += " ".join([c.value for c in row]) + "\n"
-        return output
+        # every row is translated to characters in one go and the rows joined once at the end
+        columns: int = self._columns
+        rows: List[str] = []
+        for r in range(self._rows):
+            line: str = self._grid[r * columns:(r + 1) * columns].translate(_PRINT_TABLE).decode('ascii')
+            rows.append(" ".join(line) + "\n")
+        return "".join(rows).replace("#", Cell.BLOCKED.value)
+
+
+# one row of cell codes (e.g. from Maze.row_codes) as repr(maze) prints it
+def row_to_text(codes: bytes) -> str:
+    return " ".join(codes.translate(_PRINT_TABLE).decode('ascii')).replace("#", Cell.BLOCKED.value)
 
 # The A* algorithm requires a heuristic 
 # The heuristic is used to judge whether the algorithm 
@@ -107,14 +465,82 @@ def manhattan_distance(goal: MazeLocation) -> Callable[[MazeLocation], float]:
                                                 
 
 
+# Reachability index for a Maze: which open cells can reach which
+# built once in a single pass over the grid, after which connected(start, goal) tells whether
+# a search can succeed at all before running it, so unsolvable queries fail straight away
+# instead of after exhausting the start's component
+#
+# opening cells (open_cell) only ever joins components and is applied incrementally;
+# blocking a cell may split a component, which union-find cannot undo,
+# so block_cell makes the index rebuild itself on the next query
+class MazeConnectivity:
+    def __init__(self, maze: Maze) -> None:
+        self._maze: Maze = maze
+        self._components: UnionFind = UnionFind(0)
+        self._stale: bool = True
+        self._build()
+
+    def _build(self) -> None:
+        maze: Maze = self._maze
+        columns: int = maze._columns
+        blocked: bytearray = maze.blocked_mask()
+        components: UnionFind = UnionFind(maze.num_cells)
+        union = components.union
+        for index in range(maze.num_cells):
+            if blocked[index]:
+                continue
+            # join each open cell with the open cells to its right and below
+            if (index + 1) % columns and not blocked[index + 1]:
+                union(index, index + 1)
+            if index + columns < maze.num_cells and not blocked[index + columns]:
+                union(index, index + columns)
+        self._components = components
+        self._stale = False
+
+    # number of separate open regions of the maze
+    @property
+    def regions(self) -> int:
+        if self._stale:
+            self._build()
+        return self._components.count - self._maze.blocked_mask().count(1)
+
+    def connected(self, a: MazeLocation, b: MazeLocation) -> bool:
+        if self._stale:
+            self._build()
+        maze: Maze = self._maze
+        index_a: int = maze.encode(a)
+        index_b: int = maze.encode(b)
+        if maze._grid[index_a] == BLOCKED or maze._grid[index_b] == BLOCKED:
+            return False
+        return self._components.connected(index_a, index_b)
+
+    def open_cell(self, ml: MazeLocation) -> None:
+        maze: Maze = self._maze
+        index: int = maze.encode(ml)
+        if maze._grid[index] != BLOCKED:
+            return
+        maze.set_cell(ml, Cell.EMPTY)
+        if self._stale:
+            return
+        for neighbour in maze._around(index):
+            if maze._grid[neighbour] != BLOCKED:
+                self._components.union(index, neighbour)
+
+    def block_cell(self, ml: MazeLocation) -> None:
+        if self._maze.cell(ml) != Cell.BLOCKED:
+            self._maze.set_cell(ml, Cell.BLOCKED)
+            self._stale = True
+
+
 # perform some tests here
 # randomly blocking the grid even with a conservative sparseness factor
 # such as 20%, can still lead to unsolvable mazes
-# a better strategy would be to make use of some form of random walk
-# or use a depth-first search to 'create paths' and then block out the paths
-# not visited by the dfs
+# the carving generators ('backtracker', 'kruskal' and 'wilson') avoid this:
+# they use a depth-first search or random walks to 'create paths'
+# and leave everything they did not visit blocked
 if __name__=='__main__':
     m = Maze(10, 10)
+    print(Maze(11, 21, start=MazeLocation(0, 0), goal=MazeLocation(10, 20), generator='backtracker'))
 
     # depth-first search
     stime1 = timer()
@@ -148,8 +574,9 @@ if __name__=='__main__':
 
     # a-star algorithm
     distance: Callable[[MazeLocation], float] = euclidian_distance(m._goal)
+    stats3: SearchStats = SearchStats()
     stime3 = timer()
-    solution3: Optional[Node[MazeLocation]] = astar(m._start, m.goal_test, m.successors, distance)
+    solution3: Optional[Node[MazeLocation]] = astar(m._start, m.goal_test, m.successors, distance, stats=stats3)
     etime3 = timer()
     if solution3 is None:
         print('No solution found using astar!')
@@ -158,4 +585,64 @@ if __name__=='__main__':
         m.mark(path3)
         print(m)
         m.clear(path3) 
-    print(f'time taken: {etime3 - stime3}')
\ No newline at end of file
+    print(f'time taken: {etime3 - stime3}')
+    print(stats3)
+
+    print("\n" + 30*"-" + "\n")
+
+    # breadth-first search with the compact engine
+    # parents and visited flags are kept in flat arrays indexed by cell
+    stime4 = timer()
+    solution4 = bfs_compact(m._start, m.goal_test, m.successors, m.encode, m.decode, m.num_cells)
+    etime4 = timer()
+    if solution4 is None:
+        print("No solution found using compact breadth-first search!")
+    else:
+        path4: List[MazeLocation] = node_to_path(solution4)
+        m.mark(path4)
+        print(m)
+        m.clear(path4)
+    print(f'time taken: {etime4 - stime4}')
+
+    print("\n" + 30*"-" + "\n")
+
+    # bidirectional breadth-first search
+    # moves in a maze are reversible, so successors double as predecessors
+    stime5 = timer()
+    solution5: Optional[Node[MazeLocation]] = bidirectional_bfs(m._start, m._goal, m.successors, m.successors)
+    etime5 = timer()
+    if solution5 is None:
+        print("No solution found using bidirectional breadth-first search!")
+    else:
+        path5: List[MazeLocation] = node_to_path(solution5)
+        m.mark(path5)
+        print(m)
+        m.clear(path5)
+    print(f'time taken: {etime5 - stime5}')
+
+    print("\n" + 30*"-" + "\n")
+
+    # reachability index on a bigger maze
+    large = Maze(500, 500, 0.4, MazeLocation(0, 0), MazeLocation(499, 499))
+
+    stime1 = timer()
+    connectivity: MazeConnectivity = MazeConnectivity(large)
+    etime1 = timer()
+    print(f'{connectivity.regions} open regions found in: {etime1 - stime1}')
+
+    queries = [(MazeLocation(random.randrange(500), random.randrange(500)), MazeLocation(random.randrange(500), random.randrange(500))) for _ in range(100)]
+    stime2 = timer()
+    answers: List[bool] = [connectivity.connected(a, b) for a, b in queries]
+    etime2 = timer()
+    stime3 = timer()
+    searched: List[bool] = [large.cell(a) != Cell.BLOCKED and bfs(a, lambda ml: ml == b, large.successors) is not None for a, b in queries]
+    etime3 = timer()
+    print(f'{len(queries)} reachability queries: {etime2 - stime2} with the index, {etime3 - stime3} with bfs, same answers: {answers == searched}')
+
+    # open a straight route along the top row and down the last column, one cell at a time
+    route: List[MazeLocation] = [MazeLocation(0, c) for c in range(500)] + [MazeLocation(r, 499) for r in range(1, 500)]
+    for opened, ml in enumerate(route, 1):
+        connectivity.open_cell(ml)
+        if connectivity.connected(large._start, large._goal):
+            print(f'goal reachable after opening {opened} cells of the route')
+            break
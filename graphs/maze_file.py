@@ -0,0 +1,184 @@
+from typing import List, Dict, Optional, Union
+from array import array
+import mmap
+import os
+import struct
+import sys
+from graphs.graph_io import write_array, read_array
+from graphs.maze import Maze, MazeLocation, BLOCKED, EMPTY
+from graphs.distance_field import DistanceField
+from generic_search import bfs, node_to_path
+from timeit import default_timer as timer
+
+# Compact on-disk format for mazes
+#
+#   header: magic b'MAZE', version, rows, columns, start row, start column, goal row, goal column
+#   body:   the blocked cells, one bit per cell in row-major order (least significant bit first)
+#
+# only walls are stored; marked paths and distance fields can be saved in files next to the map
+# (<map>.path and <map>.dist), each with its own small header
+_HEADER: struct.Struct = struct.Struct('<4sHxxIIIIII')
+_MAGIC: bytes = b'MAZE'
+_VERSION: int = 1
+_PATH_HEADER: struct.Struct = struct.Struct('<4sI')
+_PATH_MAGIC: bytes = b'MPTH'
+_FIELD_HEADER: struct.Struct = struct.Struct('<4sII')
+_FIELD_MAGIC: bytes = b'MDST'
+
+_TO_DIGITS: bytes = bytes(ord('1') if code == BLOCKED else ord('0') for code in range(256))
+# every possible byte of the body, unpacked into the eight cell codes it stands for
+_UNPACK: List[bytes] = [bytes(BLOCKED if value >> bit & 1 else EMPTY for bit in range(8)) for value in range(256)]
+
+
+# A maze grid read straight out of a memory-mapped file
+# only the pages holding cells that are actually looked at are ever read from disk
+# the file itself is never written to: cells that are changed (start, goal, marked paths,
+# or walls added and removed) are kept in a small overlay dictionary instead
+class PackedGrid:
+    def __init__(self, bits: Union[mmap.mmap, bytes], offset: int, size: int) -> None:
+        self._bits: Union[mmap.mmap, bytes] = bits
+        self._offset: int = offset
+        self._size: int = size
+        self._overlay: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[int, bytes]:
+        if isinstance(key, slice):
+            return self._unpack(*key.indices(self._size))
+        code: Optional[int] = self._overlay.get(key)
+        if code is not None:
+            return code
+        return BLOCKED if self._bits[self._offset + (key >> 3)] >> (key & 7) & 1 else EMPTY
+
+    def __setitem__(self, index: int, code: int) -> None:
+        self._overlay[index] = code
+
+    # the cell codes of a range of cells (a step other than 1 is not needed by Maze)
+    def _unpack(self, start: int, stop: int, step: int) -> bytes:
+        if step != 1:
+            raise ValueError("PackedGrid only supports contiguous slices")
+        if start >= stop:
+            return b''
+        first: int = start >> 3
+        data = self._bits[self._offset + first:self._offset + ((stop + 7) >> 3)]
+        codes: bytearray = bytearray(b''.join([_UNPACK[value] for value in data])[start - (first << 3):stop - (first << 3)])
+        for index, code in self._overlay.items():
+            if start <= index < stop:
+                codes[index - start] = code
+        return bytes(codes)
+
+    def translate(self, table: bytes) -> bytes:
+        return self[0:self._size].translate(table)
+
+
+def save_maze(maze: Maze, path: str) -> None:
+    size: int = maze.num_cells
+    mask: bytes = maze._grid[0:size].translate(_TO_DIGITS)
+    # bit i of the integer is cell i, and little-endian bytes put cell 8k in the lowest bit of byte k
+    body: bytes = int(mask[::-1], 2).to_bytes((size + 7) // 8, 'little') if size else b''
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, maze._rows, maze._columns, maze._start.row, maze._start.column, maze._goal.row, maze._goal.column))
+        f.write(body)
+
+
+def _read_header(data: Union[mmap.mmap, bytes], path: str) -> tuple:
+    magic, version, rows, columns, start_row, start_column, goal_row, goal_column = _HEADER.unpack(data[:_HEADER.size])
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a maze file")
+    return rows, columns, MazeLocation(start_row, start_column), MazeLocation(goal_row, goal_column)
+
+
+# Open a saved maze without reading it: the grid is a view of the memory-mapped file,
+# so opening costs the same for any map size and searches only touch the pages they visit
+def open_maze(path: str) -> Maze:
+    with open(path, 'rb') as f:
+        mapped: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    rows, columns, start, goal = _read_header(mapped, path)
+    return Maze.from_grid(PackedGrid(mapped, _HEADER.size, rows * columns), rows, columns, start, goal)
+
+
+# Read a saved maze fully into an ordinary in-memory grid
+# slower to open than open_maze, but every cell lookup afterwards is a plain bytearray access
+def load_maze(path: str) -> Maze:
+    with open(path, 'rb') as f:
+        data: bytes = f.read()
+    rows, columns, start, goal = _read_header(data, path)
+    grid: bytearray = bytearray(PackedGrid(data, _HEADER.size, rows * columns)[0:rows * columns])
+    return Maze.from_grid(grid, rows, columns, start, goal)
+
+
+# paths are stored as flat (row, column) pairs next to the map
+def save_path(maze_path: str, path: List[MazeLocation]) -> None:
+    coordinates: array = array('i')
+    for location in path:
+        coordinates.extend(location)
+    with open(maze_path + '.path', 'wb') as f:
+        f.write(_PATH_HEADER.pack(_PATH_MAGIC, len(path)))
+        write_array(f, coordinates)
+
+
+def load_path(maze_path: str) -> List[MazeLocation]:
+    with open(maze_path + '.path', 'rb') as f:
+        magic, length = _PATH_HEADER.unpack(f.read(_PATH_HEADER.size))
+        if magic != _PATH_MAGIC:
+            raise ValueError(f"{maze_path}.path is not a path file")
+        coordinates: array = read_array(f, 'i', 2 * length)
+    return [MazeLocation(coordinates[i], coordinates[i + 1]) for i in range(0, len(coordinates), 2)]
+
+
+# distance fields are stored as their distance array followed by their next-hop bytes
+def save_distance_field(maze_path: str, field: DistanceField) -> None:
+    with open(maze_path + '.dist', 'wb') as f:
+        f.write(_FIELD_HEADER.pack(_FIELD_MAGIC, field._rows, field._columns))
+        write_array(f, array('i', field.distances))
+        f.write(field.next_hops)
+
+
+# like open_maze, the field is used straight from the memory-mapped file
+# (distances are stored little-endian, so a big-endian machine reads a swapped copy of them instead)
+def open_distance_field(maze_path: str) -> DistanceField:
+    with open(maze_path + '.dist', 'rb') as f:
+        mapped: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, rows, columns = _FIELD_HEADER.unpack(mapped[:_FIELD_HEADER.size])
+    if magic != _FIELD_MAGIC:
+        raise ValueError(f"{maze_path}.dist is not a distance field file")
+    view: memoryview = memoryview(mapped)
+    size: int = rows * columns
+    start: int = _FIELD_HEADER.size
+    distances: Union[memoryview, array] = view[start:start + 4 * size].cast('i')
+    if sys.byteorder == 'big':
+        distances = array('i', distances)
+        distances.byteswap()
+    next_hops: memoryview = view[start + 4 * size:start + 5 * size]
+    return DistanceField.from_arrays(rows, columns, distances, next_hops)
+
+
+if __name__ == '__main__':
+    m = Maze(1000, 1000, 0.2, MazeLocation(0, 0), MazeLocation(999, 999))
+    file_name: str = 'maze_example.maze'
+
+    stime1 = timer()
+    save_maze(m, file_name)
+    etime1 = timer()
+    print(f'saved {os.path.getsize(file_name)} bytes in: {etime1 - stime1}')
+
+    stime2 = timer()
+    opened: Maze = open_maze(file_name)
+    etime2 = timer()
+    print(f'opened in: {etime2 - stime2}')
+
+    small: Maze = Maze(10, 10, 0.2)
+    save_maze(small, file_name)
+    opened = open_maze(file_name)
+    solution = bfs(opened._start, opened.goal_test, opened.successors)
+    if solution is None:
+        print("No solution found using breadth-first search!")
+    else:
+        path: List[MazeLocation] = node_to_path(solution)
+        save_path(file_name, path)
+        opened.mark(load_path(file_name))
+        print(opened)
+        os.remove(file_name + '.path')
+    os.remove(file_name)
@@ -0,0 +1,149 @@
+from typing import List, Dict, Optional, NamedTuple, Iterator, Sequence, BinaryIO, TextIO
+import os
+import struct
+import sys
+import zlib
+from generic_search import bfs, node_to_path
+from graphs.maze import Maze, MazeLocation, BLOCKED, START, GOAL, PATH, row_to_text
+from timeit import default_timer as timer
+
+
+# The part of a maze to draw: rows row..end_row - 1 and columns column..end_column - 1
+class Window(NamedTuple):
+    row: int
+    column: int
+    end_row: int
+    end_column: int
+
+
+def full_window(maze: Maze) -> Window:
+    return Window(0, 0, maze.rows, maze.columns)
+
+
+# the smallest window holding every cell of path, with margin cells to spare on every side
+# (the whole maze for an empty path)
+def path_window(maze: Maze, path: Sequence[MazeLocation], margin: int = 5) -> Window:
+    if not path:
+        return full_window(maze)
+    rows: List[int] = [location.row for location in path]
+    columns: List[int] = [location.column for location in path]
+    return Window(max(min(rows) - margin, 0), max(min(columns) - margin, 0),
+                  min(max(rows) + margin + 1, maze.rows), min(max(columns) + margin + 1, maze.columns))
+
+
+# the cell codes of every row of the window, one row at a time
+# a path given here is drawn over the grid without marking it in the maze itself
+def _rows(maze: Maze, window: Window, path: Optional[Sequence[MazeLocation]]) -> Iterator[bytearray]:
+    on_path: Dict[int, List[int]] = {}
+    if path is not None:
+        for location in path:
+            if window.column <= location.column < window.end_column:
+                on_path.setdefault(location.row, []).append(location.column - window.column)
+    for r in range(window.row, window.end_row):
+        codes: bytearray = maze.row_codes(r, window.column, window.end_column)
+        for c in on_path.get(r, ()):
+            if codes[c] != START and codes[c] != GOAL:
+                codes[c] = PATH
+        yield codes
+
+
+# Write the maze as text, in the same format as repr(maze), one row at a time
+# nothing but the current row is ever held in memory, so huge mazes can be logged straight to a file
+def render_text(maze: Maze, out: TextIO, window: Optional[Window] = None, path: Optional[Sequence[MazeLocation]] = None) -> None:
+    if window is None:
+        window = full_window(maze)
+    for codes in _rows(maze, window, path):
+        out.write(row_to_text(codes) + "\n")
+
+
+# Write the walls of the maze as a binary PBM (P4) image: one bit per pixel, black for blocked cells
+# every cell becomes a scale x scale square
+def render_pbm(maze: Maze, out: BinaryIO, window: Optional[Window] = None, scale: int = 1) -> None:
+    if window is None:
+        window = full_window(maze)
+    width: int = (window.end_column - window.column) * scale
+    out.write(f"P4\n{width} {(window.end_row - window.row) * scale}\n".encode('ascii'))
+    digits: bytes = bytes(ord('1') if code == BLOCKED else ord('0') for code in range(256))
+    padding: int = -width % 8
+    for codes in _rows(maze, window, None):
+        bits: bytes = codes.translate(digits)
+        if scale > 1:
+            bits = bits.replace(b'0', b'0' * scale).replace(b'1', b'1' * scale)
+        # pbm rows are packed most significant bit first and padded to whole bytes
+        line: bytes = int(bits + b'0' * padding, 2).to_bytes((width + padding) // 8, 'big') if width else b''
+        for _ in range(scale):
+            out.write(line)
+
+
+# colours of the png palette, indexed by cell code
+PALETTE: List[bytes] = [
+    b'\xff\xff\xff',  # empty
+    b'\x00\x00\x00',  # blocked
+    b'\x00\xa0\x00',  # start
+    b'\xd0\x00\x00',  # goal
+    b'\x30\x60\xff',  # path
+]
+
+
+def _png_chunk(out: BinaryIO, kind: bytes, data: bytes) -> None:
+    out.write(struct.pack('>I', len(data)))
+    out.write(kind)
+    out.write(data)
+    out.write(struct.pack('>I', zlib.crc32(kind + data)))
+
+
+# Write the maze as a palette PNG, compressed and written out as it is drawn
+# start, goal and path cells (both marked ones and a path given here) get their own colours
+def render_png(maze: Maze, out: BinaryIO, window: Optional[Window] = None, path: Optional[Sequence[MazeLocation]] = None, scale: int = 1) -> None:
+    if window is None:
+        window = full_window(maze)
+    width: int = (window.end_column - window.column) * scale
+    height: int = (window.end_row - window.row) * scale
+    out.write(b'\x89PNG\r\n\x1a\n')
+    # 8 bit palette image, no interlacing
+    _png_chunk(out, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0))
+    _png_chunk(out, b'PLTE', b''.join(PALETTE))
+    compressor = zlib.compressobj(6)
+    pending: List[bytes] = []
+    pending_size: int = 0
+    for codes in _rows(maze, window, path):
+        if scale > 1:
+            codes = bytearray(b''.join(bytes((code,)) * scale for code in codes))
+        # every scanline starts with its filter type, 0 for none
+        line: bytes = compressor.compress((b'\x00' + codes) * scale)
+        if line:
+            pending.append(line)
+            pending_size += len(line)
+        if pending_size >= 1 << 16:
+            _png_chunk(out, b'IDAT', b''.join(pending))
+            pending, pending_size = [], 0
+    pending.append(compressor.flush())
+    _png_chunk(out, b'IDAT', b''.join(pending))
+    _png_chunk(out, b'IEND', b'')
+
+
+if __name__ == '__main__':
+    m = Maze(2000, 2000, 0.2, MazeLocation(0, 0), MazeLocation(1999, 1999))
+
+    with open('maze_example.txt', 'w') as text_file:
+        stime1 = timer()
+        render_text(m, text_file)
+        etime1 = timer()
+    print(f'2000x2000 maze written as text ({os.path.getsize("maze_example.txt")} bytes) in: {etime1 - stime1}')
+    os.remove('maze_example.txt')
+
+    with open('maze_example.png', 'wb') as png_file:
+        stime2 = timer()
+        render_png(m, png_file)
+        etime2 = timer()
+    print(f'2000x2000 maze written as png ({os.path.getsize("maze_example.png")} bytes) in: {etime2 - stime2}')
+    os.remove('maze_example.png')
+
+    # only show the neighbourhood of a path on a small maze
+    small: Maze = Maze(60, 60, 0.2, MazeLocation(20, 20), MazeLocation(30, 35))
+    solution = bfs(small._start, small.goal_test, small.successors)
+    if solution is None:
+        print("No solution found using breadth-first search!")
+    else:
+        path: List[MazeLocation] = node_to_path(solution)
+        render_text(small, sys.stdout, path_window(small, path, 2), path)
@@ -1,56 +1,238 @@
-from __future__ import annotations, with_statement
-from typing import List, Optional
-from generic_search import bfs, Node, node_to_path
+from __future__ import annotations
+from typing import List, Dict, Optional, Iterator, Tuple
+from array import array
+from functools import lru_cache
+from generic_search import bfs_compact, node_to_path
+from timeit import default_timer as timer
 
 MAX_NUM: int = 3
+BOAT_CAPACITY: int = 2
+
+
+# The missionaries and cannibals puzzle for n of each and a boat holding capacity people
+# a state (missionaries on the west bank, cannibals on the west bank, boat on the west bank)
+# is packed into the single integer ((wm * (n + 1)) + wc) * 2 + boat,
+# and the legal moves out of every state are worked out once per (n, capacity) and kept in tables
+#
+# a bank is safe when its missionaries (if any) are not outnumbered, so a legal state has
+# wm == 0, wm == n or wm == wc; there are only about 3n of them, whatever the boat capacity
+class MCPuzzle:
+    def __init__(self, n: int = MAX_NUM, capacity: int = BOAT_CAPACITY) -> None:
+        self.n: int = n
+        self.capacity: int = capacity
+        self.start: int = self.pack(n, n, True)
+        self.goal: int = self.pack(0, 0, False)
+        # the legal states in increasing order, and the position of each in that list;
+        # searches index their arrays by position, so they only ever allocate room for legal states
+        self.states: List[int] = sorted({self.pack(wm, wc, boat) for wc in range(n + 1) for wm in {0, n, wc} for boat in (False, True)})
+        self._positions: Dict[int, int] = {state: position for position, state in enumerate(self.states)}
+        # the successors of the legal state at position p are moves[move_offsets[p]:move_offsets[p + 1]]
+        self.move_offsets: array = array('q', [0]) * (len(self.states) + 1)
+        self.moves: array = array('q')
+        for position, state in enumerate(self.states):
+            self.moves.extend(self._legal_moves(*self.unpack(state)))
+            self.move_offsets[position + 1] = len(self.moves)
+
+    @property
+    def num_states(self) -> int:
+        return len(self.states)
+
+    def pack(self, wm: int, wc: int, boat: bool) -> int:
+        return (wm * (self.n + 1) + wc) * 2 + boat
+
+    def unpack(self, state: int) -> Tuple[int, int, bool]:
+        wm, wc = divmod(state >> 1, self.n + 1)
+        return wm, wc, bool(state & 1)
+
+    def is_legal(self, state: int) -> bool:
+        return state in self._positions
+
+    def position(self, state: int) -> int:
+        return self._positions[state]
+
+    # every legal state one crossing away
+    # only three numbers of missionaries can make the new state legal (leaving wm at 0, at n, or equal
+    # to the cannibals), so each number of cannibals in the boat needs just those three checks
+    def _legal_moves(self, wm: int, wc: int, boat: bool) -> List[int]:
+        n: int = self.n
+        # the boat carries people away from its own bank
+        sign: int = -1 if boat else 1
+        missionaries: int = wm if boat else n - wm
+        cannibals: int = wc if boat else n - wc
+        targets: List[int] = []
+        for dc in range(min(cannibals, self.capacity) + 1):
+            new_wc: int = wc + sign * dc
+            for new_wm in sorted({0, n, new_wc}):
+                dm: int = (new_wm - wm) * sign
+                if 0 <= dm <= missionaries and 1 <= dm + dc <= self.capacity:
+                    targets.append(self.pack(new_wm, new_wc, not boat))
+        return targets
+
+    def successors(self, state: int) -> List[int]:
+        position: int = self._positions[state]
+        return self.moves[self.move_offsets[position]:self.move_offsets[position + 1]].tolist()
+
+    def goal_test(self, state: int) -> bool:
+        return state == self.goal
+
+    # one shortest solution as packed states, or None if the puzzle cannot be solved
+    def solve(self) -> Optional[List[int]]:
+        solution = bfs_compact(self.start, self.goal_test, self.successors, self._positions.__getitem__, self.states.__getitem__, self.num_states)
+        if solution is None:
+            return None
+        return node_to_path(solution)
+
+    # the distance (in crossings) of every legal state from source, by position, -1 where it cannot be reached
+    def distances(self, source: Optional[int] = None) -> array:
+        positions: Dict[int, int] = self._positions
+        distances: array = array('i', [-1]) * self.num_states
+        distances[positions[self.start if source is None else source]] = 0
+        frontier: List[int] = [positions[self.start if source is None else source]]
+        level: int = 0
+        while frontier:
+            level += 1
+            next_frontier: List[int] = []
+            for position in frontier:
+                for child in self.moves[self.move_offsets[position]:self.move_offsets[position + 1]]:
+                    child_position: int = positions[child]
+                    if distances[child_position] < 0:
+                        distances[child_position] = level
+                        next_frontier.append(child_position)
+            frontier = next_frontier
+        return distances
+
+    # every shortest solution, enumerated from the layered graph of the whole state space
+    # a move lies on some shortest solution if it goes one layer further from the start
+    # and the goal can still be reached in the remaining number of crossings
+    def all_shortest_solutions(self) -> Iterator[List[int]]:
+        positions: Dict[int, int] = self._positions
+        distances: array = self.distances()
+        length: int = distances[positions[self.goal]]
+        if length < 0:
+            return
+        # moves are reversible, so distances to the goal are distances from it
+        to_goal: array = self.distances(self.goal)
+        # depth first over the moves that stay on shortest solutions, with an explicit stack
+        # (solutions of big puzzles are far longer than the recursion limit)
+        path: List[int] = [self.start]
+        stack: List[Iterator[int]] = [iter(self.successors(self.start))]
+        while stack:
+            child: Optional[int] = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                path.pop()
+                continue
+            position: int = positions[path[-1]]
+            child_position: int = positions[child]
+            if distances[child_position] != distances[position] + 1 or to_goal[child_position] != length - distances[child_position]:
+                continue
+            path.append(child)
+            if child == self.goal:
+                yield list(path)
+                path.pop()
+            else:
+                stack.append(iter(self.successors(child)))
+
+    # number of shortest solutions, counted layer by layer without listing them
+    def count_shortest_solutions(self) -> int:
+        positions: Dict[int, int] = self._positions
+        distances: array = self.distances()
+        if distances[positions[self.goal]] < 0:
+            return 0
+        counts: List[int] = [0] * self.num_states
+        counts[positions[self.start]] = 1
+        for position in sorted((p for p in range(self.num_states) if distances[p] >= 0), key=distances.__getitem__):
+            for child in self.moves[self.move_offsets[position]:self.move_offsets[position + 1]]:
+                child_position: int = positions[child]
+                if distances[child_position] == distances[position] + 1:
+                    counts[child_position] += counts[position]
+        return counts[positions[self.goal]]
+
+
+# the tables are built once for every (n, capacity) pair
+@lru_cache(maxsize=None)
+def puzzle(n: int = MAX_NUM, capacity: int = BOAT_CAPACITY) -> MCPuzzle:
+    return MCPuzzle(n, capacity)
+
 
 class MCState:
-    def __init__(self, missionaries: int, cannibals: int, boat: bool) -> None:
+    __slots__ = ('wm', 'wc', 'em', 'ec', 'boat', 'n', 'capacity')
+
+    def __init__(self, missionaries: int, cannibals: int, boat: bool, n: int = MAX_NUM, capacity: int = BOAT_CAPACITY) -> None:
         self.wm: int = missionaries
         self.wc: int = cannibals
-        self.em: int = MAX_NUM - self.wm
-        self.ec: int = MAX_NUM - self.wc
+        self.em: int = n - self.wm
+        self.ec: int = n - self.wc
         self.boat: bool = boat
-    
+        self.n: int = n
+        self.capacity: int = capacity
+
+    @classmethod
+    def unpack(cls, state: int, n: int = MAX_NUM, capacity: int = BOAT_CAPACITY) -> MCState:
+        return cls(*puzzle(n, capacity).unpack(state), n, capacity)
+
+    def pack(self) -> int:
+        return puzzle(self.n, self.capacity).pack(self.wm, self.wc, self.boat)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MCState):
+            return NotImplemented
+        return (self.wm, self.wc, self.boat, self.n, self.capacity) == (other.wm, other.wc, other.boat, other.n, other.capacity)
+
+    def __hash__(self) -> int:
+        return hash((self.wm, self.wc, self.boat, self.n, self.capacity))
+
     def __str__(self) -> str:
         return ("On the west bank there are {} missionaries and {} cannibals.\n"
         "On the east bank there are {} missionaries and {} cannibals.\n"
         "The boat is on the {} bank.")\
-            .format(self.wm, self.wc, self.em, self.ec)
+            .format(self.wm, self.wc, self.em, self.ec, "west" if self.boat else "east")
 
     @property
     def is_legal(self) -> bool:
         if self.wm < self.wc and self.wm > 0:
             return False
-        if self.em < self.ec and self.ec > 0:
+        if self.em < self.ec and self.em > 0:
             return False
         return True
-    
+
     def goal_test(self) -> bool:
-        return self.is_legal and self.em == MAX_NUM and self.ec == MAX_NUM
-    
+        return self.is_legal and self.em == self.n and self.ec == self.n
+
     def successors(self) -> List[MCState]:
-        sucs: List[MCState] = []
-        if self.boat:
-            if self.wm > 1:
-                sucs.append(MCState(self.wm - 2, self.wc, not self.boat))
-            if self.wm > 0:
-                sucs.append(MCState(self.wm -1, self.wc, not self.boat))
-            if self.wc > 1:
-                sucs.append(MCState(self.wm, self.wc - 2, not self.boat))
-            if self.wc > 0:
-                sucs.append(MCState(self.wm, self.wc - 1, not self.boat))
-            if (self.wc > 0) and (self.em > 0):
-                sucs.append(MCState(self.wm - 1, self.wc - 1, not self.boat))
+        return [MCState.unpack(state, self.n, self.capacity) for state in puzzle(self.n, self.capacity).successors(self.pack())]
+
+
+def display_solution(path: List[MCState]) -> None:
+    if len(path) == 0:
+        return
+    old_state: MCState = path[0]
+    print(old_state)
+    for current_state in path[1:]:
+        if current_state.boat:
+            print("{} missionaries and {} cannibals moved from the east bank to the west bank.\n"
+                  .format(old_state.em - current_state.em, old_state.ec - current_state.ec))
         else:
-            if self.em > 1:
-                sucs.append(MCState(self.wm + 2, self.wc, not self.boat))
-            if self.em > 0:
-                sucs.append(MCState(self.wm + 1, self.wc, not self.boat))
-            if self.ec > 1:
-                sucs.append(MCState(self.wm, self.wc + 2, not self.boat))
-            if self.ec > 0:
-                sucs.append(MCState(self.wm, self.wc + 1, not self.boat))
-            if (self.em > 0) and (self.ec > 0):
-                sucs.append(MCState(self.wm + 1, self.wc + 1, not self.boat))
-        return [x for x in sucs if x.is_legal]
\ No newline at end of file
+            print("{} missionaries and {} cannibals moved from the west bank to the east bank.\n"
+                  .format(old_state.wm - current_state.wm, old_state.wc - current_state.wc))
+        print(current_state)
+        old_state = current_state
+
+
+if __name__ == '__main__':
+    classic: MCPuzzle = puzzle(3, 2)
+    solution: Optional[List[int]] = classic.solve()
+    if solution is None:
+        print("No solution found!")
+    else:
+        display_solution([MCState.unpack(state) for state in solution])
+    print(f'shortest solutions of the classic puzzle: {classic.count_shortest_solutions()}')
+
+    stime = timer()
+    large: MCPuzzle = puzzle(5000, 4)
+    etime1 = timer()
+    large_solution: Optional[List[int]] = large.solve()
+    etime2 = timer()
+    print(f'5000 of each with a boat for 4: tables built in {etime1 - stime}, '
+          f'solved in {len(large_solution) - 1 if large_solution else None} crossings in {etime2 - etime1}, '
+          f'{large.count_shortest_solutions()} shortest solutions')
@@ -0,0 +1,155 @@
+from typing import List, Dict, Callable, Optional, Any, Tuple
+from statistics import median
+from timeit import default_timer as timer
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+from generic_search import dfs, bfs, astar, node_to_path, Node, SearchStats
+from graphs.maze import Maze, MazeLocation, euclidian_distance, manhattan_distance
+
+# Reproducible benchmark of dfs, bfs and astar (with both maze heuristics) on generated mazes
+# every (size, sparseness) pair gets its own maze, seeded from --seed, so two runs with the same
+# arguments search exactly the same mazes
+# results are written as JSON, and a previous results file can be given with --compare
+# to flag algorithms that got slower (or changed their answers) since then
+#
+# run from the repository root, e.g.
+#   python -m graphs.search_benchmark --sizes 100 400 --output new.json --compare old.json
+# without --sizes the whole grid from 100x100 to 4000x4000 is run (which takes a while);
+# --quick only runs the small sizes, for checking a change before the full run
+
+SIZES: List[int] = [100, 500, 1000, 2000, 4000]
+QUICK_SIZES: List[int] = [100, 200, 400]
+
+Search = Callable[[Maze, Optional[SearchStats]], Optional[Node[MazeLocation]]]
+
+ALGORITHMS: Dict[str, Search] = {
+    'dfs': lambda m, stats: dfs(m._start, m.goal_test, m.successors, stats=stats),
+    'bfs': lambda m, stats: bfs(m._start, m.goal_test, m.successors, stats=stats),
+    'astar-euclidian': lambda m, stats: astar(m._start, m.goal_test, m.successors, euclidian_distance(m._goal), stats=stats),
+    'astar-manhattan': lambda m, stats: astar(m._start, m.goal_test, m.successors, manhattan_distance(m._goal), stats=stats),
+}
+
+
+def make_maze(size: int, sparseness: float, seed: int) -> Maze:
+    # string seeds hash the same way in every process; the maze seed is drawn from a private generator
+    # so the global random state is left alone (and the mazes match those the global one used to give)
+    maze_seed: int = random.Random(f'{seed}-{size}-{sparseness}').getrandbits(64)
+    return Maze(size, size, sparseness, MazeLocation(0, 0), MazeLocation(size - 1, size - 1), seed=maze_seed)
+
+
+def run_case(maze: Maze, algorithm: str, repeat: int, memory: bool) -> Dict[str, Any]:
+    search: Search = ALGORITHMS[algorithm]
+    times: List[float] = []
+    solution: Optional[Node[MazeLocation]] = None
+    # the timed runs use the plain search loops; the counters come from one extra instrumented run
+    for _ in range(repeat):
+        start: float = timer()
+        solution = search(maze, None)
+        times.append(timer() - start)
+    stats: SearchStats = SearchStats()
+    search(maze, stats)
+    result: Dict[str, Any] = {
+        'times': times,
+        'best_time': min(times),
+        'median_time': median(times),
+        'expansions': stats.nodes_expanded,
+        'peak_frontier': stats.peak_frontier,
+        'path_length': len(node_to_path(solution)) if solution is not None else None,
+        'peak_memory': None,
+    }
+    # tracing allocations slows the search down a lot, so memory gets its own untimed run
+    if memory:
+        tracemalloc.start()
+        search(maze, None)
+        result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_suite(sizes: List[int], densities: List[float], algorithms: List[str], repeat: int, seed: int, memory: bool) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for size in sizes:
+        for sparseness in densities:
+            maze: Maze = make_maze(size, sparseness, seed)
+            for algorithm in algorithms:
+                case: Dict[str, Any] = {'size': size, 'sparseness': sparseness, 'algorithm': algorithm}
+                case.update(run_case(maze, algorithm, repeat, memory))
+                results.append(case)
+                print(f'{size}x{size} sparseness {sparseness} {algorithm}: {case["median_time"]:.4f}s', file=sys.stderr)
+    return {
+        'seed': seed,
+        'repeat': repeat,
+        'python': sys.version.split()[0],
+        'results': results,
+    }
+
+
+def _key(case: Dict[str, Any]) -> Tuple[int, float, str]:
+    return case['size'], case['sparseness'], case['algorithm']
+
+
+def summary_table(run: Dict[str, Any]) -> str:
+    lines: List[str] = [f'{"size":>6} {"sparse":>6} {"algorithm":<16} {"median s":>10} {"expanded":>10} {"path":>6} {"peak KiB":>10}']
+    for case in run['results']:
+        path: str = str(case['path_length']) if case['path_length'] is not None else '-'
+        memory: str = f'{case["peak_memory"] / 1024:.0f}' if case['peak_memory'] is not None else '-'
+        lines.append(f'{case["size"]:>6} {case["sparseness"]:>6} {case["algorithm"]:<16} {case["median_time"]:>10.4f} {case["expansions"]:>10} {path:>6} {memory:>10}')
+    return '\n'.join(lines)
+
+
+# compare against an earlier run; returns the report and the number of regressions found
+# a case regresses if its median time grew by more than threshold (as a fraction),
+# or if it now expands a different number of nodes or finds a different path length
+def compare(run: Dict[str, Any], previous: Dict[str, Any], threshold: float) -> Tuple[str, int]:
+    old_cases: Dict[Tuple[int, float, str], Dict[str, Any]] = {_key(case): case for case in previous['results']}
+    lines: List[str] = []
+    regressions: int = 0
+    for case in run['results']:
+        old: Optional[Dict[str, Any]] = old_cases.get(_key(case))
+        if old is None:
+            continue
+        ratio: float = case['median_time'] / old['median_time'] if old['median_time'] > 0 else 1.0
+        notes: List[str] = []
+        if ratio > 1 + threshold:
+            notes.append('SLOWER')
+        if case['expansions'] != old['expansions']:
+            notes.append(f'expansions {old["expansions"]} -> {case["expansions"]}')
+        if case['path_length'] != old['path_length']:
+            notes.append(f'path length {old["path_length"]} -> {case["path_length"]}')
+        if notes:
+            regressions += 1
+        lines.append(f'{case["size"]:>6} {case["sparseness"]:>6} {case["algorithm"]:<16} x{ratio:.2f} {" ".join(notes)}')
+    return '\n'.join(lines), regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark dfs, bfs and astar on generated mazes')
+    parser.add_argument('--sizes', type=int, nargs='+', help=f'maze sizes to run (default {SIZES})')
+    parser.add_argument('--quick', action='store_true', help=f'run sizes {QUICK_SIZES} unless --sizes is given')
+    parser.add_argument('--sparseness', type=float, nargs='+', default=[0.1, 0.2, 0.3])
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memory', action='store_true', help='also measure peak memory with tracemalloc')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON file of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown before a case counts as a regression')
+    args = parser.parse_args()
+
+    sizes: List[int] = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    run: Dict[str, Any] = run_suite(sizes, args.sparseness, args.algorithms, args.repeat, args.seed, args.memory)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+    print(summary_table(run))
+    if args.compare:
+        with open(args.compare) as f:
+            previous: Dict[str, Any] = json.load(f)
+        report, regressions = compare(run, previous, args.threshold)
+        print()
+        print(report)
+        print(f'{regressions} regression(s)')
+        sys.exit(1 if regressions else 0)
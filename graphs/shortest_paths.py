@@ -0,0 +1,267 @@
+from typing import List, NamedTuple, Optional
+from array import array
+from heapq import heappush, heappop
+import random
+from generic_search import dijkstra as generic_dijkstra, index_typecode
+from graphs.graph import Graph
+from graphs.union_find import UnionFind
+from timeit import default_timer as timer
+
+INFINITY: float = float('inf')
+
+
+# Result of a single source search: distances[v] is the length of the shortest path from source to v
+# (infinity if v cannot be reached) and predecessors[v] the vertex before v on that path (-1 for none)
+# both are flat arrays indexed like the graph's vertices, instead of a chain of Node objects
+class ShortestPaths(NamedTuple):
+    source: int
+    distances: array
+    predecessors: array
+
+    def distance(self, target: int) -> float:
+        return self.distances[target]
+
+    # vertex indices from source to target, or None if target cannot be reached
+    def path_to(self, target: int) -> Optional[List[int]]:
+        if self.distances[target] == INFINITY:
+            return None
+        path: List[int] = [target]
+        while target != self.source:
+            target = self.predecessors[target]
+            path.append(target)
+        path.reverse()
+        return path
+
+
+# A minimum spanning tree (a forest if the graph is not connected) as parallel arrays of its edges
+class SpanningForest(NamedTuple):
+    sources: array
+    targets: array
+    weights: array
+    total_weight: float
+
+
+def _empty_result(graph: Graph, source: int) -> ShortestPaths:
+    n: int = graph.vertex_count
+    distances: array = array('d', [INFINITY]) * n
+    distances[source] = 0.0
+    return ShortestPaths(source, distances, array(index_typecode(n), [-1]) * n)
+
+
+def _edge_weights(graph: Graph) -> array:
+    if graph.weights is not None:
+        return graph.weights
+    return array('d', [1.0]) * len(graph.neighbours)
+
+
+def _check_non_negative(weights: array) -> None:
+    if len(weights) and min(weights) < 0:
+        raise ValueError("dijkstra's algorithm needs non-negative edge weights")
+
+
+# Dijkstra's algorithm with a binary heap (heapq), skipping stale heap entries instead of decreasing keys
+# with a target, the search stops as soon as the target's distance is final;
+# distances of vertices that were not finished by then are only upper bounds
+def dijkstra(graph: Graph, source: int, target: Optional[int] = None) -> ShortestPaths:
+    result: ShortestPaths = _empty_result(graph, source)
+    distances: array = result.distances
+    predecessors: array = result.predecessors
+    offsets: array = graph.offsets
+    neighbours: array = graph.neighbours
+    weights: array = _edge_weights(graph)
+    _check_non_negative(weights)
+    done: bytearray = bytearray(graph.vertex_count)
+    heap: List[tuple] = [(0.0, source)]
+    while heap:
+        d, u = heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        if u == target:
+            break
+        for p in range(offsets[u], offsets[u + 1]):
+            v: int = neighbours[p]
+            candidate: float = d + weights[p]
+            if candidate < distances[v]:
+                distances[v] = candidate
+                predecessors[v] = u
+                heappush(heap, (candidate, v))
+    return result
+
+
+# Dijkstra's algorithm with a radix heap, for non-negative integer edge weights
+# dijkstra only ever pops keys that never decrease, which a radix heap exploits: a key sits in the
+# bucket given by the highest bit in which it differs from the last key popped, so every key moves
+# down through at most log(C) buckets in total instead of paying log(n) comparisons per operation
+def dijkstra_radix(graph: Graph, source: int, target: Optional[int] = None) -> ShortestPaths:
+    result: ShortestPaths = _empty_result(graph, source)
+    distances: array = result.distances
+    predecessors: array = result.predecessors
+    offsets: array = graph.offsets
+    neighbours: array = graph.neighbours
+    weights: array = _edge_weights(graph)
+    _check_non_negative(weights)
+    if any(weight != int(weight) for weight in weights):
+        raise ValueError("the radix heap needs integer edge weights")
+    integer_weights: array = array('q', map(int, weights))
+    done: bytearray = bytearray(graph.vertex_count)
+    buckets: List[List[tuple]] = [[] for _ in range(65)]
+    buckets[0].append((0, source))
+    last: int = 0
+    size: int = 1
+    while size:
+        if not buckets[0]:
+            # refill bucket 0 from the first non-empty bucket, using its smallest key as the new last key
+            i: int = 1
+            while not buckets[i]:
+                i += 1
+            entries: List[tuple] = buckets[i]
+            buckets[i] = []
+            last = min(entries)[0]
+            for entry in entries:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        d, u = buckets[0].pop()
+        size -= 1
+        if done[u]:
+            continue
+        done[u] = 1
+        if u == target:
+            break
+        for p in range(offsets[u], offsets[u + 1]):
+            v: int = neighbours[p]
+            candidate: int = d + integer_weights[p]
+            if candidate < distances[v]:
+                distances[v] = candidate
+                predecessors[v] = u
+                buckets[(candidate ^ last).bit_length()].append((candidate, v))
+                size += 1
+    return result
+
+
+# Bellman-Ford: shortest paths with negative edge weights allowed
+# relaxes every edge until nothing changes (at most vertex_count - 1 rounds);
+# raises ValueError if a negative cycle can be reached from source
+def bellman_ford(graph: Graph, source: int) -> ShortestPaths:
+    result: ShortestPaths = _empty_result(graph, source)
+    distances: array = result.distances
+    predecessors: array = result.predecessors
+    offsets: array = graph.offsets
+    neighbours: array = graph.neighbours
+    weights: array = _edge_weights(graph)
+    n: int = graph.vertex_count
+    for _ in range(n):
+        changed: bool = False
+        for u in range(n):
+            d: float = distances[u]
+            if d == INFINITY:
+                continue
+            for p in range(offsets[u], offsets[u + 1]):
+                v: int = neighbours[p]
+                if d + weights[p] < distances[v]:
+                    distances[v] = d + weights[p]
+                    predecessors[v] = u
+                    changed = True
+        if not changed:
+            return result
+    raise ValueError("graph has a negative cycle reachable from the source")
+
+
+def _check_undirected(graph: Graph) -> None:
+    if graph.directed:
+        raise ValueError("spanning trees are only defined here for undirected graphs")
+
+
+# Prim's algorithm, restarted from every vertex not yet in the forest so that every component gets a tree
+def prim(graph: Graph) -> SpanningForest:
+    _check_undirected(graph)
+    n: int = graph.vertex_count
+    offsets: array = graph.offsets
+    neighbours: array = graph.neighbours
+    weights: array = _edge_weights(graph)
+    index_code: str = index_typecode(n)
+    forest: SpanningForest = SpanningForest(array(index_code), array(index_code), array('d'), 0.0)
+    in_tree: bytearray = bytearray(n)
+    total: float = 0.0
+    for root in range(n):
+        if in_tree[root]:
+            continue
+        heap: List[tuple] = [(0.0, root, -1)]
+        while heap:
+            weight, u, parent = heappop(heap)
+            if in_tree[u]:
+                continue
+            in_tree[u] = 1
+            if parent >= 0:
+                forest.sources.append(parent)
+                forest.targets.append(u)
+                forest.weights.append(weight)
+                total += weight
+            for p in range(offsets[u], offsets[u + 1]):
+                v: int = neighbours[p]
+                if not in_tree[v]:
+                    heappush(heap, (weights[p], v, u))
+    return forest._replace(total_weight=total)
+
+
+# Kruskal's algorithm: the edges in order of weight, keeping those that join two different trees
+def kruskal(graph: Graph) -> SpanningForest:
+    _check_undirected(graph)
+    n: int = graph.vertex_count
+    offsets: array = graph.offsets
+    neighbours: array = graph.neighbours
+    weights: array = _edge_weights(graph)
+    index_code: str = index_typecode(n)
+    # every undirected edge is stored from both ends; keep the copy stored at its lower end
+    owners: array = array(index_code, [0]) * len(neighbours)
+    for u in range(n):
+        for p in range(offsets[u], offsets[u + 1]):
+            owners[p] = u
+    edges: List[int] = [p for p in range(len(neighbours)) if owners[p] < neighbours[p]]
+    edges.sort(key=weights.__getitem__)
+
+    components: UnionFind = UnionFind(n)
+    forest: SpanningForest = SpanningForest(array(index_code), array(index_code), array('d'), 0.0)
+    total: float = 0.0
+    for p in edges:
+        u: int = owners[p]
+        v: int = neighbours[p]
+        if components.union(u, v):
+            forest.sources.append(u)
+            forest.targets.append(v)
+            forest.weights.append(weights[p])
+            total += weights[p]
+            if len(forest.sources) == n - 1:
+                break
+    return forest._replace(total_weight=total)
+
+
+if __name__ == '__main__':
+    n: int = 20000
+    m: int = 100000
+    g: Graph[int] = Graph.from_edges(n, [random.randrange(n) for _ in range(m)], [random.randrange(n) for _ in range(m)], [random.randint(1, 100) for _ in range(m)])
+
+    stime1 = timer()
+    paths: ShortestPaths = dijkstra(g, 0)
+    etime1 = timer()
+    print(f'dijkstra (binary heap) from vertex 0: {etime1 - stime1}')
+    stime2 = timer()
+    radix_paths: ShortestPaths = dijkstra_radix(g, 0)
+    etime2 = timer()
+    print(f'dijkstra (radix heap) from vertex 0: {etime2 - stime2}, same distances: {paths.distances == radix_paths.distances}')
+    stime3 = timer()
+    solution = generic_dijkstra(0, lambda v: v == n - 1, g.weighted_successors)
+    etime3 = timer()
+    stime4 = timer()
+    target_paths: ShortestPaths = dijkstra(g, 0, n - 1)
+    etime4 = timer()
+    print(f'generic dijkstra to vertex {n - 1}: {etime3 - stime3}, with the index based one: {etime4 - stime4}')
+    if solution is not None:
+        print(f'same distance: {solution.cost == target_paths.distance(n - 1)}, path: {target_paths.path_to(n - 1)}')
+
+    stime5 = timer()
+    tree: SpanningForest = prim(g)
+    etime5 = timer()
+    stime6 = timer()
+    other_tree: SpanningForest = kruskal(g)
+    etime6 = timer()
+    print(f'prim: weight {tree.total_weight} in: {etime5 - stime5}, kruskal: weight {other_tree.total_weight} in: {etime6 - stime6}')
@@ -0,0 +1,74 @@
+from typing import Dict
+from array import array
+from collections import Counter
+import random
+from generic_search import index_typecode
+from graphs.graph import Graph
+from timeit import default_timer as timer
+
+
+# Disjoint sets over the integers 0..n - 1, stored in two flat arrays
+# union by rank keeps the trees shallow and find compresses the paths it walks (by halving),
+# so every operation takes nearly constant amortised time
+class UnionFind:
+    def __init__(self, n: int) -> None:
+        self._parents: array = array(index_typecode(n), range(n))
+        self._ranks: bytearray = bytearray(n)
+        # number of disjoint sets
+        self.count: int = n
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def find(self, x: int) -> int:
+        parents: array = self._parents
+        while parents[x] != x:
+            parents[x] = parents[parents[x]]
+            x = parents[x]
+        return x
+
+    # join the sets of a and b; returns False if they were already the same set
+    def union(self, a: int, b: int) -> bool:
+        root_a: int = self.find(a)
+        root_b: int = self.find(b)
+        if root_a == root_b:
+            return False
+        ranks: bytearray = self._ranks
+        if ranks[root_a] < ranks[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parents[root_b] = root_a
+        if ranks[root_a] == ranks[root_b]:
+            ranks[root_a] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    # the root of every element's set, in one flat array
+    def labels(self) -> array:
+        return array(self._parents.typecode, (self.find(x) for x in range(len(self._parents))))
+
+
+# connected components of a graph (weakly connected for directed graphs)
+def graph_components(graph: Graph) -> UnionFind:
+    components: UnionFind = UnionFind(graph.vertex_count)
+    offsets = graph.offsets
+    neighbours = graph.neighbours
+    for u in range(graph.vertex_count):
+        for v in neighbours[offsets[u]:offsets[u + 1]]:
+            components.union(u, v)
+    return components
+
+
+if __name__ == '__main__':
+    n: int = 200000
+    m: int = 150000
+    g: Graph[int] = Graph.from_edges(n, [random.randrange(n) for _ in range(m)], [random.randrange(n) for _ in range(m)])
+
+    stime1 = timer()
+    components: UnionFind = graph_components(g)
+    etime1 = timer()
+    print(f'{components.count} components found in: {etime1 - stime1}')
+    sizes: Dict[int, int] = Counter(components.labels())
+    print(f'largest component: {max(sizes.values())} vertices, isolated vertices: {sum(1 for size in sizes.values() if size == 1)}')
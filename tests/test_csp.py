@@ -0,0 +1,103 @@
+import itertools
+import random
+from typing import Dict, List
+import pytest
+from csp import CSP, Constraint, CSPStats, INFERENCES, VARIABLE_ORDERS, VALUE_ORDERS
+from constraint_satisfaction.map_coloring import MapColoringConstraint, grid_map
+
+MODES = list(itertools.product(INFERENCES, VARIABLE_ORDERS, VALUE_ORDERS))
+
+
+# the variables add up to total, and to no more than total while some are unassigned
+class SumConstraint(Constraint[str, int]):
+    def __init__(self, variables: List[str], total: int) -> None:
+        super().__init__(variables)
+        self.total: int = total
+
+    def satisfied(self, assignment: Dict[str, int]) -> bool:
+        if any(variable not in assignment for variable in self.variables):
+            return sum(assignment.get(variable, 0) for variable in self.variables) <= self.total
+        return sum(assignment[variable] for variable in self.variables) == self.total
+
+
+def random_problem(seed: int):
+    rng = random.Random(seed)
+    variables = [f'x{i}' for i in range(rng.randint(1, 7))]
+    domains = {variable: rng.sample(range(4), rng.randint(1, 4)) for variable in variables}
+    constraints: List[Constraint[str, int]] = []
+    if len(variables) > 1:
+        for _ in range(rng.randint(0, 10)):
+            constraints.append(MapColoringConstraint(*rng.sample(variables, 2)))
+    if len(variables) >= 3 and rng.random() < 0.5:
+        constraints.append(SumConstraint(rng.sample(variables, 3), rng.randint(0, 9)))
+    return variables, domains, constraints
+
+
+def solvable(variables, domains, constraints) -> bool:
+    for values in itertools.product(*(domains[variable] for variable in variables)):
+        assignment = dict(zip(variables, values))
+        if all(constraint.satisfied(assignment) for constraint in constraints):
+            return True
+    return False
+
+
+def build(variables, domains, constraints) -> CSP:
+    csp = CSP(variables, {variable: list(values) for variable, values in domains.items()})
+    for constraint in constraints:
+        csp.add_constraint(constraint)
+    return csp
+
+
+@pytest.mark.parametrize('inference, variable_order, value_order', MODES)
+def test_matches_brute_force(inference, variable_order, value_order):
+    for seed in range(150):
+        variables, domains, constraints = random_problem(seed)
+        csp = build(variables, domains, constraints)
+        stats = CSPStats()
+        solution = csp.backtracking_search(inference=inference, variable_order=variable_order, value_order=value_order, stats=stats)
+        assert (solution is not None) == solvable(variables, domains, constraints), seed
+        if solution is not None:
+            assert set(solution) == set(variables)
+            assert all(solution[variable] in domains[variable] for variable in variables)
+            assert all(constraint.satisfied(solution) for constraint in constraints)
+        # pruning works on copies, never on the problem's own domains
+        assert csp.domains == domains
+        assert (stats.inference, stats.variable_order, stats.value_order) == (inference, variable_order, value_order)
+
+
+@pytest.mark.parametrize('inference, variable_order, value_order', MODES)
+def test_map_colouring(inference, variable_order, value_order):
+    csp = grid_map(4, 4, ['red', 'green', 'blue', 'yellow'])
+    solution = csp.backtracking_search(inference=inference, variable_order=variable_order, value_order=value_order)
+    assert solution is not None
+    assert all(csp.is_consistent(variable, solution) for variable in csp.variables)
+
+
+@pytest.mark.parametrize('inference, variable_order', list(itertools.product(INFERENCES, VARIABLE_ORDERS)))
+def test_large_ring_does_not_recurse(inference, variable_order):
+    # far more variables than the recursion limit allows levels
+    regions = [f'region {i}' for i in range(3001)]
+    csp = CSP(regions, {region: ['red', 'green', 'blue'] for region in regions})
+    for i, region in enumerate(regions):
+        csp.add_constraint(MapColoringConstraint(region, regions[(i + 1) % len(regions)]))
+    solution = csp.backtracking_search(inference=inference, variable_order=variable_order)
+    assert solution is not None
+    assert all(solution[region] != solution[regions[(i + 1) % len(regions)]] for i, region in enumerate(regions))
+
+
+def test_partial_assignment_is_extended_not_changed():
+    variables, domains, constraints = ['a', 'b', 'c'], {'a': [1, 2], 'b': [1, 2], 'c': [1, 2, 3]}, []
+    csp = build(variables, domains, constraints)
+    csp.add_constraint(MapColoringConstraint('a', 'b'))
+    csp.add_constraint(MapColoringConstraint('b', 'c'))
+    given = {'a': 2}
+    solution = csp.backtracking_search(given, inference='mac', variable_order='mrv')
+    assert given == {'a': 2}
+    assert solution is not None and solution['a'] == 2 and solution['b'] == 1
+
+
+def test_unknown_strategy_is_rejected():
+    csp = build(['a'], {'a': [1]}, [])
+    for arguments in ({'inference': 'magic'}, {'variable_order': 'last'}, {'value_order': 'random'}):
+        with pytest.raises(ValueError):
+            csp.backtracking_search(**arguments)
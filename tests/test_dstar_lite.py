@@ -0,0 +1,57 @@
+import random
+from typing import List, Optional, Tuple
+import pytest
+from generic_search import bfs, node_to_path
+from graphs.maze import Maze, MazeLocation, Cell
+from graphs.dstar_lite import DStarLite
+
+
+def check_against_bfs(maze: Maze, planner: DStarLite, start: MazeLocation, goal: MazeLocation) -> Optional[List[MazeLocation]]:
+    path: Optional[List[MazeLocation]] = planner.current_path()
+    solution = bfs(start, lambda ml: ml == goal, maze.successors) if maze.cell(start) != Cell.BLOCKED else None
+    assert (path is None) == (solution is None)
+    if path is not None:
+        assert len(path) == len(node_to_path(solution))
+        assert path[0] == start and path[-1] == goal
+        for a, b in zip(path, path[1:]):
+            assert abs(a.row - b.row) + abs(a.column - b.column) == 1
+            assert maze.cell(b) != Cell.BLOCKED
+    return path
+
+
+# opens a few walls, blocks a few cells and (while there is one) cuts the current path
+def random_changes(maze: Maze, path: Optional[List[MazeLocation]], rng: random.Random) -> List[Tuple[MazeLocation, Cell]]:
+    rows, columns = maze._rows, maze._columns
+    walls: List[MazeLocation] = [MazeLocation(row, column) for row in range(rows) for column in range(columns) if maze.cell(MazeLocation(row, column)) == Cell.BLOCKED]
+    changes = [(wall, Cell.EMPTY) for wall in rng.sample(walls, min(3, len(walls)))]
+    changes += [(MazeLocation(rng.randrange(rows), rng.randrange(columns)), Cell.BLOCKED) for _ in range(2)]
+    if path is not None and len(path) > 2:
+        changes.append((rng.choice(path[1:-1]), Cell.BLOCKED))
+    return changes
+
+
+@pytest.mark.parametrize('rows, columns, sparseness', [(15, 15, 0.25), (20, 8, 0.3), (1, 25, 0.1), (12, 12, 0.45)])
+def test_update_cells_matches_fresh_bfs(rows, columns, sparseness):
+    for seed in range(8):
+        rng = random.Random(seed)
+        start, goal = MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1)
+        maze = Maze(rows, columns, sparseness, start, goal, seed=seed)
+        planner = DStarLite(maze)
+        path = check_against_bfs(maze, planner, start, goal)
+        for _ in range(20):
+            planner.update_cells(random_changes(maze, path, rng))
+            path = check_against_bfs(maze, planner, start, goal)
+
+
+def test_move_to_plans_from_the_new_start():
+    for seed in range(8):
+        rng = random.Random(seed)
+        start, goal = MazeLocation(0, 0), MazeLocation(19, 19)
+        maze = Maze(20, 20, 0.2, start, goal, seed=seed)
+        planner = DStarLite(maze)
+        path = check_against_bfs(maze, planner, start, goal)
+        while path is not None and len(path) > 2:
+            start = path[1]
+            planner.move_to(start)
+            planner.update_cells([change for change in random_changes(maze, path, rng) if change[0] != start])
+            path = check_against_bfs(maze, planner, start, goal)
@@ -0,0 +1,167 @@
+import heapq
+import random
+from typing import Dict, List
+import pytest
+from generic_search import bfs, astar, bfs_iter, astar_iter, run_to_completion, node_to_path, bidirectional_bfs, bidirectional_astar, \
+    weighted_astar, dijkstra, unit_costs, IndexedPriorityQueue
+from graphs.graph import Graph
+from graphs.maze import Maze, MazeLocation, Cell, manhattan_distance
+
+
+@pytest.mark.parametrize('search', [bfs_iter, astar_iter])
+def test_report_every_must_be_positive(search):
+    maze = Maze(10, 10, 0.2, MazeLocation(0, 0), MazeLocation(9, 9), seed=0)
+    with pytest.raises(ValueError):
+        search(maze._start, maze.goal_test, maze.successors, manhattan_distance(maze._goal), report_every=0)
+
+
+def test_anytime_searches_match_plain_ones():
+    for seed in range(10):
+        maze = Maze(25, 25, 0.25, MazeLocation(0, 0), MazeLocation(24, 24), seed=seed)
+        heuristic = manhattan_distance(maze._goal)
+        plain = bfs(maze._start, maze.goal_test, maze.successors)
+        final = run_to_completion(bfs_iter(maze._start, maze.goal_test, maze.successors, report_every=7))
+        assert final.done and (final.solution is None) == (plain is None)
+        plain_astar = astar(maze._start, maze.goal_test, maze.successors, heuristic)
+        final_astar = run_to_completion(astar_iter(maze._start, maze.goal_test, maze.successors, heuristic, report_every=1))
+        assert (final_astar.solution is None) == (plain_astar is None)
+        if plain is not None:
+            assert len(node_to_path(final.solution)) == len(node_to_path(plain)) == len(node_to_path(final_astar.solution))
+
+
+def check_path(path: List, start, goal, successors) -> None:
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:]):
+        assert b in successors(a)
+
+
+# seeded mazes, plus one whose goal is walled in
+def mazes() -> List[Maze]:
+    built: List[Maze] = [Maze(20, 30, 0.25, MazeLocation(0, 0), MazeLocation(19, 29), seed=seed) for seed in range(12)]
+    walled: Maze = Maze(10, 10, 0.0, MazeLocation(0, 0), MazeLocation(9, 9), seed=0)
+    walled.set_cell(MazeLocation(8, 9), Cell.BLOCKED)
+    walled.set_cell(MazeLocation(9, 8), Cell.BLOCKED)
+    return built + [walled]
+
+
+def test_bidirectional_searches_match_bfs_on_mazes():
+    for maze in mazes():
+        start, goal = maze._start, maze._goal
+        plain = bfs(start, maze.goal_test, maze.successors)
+        for solution in (bidirectional_bfs(start, goal, maze.successors, maze.successors),
+                         bidirectional_astar(start, goal, maze.successors, maze.successors, manhattan_distance(goal), manhattan_distance(start))):
+            assert (solution is None) == (plain is None)
+            if solution is not None:
+                path = node_to_path(solution)
+                check_path(path, start, goal, maze.successors)
+                assert len(path) == len(node_to_path(plain))
+        # start == goal is a path of one state
+        assert node_to_path(bidirectional_bfs(start, start, maze.successors, maze.successors)) == [start]
+        assert node_to_path(bidirectional_astar(start, start, maze.successors, maze.successors, manhattan_distance(start), manhattan_distance(start))) == [start]
+
+
+def test_bidirectional_searches_follow_edge_directions():
+    zero = lambda _: 0.0
+    for seed in range(20):
+        rng = random.Random(seed)
+        n: int = 40
+        sources = [rng.randrange(n) for _ in range(70)]
+        targets = [rng.randrange(n) for _ in range(70)]
+        graph: Graph = Graph.from_edges(n, sources, targets, directed=True)
+        reverse: Graph = Graph.from_edges(n, targets, sources, directed=True)
+        for goal in range(0, n, 7):
+            plain = bfs(0, lambda v: v == goal, graph.successors)
+            for solution in (bidirectional_bfs(0, goal, graph.successors, reverse.successors),
+                             bidirectional_astar(0, goal, graph.successors, reverse.successors, zero, zero)):
+                assert (solution is None) == (plain is None), (seed, goal)
+                if solution is not None:
+                    path = node_to_path(solution)
+                    check_path(path, 0, goal, graph.successors)
+                    assert len(path) == len(node_to_path(plain))
+
+
+# costs of the cheapest paths from source to every vertex, by relaxing every edge n times
+def bellman_ford_costs(graph: Graph, source: int) -> Dict[int, float]:
+    costs: Dict[int, float] = {source: 0.0}
+    for _ in range(graph.vertex_count):
+        for u in list(costs):
+            for v, weight in graph.weighted_successors(u):
+                if costs[u] + weight < costs.get(v, float('inf')):
+                    costs[v] = costs[u] + weight
+    return costs
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_weighted_searches_match_bellman_ford(directed):
+    for seed in range(15):
+        rng = random.Random(seed)
+        n: int = 30
+        m: int = 60
+        graph: Graph = Graph.from_edges(n, [rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)],
+                                        [float(rng.randint(0, 9)) for _ in range(m)], directed)
+        costs: Dict[int, float] = bellman_ford_costs(graph, 0)
+        for goal in range(n):
+            for solution in (dijkstra(0, lambda v: v == goal, graph.weighted_successors),
+                             weighted_astar(0, lambda v: v == goal, graph.weighted_successors, lambda _: 0.0)):
+                assert (solution is None) == (goal not in costs), (seed, goal)
+                if solution is not None:
+                    assert solution.cost == costs[goal]
+                    path = node_to_path(solution)
+                    check_path(path, 0, goal, graph.successors)
+                    assert sum(min(w for v, w in graph.weighted_successors(a) if v == b) for a, b in zip(path, path[1:])) == costs[goal]
+
+
+def test_weighted_searches_match_bfs_on_mazes():
+    for maze in mazes():
+        plain = bfs(maze._start, maze.goal_test, maze.successors)
+        for solution in (dijkstra(maze._start, maze.goal_test, unit_costs(maze.successors)),
+                         weighted_astar(maze._start, maze.goal_test, unit_costs(maze.successors), manhattan_distance(maze._goal))):
+            assert (solution is None) == (plain is None)
+            if solution is not None:
+                assert solution.cost == len(node_to_path(plain)) - 1
+                check_path(node_to_path(solution), maze._start, maze._goal, maze.successors)
+        assert node_to_path(dijkstra(maze._start, lambda ml: ml == maze._start, unit_costs(maze.successors))) == [maze._start]
+
+
+def test_weighted_astar_rejects_negative_costs():
+    with pytest.raises(ValueError):
+        dijkstra(0, lambda v: v == 2, lambda v: [(v + 1, -1.0)] if v < 2 else [])
+
+
+def test_indexed_priority_queue_decrease_key():
+    queue: IndexedPriorityQueue[str] = IndexedPriorityQueue()
+    for item, priority in (('a', 5), ('b', 3), ('c', 8), ('d', 6)):
+        queue.push(item, priority)
+    queue.decrease_key('c', 1)
+    assert queue.priority('c') == 1 and queue.peek_priority() == 1
+    # pushing an item that is already queued moves it rather than adding it twice
+    queue.push('b', 9)
+    assert len(queue) == 4
+    queue.remove('a')
+    assert 'a' not in queue
+    assert [queue.pop() for _ in range(len(queue))] == ['c', 'd', 'b']
+    assert queue.is_empty
+
+
+def test_indexed_priority_queue_against_a_heap():
+    rng = random.Random(0)
+    queue: IndexedPriorityQueue[int] = IndexedPriorityQueue()
+    priorities: Dict[int, int] = {}
+    for _ in range(3000):
+        operation: float = rng.random()
+        item: int = rng.randrange(50)
+        if operation < 0.4:
+            priorities[item] = rng.randrange(1000)
+            queue.push(item, (priorities[item], item))
+        elif operation < 0.6 and item in priorities:
+            priorities[item] = rng.randrange(priorities[item] + 1)
+            queue.decrease_key(item, (priorities[item], item))
+        elif operation < 0.7 and item in priorities:
+            del priorities[item]
+            queue.remove(item)
+        elif operation < 0.9 and priorities:
+            expected: int = heapq.nsmallest(1, priorities, key=lambda key: (priorities[key], key))[0]
+            assert queue.pop() == expected
+            del priorities[expected]
+        assert len(queue) == len(priorities)
+        assert all(queue.priority(key) == (value, key) for key, value in priorities.items())
@@ -0,0 +1,73 @@
+import os
+import random
+import struct
+import sys
+from array import array
+import pytest
+from graphs.graph import Graph
+from graphs.graph_io import read_text_edges, read_binary_edges, write_binary_edges, save_snapshot, load_snapshot, load_edge_list
+
+
+def random_edges(n: int, m: int, seed: int):
+    rng = random.Random(seed)
+    return [rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)], [float(rng.randint(1, 9)) for _ in range(m)]
+
+
+def same_graph(a: Graph, b: Graph) -> bool:
+    return (list(a._vertices) == list(b._vertices) and list(a.offsets) == list(b.offsets) and list(a.neighbours) == list(b.neighbours)
+            and (a.weights is None) == (b.weights is None) and (a.weights is None or list(a.weights) == list(b.weights)) and a.directed == b.directed)
+
+
+def test_text_and_binary_edges_round_trip(tmp_path):
+    sources, targets, weights = random_edges(50, 300, 0)
+    text = tmp_path / 'edges.txt'
+    text.write_text('# comment\n' + ''.join(f'{u} {v} {w}\n' for u, v, w in zip(sources, targets, weights)))
+    assert [list(part) for part in read_text_edges(str(text), weighted=True, chunk_size=64)] == [sources, targets, weights]
+    binary = tmp_path / 'edges.bin'
+    write_binary_edges(str(binary), sources, targets, weights)
+    assert [list(part) for part in read_binary_edges(str(binary), weighted=True)] == [sources, targets, weights]
+
+
+def test_binary_edges_are_little_endian(tmp_path, monkeypatch):
+    binary = tmp_path / 'edges.bin'
+    write_binary_edges(str(binary), [1, 70000], [2, -3], [0.5, 2.0])
+    assert list(struct.iter_unpack('<iif', binary.read_bytes())) == [(1, 2, 0.5), (70000, -3, 2.0)]
+    # a big-endian machine swaps on the way out and back in, so it reads and writes the same records
+    monkeypatch.setattr(sys, 'byteorder', 'big')
+    assert [list(part) for part in read_binary_edges(str(binary), weighted=True)] != [[1, 70000], [2, -3], [0.5, 2.0]]
+    write_binary_edges(str(binary), [1, 70000], [2, -3], [0.5, 2.0])
+    assert [list(part) for part in read_binary_edges(str(binary), weighted=True)] == [[1, 70000], [2, -3], [0.5, 2.0]]
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+@pytest.mark.parametrize('directed', [False, True])
+def test_snapshot_round_trip(tmp_path, weighted, directed):
+    sources, targets, weights = random_edges(40, 200, 1)
+    graph = Graph.from_edges(40, sources, targets, weights if weighted else None, directed)
+    save_snapshot(graph, str(tmp_path / 'graph.csr'))
+    assert same_graph(load_snapshot(str(tmp_path / 'graph.csr')), graph)
+
+
+def test_snapshot_keeps_weight_typecode_and_named_vertices(tmp_path):
+    graph = Graph.from_edges(['a', 'b', 'c'], [0, 1], [1, 2], array('f', [0.5, 1.5]))
+    graph.weights = array('f', graph.weights)
+    save_snapshot(graph, str(tmp_path / 'graph.csr'))
+    loaded = load_snapshot(str(tmp_path / 'graph.csr'))
+    assert loaded.weights.format == 'f' and same_graph(loaded, graph)
+
+
+def test_snapshot_rejects_vertices_that_are_not_data(tmp_path):
+    with pytest.raises(ValueError):
+        save_snapshot(Graph.from_edges([(0, 0), (0, 1)], [0], [1]), str(tmp_path / 'graph.csr'))
+
+
+def test_load_edge_list_rebuilds_unreadable_cache(tmp_path):
+    sources, targets, _ = random_edges(30, 100, 2)
+    path = tmp_path / 'edges.txt'
+    path.write_text(''.join(f'{u} {v}\n' for u, v in zip(sources, targets)))
+    built = load_edge_list(str(path))
+    assert same_graph(load_edge_list(str(path)), built)
+    with open(str(path) + '.csr', 'r+b') as f:
+        f.write(struct.pack('<4s', b'CSR1'))
+    assert same_graph(load_edge_list(str(path)), built)
+    os.remove(str(path) + '.csr')
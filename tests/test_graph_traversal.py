@@ -0,0 +1,105 @@
+import random
+from array import array
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Deque, List, Sequence
+import pytest
+from graphs.graph import Graph
+import graphs.graph_traversal as graph_traversal
+from graphs.graph_traversal import Traversal, level_bfs, component_labels, parallel_bfs
+
+
+def random_graph(n: int, m: int, seed: int, directed: bool) -> Graph:
+    rng = random.Random(seed)
+    return Graph.from_edges(n, [rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)], directed=directed)
+
+
+# hop counts from the nearest source, one vertex at a time
+def hop_counts(graph: Graph, sources: Sequence[int]) -> List[int]:
+    distances: List[int] = [-1] * graph.vertex_count
+    queue: Deque[int] = deque()
+    for source in sources:
+        if distances[source] < 0:
+            distances[source] = 0
+            queue.append(source)
+    while queue:
+        u: int = queue.popleft()
+        for v in graph.successors(u):
+            if distances[v] < 0:
+                distances[v] = distances[u] + 1
+                queue.append(v)
+    return distances
+
+
+def check_traversal(graph: Graph, traversal: Traversal, sources: Sequence[int]) -> None:
+    expected: List[int] = hop_counts(graph, sources)
+    assert list(traversal.distances) == expected
+    assert traversal.levels == max(expected)
+    for v, parent in enumerate(traversal.parents):
+        if expected[v] <= 0:
+            assert parent == -1
+        else:
+            assert expected[parent] == expected[v] - 1 and v in graph.successors(parent)
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_level_bfs_matches_plain_bfs(directed, monkeypatch):
+    reversed_graphs: List[Graph] = []
+    reverse = graph_traversal._reverse
+
+    def recording_reverse(graph: Graph) -> Graph:
+        reversed_graphs.append(graph)
+        return reverse(graph)
+
+    monkeypatch.setattr(graph_traversal, '_reverse', recording_reverse)
+    for seed in range(10):
+        graph: Graph = random_graph(300, 900, seed, directed)
+        sources: List[int] = [0] if seed % 2 else [0, 7, 7, 150]
+        top_down: Traversal = level_bfs(graph, sources, direction_optimising=False)
+        assert len(reversed_graphs) == seed
+        check_traversal(graph, top_down, sources)
+        optimised: Traversal = level_bfs(graph, sources, direction_optimising=True)
+        check_traversal(graph, optimised, sources)
+        assert optimised.distances == top_down.distances
+        # the switch to bottom-up steps was really made
+        assert len(reversed_graphs) == seed + 1
+
+
+def test_component_labels_match_plain_bfs():
+    for seed in range(10):
+        graph: Graph = random_graph(200, 150, seed, False)
+        labels: array = component_labels(graph)
+        for vertex in range(graph.vertex_count):
+            reached: List[int] = [v for v, distance in enumerate(hop_counts(graph, [vertex])) if distance >= 0]
+            assert labels[vertex] == min(reached)
+    with pytest.raises(ValueError):
+        component_labels(random_graph(5, 5, 0, True))
+
+
+def test_parallel_bfs_matches_level_bfs(monkeypatch):
+    # small enough frontiers would never reach the pool
+    monkeypatch.setattr(graph_traversal, 'PARALLEL_THRESHOLD', 4)
+    graph: Graph = Graph.from_edges(12, [0, 0, 0, 0, 0, 1, 2, 3, 4, 9], [1, 2, 3, 4, 5, 6, 7, 8, 8, 10])
+    result = parallel_bfs(graph, [0], workers=2, parts=3)
+    assert result.distances == level_bfs(graph, [0]).distances
+    assert result.levels == 2
+
+
+def test_parallel_bfs_frees_shared_memory_on_error(monkeypatch):
+    shared: List[shared_memory.SharedMemory] = []
+    share = graph_traversal._share
+
+    def recording_share(data: array) -> shared_memory.SharedMemory:
+        block: shared_memory.SharedMemory = share(data)
+        shared.append(block)
+        return block
+
+    monkeypatch.setattr(graph_traversal, '_share', recording_share)
+    graph: Graph = Graph.from_edges(5, [0, 1, 2], [1, 2, 3])
+    # the out of range source is the error that has to surface, not a BufferError from closing the blocks
+    with pytest.raises(IndexError):
+        parallel_bfs(graph, [7])
+    assert len(shared) == 3
+    for block in shared:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=block.name)
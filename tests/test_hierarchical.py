@@ -0,0 +1,60 @@
+import random
+from typing import List, Optional
+import pytest
+from generic_search import bfs, node_to_path
+from graphs.maze import Maze, MazeLocation, Cell, BLOCKED
+from graphs.hierarchical import HierarchicalMaze
+
+
+def open_cells(maze: Maze) -> List[MazeLocation]:
+    return [maze.decode(index) for index in range(maze.num_cells) if maze._grid[index] != BLOCKED]
+
+
+def check_path(maze: Maze, path: List[MazeLocation], start: MazeLocation, goal: MazeLocation) -> None:
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:]):
+        assert abs(a.row - b.row) + abs(a.column - b.column) == 1
+        assert maze.cell(b) != Cell.BLOCKED
+
+
+def check_against_bfs(maze: Maze, hierarchy: HierarchicalMaze, queries: int, rng: random.Random) -> None:
+    cells: List[MazeLocation] = open_cells(maze)
+    for _ in range(queries):
+        start, goal = rng.choice(cells), rng.choice(cells)
+        path: Optional[List[MazeLocation]] = hierarchy.find_path(start, goal)
+        solution = bfs(start, lambda ml: ml == goal, maze.successors)
+        assert (path is None) == (solution is None), (start, goal)
+        if path is not None:
+            check_path(maze, path, start, goal)
+            assert len(path) >= len(node_to_path(solution))
+
+
+def test_single_column_of_clusters_regression():
+    maze = Maze(10, 2, 0.25, MazeLocation(0, 0), MazeLocation(9, 1), seed=6)
+    path = HierarchicalMaze(maze, 4).find_path(MazeLocation(0, 0), MazeLocation(4, 0))
+    assert path is not None and len(path) == 7
+    check_path(maze, path, MazeLocation(0, 0), MazeLocation(4, 0))
+
+
+# one column of clusters, one row of clusters, and clusters cut short at the right and bottom edges
+@pytest.mark.parametrize('rows, columns, cluster_size', [(30, 3, 4), (12, 1, 3), (3, 30, 4), (1, 12, 3), (23, 17, 5), (9, 9, 4)])
+def test_find_path_matches_bfs(rows, columns, cluster_size):
+    for seed in range(8):
+        maze = Maze(rows, columns, 0.3, MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1), seed=seed)
+        check_against_bfs(maze, HierarchicalMaze(maze, cluster_size), 30, random.Random(seed))
+
+
+@pytest.mark.parametrize('rows, columns, cluster_size', [(30, 3, 4), (3, 30, 4), (23, 17, 5)])
+def test_update_cells_matches_fresh_build(rows, columns, cluster_size):
+    rng = random.Random(1)
+    maze = Maze(rows, columns, 0.3, MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1), seed=1)
+    hierarchy = HierarchicalMaze(maze, cluster_size)
+    for _ in range(10):
+        changes = [(MazeLocation(rng.randrange(rows), rng.randrange(columns)), rng.choice([Cell.BLOCKED, Cell.EMPTY])) for _ in range(5)]
+        hierarchy.update_cells(changes)
+        fresh = HierarchicalMaze(maze, cluster_size)
+        assert hierarchy._borders == fresh._borders
+        assert {node: sorted(others) for node, others in hierarchy._inter.items() if others} == {node: sorted(others) for node, others in fresh._inter.items()}
+        assert {cluster: {node: sorted(edges) for node, edges in nodes.items()} for cluster, nodes in hierarchy._intra.items()} == \
+               {cluster: {node: sorted(edges) for node, edges in nodes.items()} for cluster, nodes in fresh._intra.items()}
+        check_against_bfs(maze, hierarchy, 10, rng)
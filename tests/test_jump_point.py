@@ -0,0 +1,99 @@
+from math import sqrt
+from typing import List, Optional, Tuple
+import pytest
+from generic_search import astar, node_to_path, weighted_astar
+from graphs.maze import Maze, MazeLocation, Cell, manhattan_distance
+from graphs.jump_point import JumpPointSearch, jps
+
+SHAPES = [(1, 1), (1, 12), (12, 1), (9, 9), (16, 23), (30, 30)]
+
+
+def open_cell(maze: Maze, ml: MazeLocation) -> bool:
+    return 0 <= ml.row < maze._rows and 0 <= ml.column < maze._columns and maze.cell(ml) != Cell.BLOCKED
+
+
+# the 8-connected moves jump point search allows: no squeezing diagonally between two walls
+def octile_successors(maze: Maze):
+    def successors(ml: MazeLocation) -> List[Tuple[MazeLocation, float]]:
+        moves: List[Tuple[MazeLocation, float]] = []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                other = MazeLocation(ml.row + dr, ml.column + dc)
+                if (dr or dc) and open_cell(maze, other):
+                    if dr and dc and not (open_cell(maze, MazeLocation(ml.row + dr, ml.column)) and open_cell(maze, MazeLocation(ml.row, ml.column + dc))):
+                        continue
+                    moves.append((other, sqrt(2) if dr and dc else 1.0))
+        return moves
+    return successors
+
+
+def octile_distance(goal: MazeLocation):
+    def distance(ml: MazeLocation) -> float:
+        dr, dc = abs(ml.row - goal.row), abs(ml.column - goal.column)
+        return dr + dc + (sqrt(2) - 2) * min(dr, dc)
+    return distance
+
+
+# every step moves to a neighbouring open cell (diagonally only past two open cells),
+# so the path can be handed to Maze.mark as it is; returns the path's cost
+def check_path(maze: Maze, path: List[MazeLocation], start: MazeLocation, goal: MazeLocation, diagonal: bool) -> float:
+    assert path[0] == start and path[-1] == goal
+    assert all(open_cell(maze, ml) for ml in path)
+    cost: float = 0.0
+    for a, b in zip(path, path[1:]):
+        dr, dc = b.row - a.row, b.column - a.column
+        if diagonal:
+            assert max(abs(dr), abs(dc)) == 1
+            if dr and dc:
+                assert open_cell(maze, MazeLocation(a.row + dr, a.column)) and open_cell(maze, MazeLocation(a.row, a.column + dc))
+        else:
+            assert abs(dr) + abs(dc) == 1
+        cost += sqrt(2) if dr and dc else 1.0
+    maze.mark(path)
+    maze.clear(path)
+    return cost
+
+
+@pytest.mark.parametrize('rows, columns', SHAPES)
+@pytest.mark.parametrize('sparseness', [0.0, 0.2, 0.35])
+def test_four_connected_matches_astar(rows, columns, sparseness):
+    for seed in range(6):
+        start, goal = MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1)
+        maze = Maze(rows, columns, sparseness, start, goal, seed=seed)
+        path: Optional[List[MazeLocation]] = jps(maze)
+        solution = astar(start, maze.goal_test, maze.successors, manhattan_distance(goal))
+        assert (path is None) == (solution is None), seed
+        if path is not None:
+            assert check_path(maze, path, start, goal, False) == len(node_to_path(solution)) - 1
+
+
+@pytest.mark.parametrize('rows, columns', SHAPES)
+@pytest.mark.parametrize('sparseness', [0.0, 0.2, 0.35])
+def test_eight_connected_matches_weighted_astar(rows, columns, sparseness):
+    for seed in range(6):
+        start, goal = MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1)
+        maze = Maze(rows, columns, sparseness, start, goal, seed=seed)
+        path: Optional[List[MazeLocation]] = jps(maze, diagonal=True)
+        solution = weighted_astar(start, maze.goal_test, octile_successors(maze), octile_distance(goal)) if open_cell(maze, start) else None
+        assert (path is None) == (solution is None), seed
+        if path is not None:
+            assert check_path(maze, path, start, goal, True) == pytest.approx(solution.cost)
+
+
+@pytest.mark.parametrize('diagonal', [False, True])
+def test_carved_mazes_and_arbitrary_endpoints(diagonal):
+    maze = Maze(21, 21, 0.0, MazeLocation(0, 0), MazeLocation(20, 20), generator='backtracker', seed=4, loops=0.1)
+    search = JumpPointSearch(maze, diagonal)
+    cells = [MazeLocation(row, column) for row in range(21) for column in range(21)]
+    for start, goal in zip(cells[::7], cells[::-11]):
+        path = search.search(start, goal)
+        if not (open_cell(maze, start) and open_cell(maze, goal)):
+            assert path is None
+            continue
+        solution = weighted_astar(start, lambda ml: ml == goal, octile_successors(maze), octile_distance(goal)) if diagonal else \
+            astar(start, lambda ml: ml == goal, maze.successors, manhattan_distance(goal))
+        assert (path is None) == (solution is None)
+        if path is not None:
+            assert check_path(maze, path, start, goal, diagonal) == pytest.approx(solution.cost)
+    # start and goal on the same cell
+    assert search.search(MazeLocation(0, 0), MazeLocation(0, 0)) == [MazeLocation(0, 0)]
@@ -0,0 +1,56 @@
+import random
+from generic_search import astar, bfs, node_to_path
+from graphs.graph import Graph
+from graphs.graph_traversal import hop_distances
+from graphs.landmarks import LandmarkHeuristic
+from graphs.maze import Maze, MazeLocation
+
+
+def random_digraph(n: int, m: int, seed: int) -> Graph[int]:
+    rng = random.Random(seed)
+    return Graph.from_edges(n, [rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)], directed=True)
+
+
+def identity(index: int) -> int:
+    return index
+
+
+def check_admissible(graph: Graph[int], landmarks: LandmarkHeuristic[int], goals) -> None:
+    reverse = Graph.from_edges(graph.vertex_count, graph.neighbours, [u for u in range(graph.vertex_count) for _ in graph.neighbour_indices(u)], directed=True)
+    for goal in goals:
+        to_goal = hop_distances(reverse, goal)
+        heuristic = landmarks.heuristic(goal)
+        for state in range(graph.vertex_count):
+            if to_goal[state] >= 0:
+                assert heuristic(state) <= to_goal[state], (goal, state)
+
+
+def test_directed_graph_heuristic_is_admissible():
+    for seed in range(5):
+        graph = random_digraph(300, 900, seed)
+        landmarks = LandmarkHeuristic.for_graph(0, graph.index_successors, identity, identity, graph.vertex_count, 6)
+        check_admissible(graph, landmarks, random.Random(seed).sample(range(300), 10))
+        for goal in range(0, 300, 7):
+            solution = astar(0, lambda v: v == goal, graph.index_successors, landmarks.heuristic(goal))
+            shortest = bfs(0, lambda v: v == goal, graph.index_successors)
+            assert (solution is None) == (shortest is None)
+            if solution is not None:
+                assert len(node_to_path(solution)) == len(node_to_path(shortest))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    graph = random_digraph(200, 600, 7)
+    landmarks = LandmarkHeuristic.for_graph(0, graph.index_successors, identity, identity, graph.vertex_count, 4)
+    landmarks.save(str(tmp_path / 'graph.alt'))
+    loaded = LandmarkHeuristic.load(str(tmp_path / 'graph.alt'), identity)
+    assert loaded.landmarks == landmarks.landmarks
+    for goal in range(0, 200, 11):
+        original, restored = landmarks.heuristic(goal), loaded.heuristic(goal)
+        assert all(original(state) == restored(state) for state in range(200))
+
+    maze = Maze(30, 30, 0.25, MazeLocation(0, 0), MazeLocation(29, 29), seed=3)
+    maze_landmarks = LandmarkHeuristic.for_maze(maze, 4)
+    maze_landmarks.save(str(tmp_path / 'maze.alt'))
+    loaded_maze = LandmarkHeuristic.load(str(tmp_path / 'maze.alt'), maze.encode)
+    original, restored = maze_landmarks.heuristic(maze._goal), loaded_maze.heuristic(maze._goal)
+    assert all(original(maze.decode(i)) == restored(maze.decode(i)) for i in range(maze.num_cells))
@@ -0,0 +1,48 @@
+import pytest
+from graphs.maze import Maze, MazeLocation, GENERATORS, BLOCKED, MazeConnectivity
+from graphs.union_find import UnionFind
+
+CARVED = [generator for generator in GENERATORS if generator != 'random']
+SHAPES = [(1, 1), (1, 6), (6, 1), (2, 2), (7, 10), (10, 7), (11, 21), (20, 20)]
+
+
+# number of separate open regions, and how many more passages there are than a tree would have
+def regions_and_extra_passages(maze: Maze):
+    rows, columns, grid = maze._rows, maze._columns, maze._grid
+    open_cells = [index for index in range(rows * columns) if grid[index] != BLOCKED]
+    components = UnionFind(rows * columns)
+    passages = 0
+    for index in open_cells:
+        row, column = divmod(index, columns)
+        if column + 1 < columns and grid[index + 1] != BLOCKED:
+            passages += 1
+            components.union(index, index + 1)
+        if row + 1 < rows and grid[index + columns] != BLOCKED:
+            passages += 1
+            components.union(index, index + columns)
+    return len({components.find(index) for index in open_cells}), passages - (len(open_cells) - 1)
+
+
+@pytest.mark.parametrize('generator', CARVED)
+@pytest.mark.parametrize('rows, columns', SHAPES)
+def test_carved_mazes_are_connected(generator, rows, columns):
+    for seed in range(3):
+        perfect = Maze(rows, columns, 0.0, MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1), generator=generator, seed=seed)
+        assert regions_and_extra_passages(perfect)[0] == 1
+        looped = Maze(rows, columns, 0.0, MazeLocation(0, 0), MazeLocation(rows - 1, columns - 1), generator=generator, seed=seed, loops=0.3)
+        assert MazeConnectivity(looped).connected(looped._start, looped._goal)
+
+
+# with start and goal on rooms nothing is opened besides the lattice, so the maze is a tree
+@pytest.mark.parametrize('generator', CARVED)
+def test_carved_mazes_are_perfect(generator):
+    for rows, columns in SHAPES:
+        maze = Maze(rows, columns, 0.0, MazeLocation(0, 0), MazeLocation(0, 0), generator=generator, seed=1)
+        assert regions_and_extra_passages(maze) == (1, 0)
+
+
+@pytest.mark.parametrize('generator', GENERATORS)
+def test_seeded_generation_is_reproducible(generator):
+    first = Maze(15, 17, 0.3, MazeLocation(0, 0), MazeLocation(14, 16), generator=generator, seed=42, loops=0.1)
+    second = Maze(15, 17, 0.3, MazeLocation(0, 0), MazeLocation(14, 16), generator=generator, seed=42, loops=0.1)
+    assert first._grid == second._grid
@@ -0,0 +1,52 @@
+from graphs.maze import Maze, MazeLocation, Cell
+from graphs.distance_field import DistanceField
+from graphs.maze_file import save_maze, open_maze, load_maze, save_path, load_path, save_distance_field, open_distance_field
+
+
+def same_maze(a: Maze, b: Maze) -> bool:
+    return (a._rows, a._columns, a._start, a._goal) == (b._rows, b._columns, b._start, b._goal) and \
+        all(a.cell(a.decode(i)) == b.cell(b.decode(i)) for i in range(a.num_cells))
+
+
+def test_maze_round_trip(tmp_path):
+    # a size that is not a multiple of 8 leaves a partly used last byte
+    maze = Maze(13, 21, 0.3, MazeLocation(2, 3), MazeLocation(12, 20), seed=4)
+    path = str(tmp_path / 'example.maze')
+    save_maze(maze, path)
+    assert same_maze(open_maze(path), maze)
+    assert same_maze(load_maze(path), maze)
+
+
+def test_opened_maze_changes_stay_in_memory(tmp_path):
+    maze = Maze(9, 9, 0.2, MazeLocation(0, 0), MazeLocation(8, 8), seed=1)
+    path = str(tmp_path / 'example.maze')
+    save_maze(maze, path)
+    opened = open_maze(path)
+    opened.set_cell(MazeLocation(4, 4), Cell.BLOCKED)
+    assert opened.cell(MazeLocation(4, 4)) == Cell.BLOCKED
+    assert same_maze(open_maze(path), maze)
+
+
+def test_path_and_distance_field_round_trip(tmp_path):
+    maze = Maze(20, 17, 0.25, MazeLocation(0, 0), MazeLocation(19, 16), seed=2)
+    path = str(tmp_path / 'example.maze')
+    save_maze(maze, path)
+    route = [MazeLocation(0, c) for c in range(5)] + [MazeLocation(r, 4) for r in range(1, 6)]
+    save_path(path, route)
+    assert load_path(path) == route
+    field = DistanceField(maze, [maze._goal])
+    save_distance_field(path, field)
+    opened = open_distance_field(path)
+    for index in range(maze.num_cells):
+        ml = maze.decode(index)
+        assert opened.distance(ml) == field.distance(ml)
+        assert opened.path(ml) == field.path(ml)
+
+
+def test_index_successors_does_not_precompute():
+    maze = Maze(15, 15, 0.3, MazeLocation(0, 0), MazeLocation(14, 14), seed=5)
+    plain = [maze.index_successors(index) for index in range(maze.num_cells)]
+    assert maze._neighbours is None
+    maze.precompute_neighbours()
+    assert [maze.index_successors(index) for index in range(maze.num_cells)] == plain
+    assert plain == [[maze.encode(ml) for ml in maze.successors(maze.decode(index))] for index in range(maze.num_cells)]
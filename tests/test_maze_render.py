@@ -0,0 +1,39 @@
+import io
+from generic_search import bfs, node_to_path
+from graphs.maze import Maze, MazeLocation, Cell
+from graphs.maze_render import Window, full_window, path_window, render_text, render_pbm
+
+
+def test_render_text_matches_repr():
+    maze = Maze(13, 17, 0.25, MazeLocation(0, 0), MazeLocation(12, 16), seed=2)
+    out = io.StringIO()
+    render_text(maze, out)
+    assert out.getvalue() == repr(maze)
+    assert full_window(maze) == Window(0, 0, 13, 17)
+
+
+def test_render_text_draws_a_path_inside_a_window():
+    maze = Maze(30, 30, 0.2, MazeLocation(10, 10), MazeLocation(15, 18), seed=5)
+    solution = bfs(maze._start, maze.goal_test, maze.successors)
+    assert solution is not None
+    path = node_to_path(solution)
+    window = path_window(maze, path, 1)
+    out = io.StringIO()
+    render_text(maze, out, window, path)
+    # the maze itself is left alone
+    assert all(maze.cell(location) != Cell.PATH for location in path)
+    maze.mark(path)
+    marked = io.StringIO()
+    render_text(maze, marked, window)
+    assert out.getvalue() == marked.getvalue()
+    assert len(out.getvalue().splitlines()) == window.end_row - window.row
+    assert all(len(line) == 2 * (window.end_column - window.column) - 1 for line in out.getvalue().splitlines())
+    assert path_window(maze, [], 1) == full_window(maze)
+
+
+def test_render_pbm_size():
+    maze = Maze(5, 9, 0.3, MazeLocation(0, 0), MazeLocation(4, 8), seed=1)
+    out = io.BytesIO()
+    render_pbm(maze, out, scale=2)
+    header, _, body = out.getvalue().partition(b'\n18 10\n')
+    assert header == b'P4' and len(body) == 10 * 3
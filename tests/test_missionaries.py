@@ -0,0 +1,103 @@
+from typing import Dict, List, Tuple
+import pytest
+from generic_search import bfs, node_to_path
+from graphs.missionaries import MCPuzzle, MCState, puzzle
+
+State = Tuple[int, int, bool]
+
+
+# every (wm, wc, boat) state reachable from the start, by plain breadth first search over every boat load,
+# with the number of shortest ways of reaching each
+def brute_force(n: int, capacity: int) -> Tuple[Dict[State, int], Dict[State, int]]:
+    def safe(m: int, c: int) -> bool:
+        return m == 0 or m >= c
+
+    start: State = (n, n, True)
+    distances: Dict[State, int] = {start: 0}
+    counts: Dict[State, int] = {start: 1}
+    frontier: List[State] = [start]
+    while frontier:
+        next_frontier: List[State] = []
+        for wm, wc, boat in frontier:
+            sign: int = -1 if boat else 1
+            for dm in range(capacity + 1):
+                for dc in range(capacity + 1 - dm):
+                    new: State = (wm + sign * dm, wc + sign * dc, not boat)
+                    if dm + dc == 0 or not (0 <= new[0] <= n and 0 <= new[1] <= n):
+                        continue
+                    if not (safe(new[0], new[1]) and safe(n - new[0], n - new[1])):
+                        continue
+                    if new not in distances:
+                        distances[new] = distances[(wm, wc, boat)] + 1
+                        counts[new] = 0
+                        next_frontier.append(new)
+                    if distances[new] == distances[(wm, wc, boat)] + 1:
+                        counts[new] += counts[(wm, wc, boat)]
+        frontier = next_frontier
+    return distances, counts
+
+
+def check_solution(game: MCPuzzle, solution: List[int]) -> None:
+    assert solution[0] == game.start and solution[-1] == game.goal
+    for state, following in zip(solution, solution[1:]):
+        assert following in game.successors(state)
+
+
+@pytest.mark.parametrize('n', range(1, 7))
+@pytest.mark.parametrize('capacity', range(1, 5))
+def test_shortest_solutions_match_brute_force(n, capacity):
+    game: MCPuzzle = MCPuzzle(n, capacity)
+    distances, counts = brute_force(n, capacity)
+    goal: State = (0, 0, False)
+    solution = game.solve()
+    if goal not in distances:
+        assert solution is None
+        assert game.count_shortest_solutions() == 0
+        assert list(game.all_shortest_solutions()) == []
+        return
+    assert solution is not None and len(solution) - 1 == distances[goal]
+    check_solution(game, solution)
+    assert game.count_shortest_solutions() == counts[goal]
+    every: List[List[int]] = list(game.all_shortest_solutions())
+    assert len(every) == counts[goal] and len({tuple(path) for path in every}) == len(every)
+    for path in every:
+        assert len(path) == len(solution)
+        check_solution(game, path)
+    # the tables hold every legal state, reachable or not
+    assert {game.unpack(state) for state in game.states} >= set(distances)
+
+
+def test_classic_puzzle():
+    game: MCPuzzle = puzzle(3, 2)
+    assert len(game.solve()) - 1 == 11
+    assert game.count_shortest_solutions() == 4
+
+
+def test_large_puzzle_matches_brute_force():
+    distances, counts = brute_force(150, 4)
+    game: MCPuzzle = puzzle(150, 4)
+    solution = game.solve()
+    assert solution is not None and len(solution) - 1 == distances[(0, 0, False)]
+    check_solution(game, solution)
+    assert game.count_shortest_solutions() == counts[(0, 0, False)]
+    # a boat for three cannot take more than five of each across
+    assert puzzle(150, 3).solve() is None and (0, 0, False) not in brute_force(150, 3)[0]
+
+
+def test_mc_state_equality_and_hashing():
+    assert MCState(3, 3, True) == MCState(3, 3, True)
+    assert hash(MCState(2, 2, False)) == hash(MCState(2, 2, False))
+    assert MCState(3, 3, True) != MCState(3, 3, False)
+    assert MCState(3, 3, True, 3, 2) != MCState(3, 3, True, 3, 3)
+    assert MCState(1, 1, True) != (1, 1, True)
+    assert len({MCState(1, 1, True), MCState(1, 1, True), MCState(1, 1, False)}) == 2
+    assert MCState.unpack(MCState(2, 1, False, 4, 3).pack(), 4, 3) == MCState(2, 1, False, 4, 3)
+
+
+def test_generic_bfs_over_mc_states():
+    # bfs only stops revisiting states if equal states are recognised as such
+    solution = bfs(MCState(3, 3, True), MCState.goal_test, MCState.successors)
+    assert solution is not None
+    path: List[MCState] = node_to_path(solution)
+    assert len(path) - 1 == 11 and path[-1] == MCState(0, 0, False)
+    assert all(state.is_legal for state in path)
@@ -0,0 +1,125 @@
+import itertools
+import random
+from typing import List, Tuple
+import pytest
+from graphs.graph import Graph
+from graphs.union_find import UnionFind
+from graphs.shortest_paths import INFINITY, ShortestPaths, SpanningForest, dijkstra, dijkstra_radix, bellman_ford, prim, kruskal
+
+Edge = Tuple[int, int, float]
+
+
+def random_edges(n: int, m: int, rng: random.Random, lowest: int = 0) -> List[Edge]:
+    return [(rng.randrange(n), rng.randrange(n), float(rng.randint(lowest, 9))) for _ in range(m)]
+
+
+def build(n: int, edges: List[Edge], directed: bool) -> Graph:
+    return Graph.from_edges(n, [u for u, _, _ in edges], [v for _, v, _ in edges], [w for _, _, w in edges], directed)
+
+
+def floyd_warshall(n: int, edges: List[Edge], directed: bool) -> List[List[float]]:
+    distances: List[List[float]] = [[0.0 if u == v else INFINITY for v in range(n)] for u in range(n)]
+    for u, v, w in edges:
+        distances[u][v] = min(distances[u][v], w)
+        if not directed:
+            distances[v][u] = min(distances[v][u], w)
+    for k in range(n):
+        for u in range(n):
+            for v in range(n):
+                if distances[u][k] + distances[k][v] < distances[u][v]:
+                    distances[u][v] = distances[u][k] + distances[k][v]
+    return distances
+
+
+def check_paths(graph: Graph, paths: ShortestPaths, expected: List[float]) -> None:
+    assert list(paths.distances) == expected
+    for target, distance in enumerate(expected):
+        path = paths.path_to(target)
+        if distance == INFINITY:
+            assert path is None
+            continue
+        assert path[0] == paths.source and path[-1] == target
+        assert sum(min(w for v, w in graph.weighted_successors(a) if v == b) for a, b in zip(path, path[1:])) == distance
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_dijkstra_and_bellman_ford_match_floyd_warshall(directed):
+    for seed in range(20):
+        rng = random.Random(seed)
+        n: int = rng.randint(1, 15)
+        edges: List[Edge] = random_edges(n, rng.randint(0, 3 * n), rng)
+        graph: Graph = build(n, edges, directed)
+        expected: List[List[float]] = floyd_warshall(n, edges, directed)
+        for source in range(n):
+            for search in (dijkstra, dijkstra_radix, bellman_ford):
+                check_paths(graph, search(graph, source), expected[source])
+            # with a target only the target's distance has to be final
+            for target in range(n):
+                assert dijkstra(graph, source, target).distance(target) == expected[source][target]
+                assert dijkstra_radix(graph, source, target).distance(target) == expected[source][target]
+
+
+def test_bellman_ford_with_negative_weights():
+    for seed in range(20):
+        rng = random.Random(seed)
+        n: int = 10
+        # edges only go from lower to higher vertices, so no cycle can be negative
+        edges: List[Edge] = [(min(u, v), max(u, v), w) for u, v, w in random_edges(n, 25, rng, -5) if u != v]
+        graph: Graph = build(n, edges, True)
+        expected: List[List[float]] = floyd_warshall(n, edges, True)
+        for source in range(n):
+            check_paths(graph, bellman_ford(graph, source), expected[source])
+
+
+def test_negative_weights_are_rejected():
+    cycle: Graph = build(4, [(0, 1, 1.0), (1, 2, -2.0), (2, 1, 1.0), (3, 0, 1.0)], True)
+    with pytest.raises(ValueError):
+        bellman_ford(cycle, 0)
+    # a negative cycle that cannot be reached from the source does not matter
+    lonely: Graph = build(4, [(0, 1, 1.0), (1, 0, -2.0), (2, 3, 1.0)], True)
+    assert list(bellman_ford(lonely, 2).distances) == [INFINITY, INFINITY, 0.0, 1.0]
+    for search in (dijkstra, dijkstra_radix):
+        with pytest.raises(ValueError):
+            search(cycle, 0)
+    with pytest.raises(ValueError):
+        dijkstra_radix(build(2, [(0, 1, 0.5)], True), 0)
+
+
+# the lightest set of edges that connects every component, found by trying every set of the right size
+def brute_force_forest_weight(n: int, edges: List[Edge]) -> float:
+    components: UnionFind = UnionFind(n)
+    for u, v, _ in edges:
+        components.union(u, v)
+    size: int = n - len(set(components.labels()))
+    best: float = INFINITY
+    for chosen in itertools.combinations(edges, size):
+        forest: UnionFind = UnionFind(n)
+        if all(forest.union(u, v) for u, v, _ in chosen):
+            best = min(best, sum(w for _, _, w in chosen))
+    return best
+
+
+def check_forest(n: int, edges: List[Edge], forest: SpanningForest) -> None:
+    components: UnionFind = UnionFind(n)
+    for u, v, w in zip(forest.sources, forest.targets, forest.weights):
+        assert components.union(u, v)
+        assert w in [weight for a, b, weight in edges if {a, b} == {u, v}]
+    assert sum(forest.weights) == forest.total_weight
+    assert forest.total_weight == brute_force_forest_weight(n, edges)
+
+
+def test_prim_and_kruskal_match_brute_force():
+    for seed in range(40):
+        rng = random.Random(seed)
+        n: int = rng.randint(1, 7)
+        edges: List[Edge] = random_edges(n, rng.randint(0, 10), rng)
+        graph: Graph = build(n, edges, False)
+        check_forest(n, edges, prim(graph))
+        check_forest(n, edges, kruskal(graph))
+
+
+def test_spanning_trees_need_undirected_graphs():
+    graph: Graph = build(3, [(0, 1, 1.0), (1, 2, 2.0)], True)
+    for spanning_tree in (prim, kruskal):
+        with pytest.raises(ValueError):
+            spanning_tree(graph)
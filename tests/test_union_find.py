@@ -0,0 +1,47 @@
+import random
+from typing import Dict, List
+from graphs.graph import Graph
+from graphs.graph_traversal import component_labels
+from graphs.union_find import UnionFind, graph_components
+
+
+def edges(n: int, m: int, seed: int):
+    rng = random.Random(seed)
+    return [rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)]
+
+
+# two labellings describe the same partition if they map onto each other one to one
+def same_partition(a: List[int], b: List[int]) -> bool:
+    pairs: Dict[int, int] = dict(zip(a, b))
+    return len(pairs) == len(set(a)) == len(set(b)) and all(pairs[x] == y for x, y in zip(a, b))
+
+
+def test_graph_components_match_component_labels():
+    for seed in range(20):
+        n: int = 150
+        sources, targets = edges(n, seed * 10, seed)
+        undirected: Graph = Graph.from_edges(n, sources, targets)
+        labels: List[int] = list(component_labels(undirected))
+        components: UnionFind = graph_components(undirected)
+        assert same_partition(list(components.labels()), labels)
+        assert components.count == len(set(labels))
+        # a directed graph splits into the components of the same edges taken both ways
+        directed: UnionFind = graph_components(Graph.from_edges(n, sources, targets, directed=True))
+        assert same_partition(list(directed.labels()), labels)
+
+
+def test_union_find_against_labels():
+    rng = random.Random(0)
+    n: int = 60
+    components: UnionFind = UnionFind(n)
+    labels: List[int] = list(range(n))
+    for _ in range(200):
+        a, b = rng.randrange(n), rng.randrange(n)
+        joined: bool = labels[a] != labels[b]
+        assert components.union(a, b) == joined
+        if joined:
+            old: int = labels[b]
+            labels = [labels[a] if label == old else label for label in labels]
+        assert components.connected(a, b)
+        assert components.count == len(set(labels))
+    assert same_partition(list(components.labels()), labels)